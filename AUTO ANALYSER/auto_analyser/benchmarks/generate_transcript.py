@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Synthetic Transcript Generator
+------------------------------
+Generate seeded transcripts in the layout PDFExtractor parses: a title,
+date and participant header followed by speaker lines in the inline
+header grammar of config.PDF_SETTINGS ("Name  m:ss") and wrapped
+speech. Speech mixes the example sentences of pattern_database.PATTERNS
+with neutral meeting talk, so matching does realistic work. Transcripts
+can be written as plain text or rendered to PDF without any PDF library.
+
+Usage:
+    python benchmarks/generate_transcript.py <segments> <output.txt|output.pdf> [--seed <n>]
+"""
+
+import os
+import sys
+import random
+import argparse
+import textwrap
+
+# Import local modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pattern_analysis.pattern_database import PATTERNS
+
+SPEAKERS = ('Ben Mak', 'Mbalu Kamara', 'Sarah Whitfield', 'David Okafor', 'Claire Benson')
+
+# Speech without pattern keywords; drawn more often than the examples
+FILLER_SENTENCES = (
+    "Okay, let's move on to the next item on the agenda.",
+    "I think that's fair and we can look at it again next week.",
+    "Yes. Right. I understand what you mean by that.",
+    "Can everyone hear me alright? The connection keeps dropping.",
+    "Let me just find the document you sent over on Tuesday.",
+    "Sorry, could you repeat the last part of that?",
+    "We have about twenty minutes left, so let's keep going.",
+    "I'll make a note of that and send round the minutes afterwards.",
+    "That was covered in the email, I believe, but I'm happy to go through it.",
+    "Thank you, that's helpful to know.",
+)
+
+# Share of sentences taken from the pattern examples
+EXAMPLE_RATE = 0.25
+
+# Characters per wrapped transcript line, as in exported PDFs
+LINE_WIDTH = 80
+
+def generate_transcript(segments, seed=0):
+    """
+    Generate a transcript.
+
+    Args:
+        segments (int): Number of speaker segments
+        seed (int): Random seed; the same seed always gives the same transcript
+
+    Returns:
+        str: Transcript text, one line per newline
+    """
+    rnd = random.Random(seed)
+    examples = [pattern['example'] for patterns in PATTERNS.values() for pattern in patterns]
+    speakers = SPEAKERS[:max(2, min(len(SPEAKERS), 2 + segments // 1000))]
+
+    lines = [
+        'Meeting with Ben Mak, Mbalu (ICS) - benchmark transcript',
+        f"{rnd.randint(1, 28):02d}/{rnd.randint(1, 12):02d}/{rnd.randint(2019, 2024)}",
+        'Participants',
+    ]
+    lines.extend(speakers)
+    lines.extend(['', 'Transcript', ''])
+
+    seconds = 0
+    speaker = None
+    for _ in range(segments):
+        # Speakers alternate, occasionally with a third party joining in
+        speaker = rnd.choice([name for name in speakers if name != speaker])
+        seconds += rnd.randint(4, 75)
+        lines.append(f"{speaker}  {seconds // 60}:{seconds % 60:02d}")
+
+        sentences = [
+            rnd.choice(examples) if rnd.random() < EXAMPLE_RATE else rnd.choice(FILLER_SENTENCES)
+            for _ in range(rnd.randint(1, 5))
+        ]
+        lines.extend(textwrap.wrap(' '.join(sentences), LINE_WIDTH))
+
+        # Long turns repeat the timestamp, as Grain exports do
+        if rnd.random() < 0.1:
+            lines.append(f"{seconds // 60}:{seconds % 60:02d}")
+        lines.append('')
+
+    return '\n'.join(lines) + '\n'
+
+def write_pdf(text, path, lines_per_page=60):
+    """
+    Render text to a PDF, one text line per line, in 10pt Helvetica.
+
+    Only what PyPDF2 and pdfminer need to extract the text is written:
+    a page tree, a standard font and one content stream per page.
+
+    Args:
+        text (str): Text to render; characters outside Latin-1 are replaced
+        path (str): Path of the PDF to write
+        lines_per_page (int): Lines on each A4 page
+    """
+    lines = text.split('\n')
+    pages = [lines[start:start + lines_per_page] for start in range(0, len(lines), lines_per_page)] or [[]]
+
+    # Objects 1-3 are the catalog, page tree and font; each page then
+    # takes a page object followed by its content stream
+    objects = [None, None, b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>']
+    page_ids = []
+    for page_lines in pages:
+        commands = ['BT', '/F1 10 Tf', '12 TL', '50 800 Td']
+        for line in page_lines:
+            commands.append(f"({_pdf_string(line)}) Tj T*")
+        commands.append('ET')
+        stream = '\n'.join(commands).encode('latin-1', 'replace')
+        page_ids.append(len(objects) + 1)
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects) + 2} 0 R >>".encode('ascii')
+        )
+        objects.append(b'<< /Length %d >>\nstream\n' % len(stream) + stream + b'\nendstream')
+    objects[0] = b'<< /Type /Catalog /Pages 2 0 R >>'
+    objects[1] = (
+        f"<< /Type /Pages /Kids [{' '.join(f'{page_id} 0 R' for page_id in page_ids)}] "
+        f"/Count {len(page_ids)} >>".encode('ascii')
+    )
+
+    with open(path, 'wb') as f:
+        f.write(b'%PDF-1.4\n')
+        offsets = []
+        for number, body in enumerate(objects, 1):
+            offsets.append(f.tell())
+            f.write(b'%d 0 obj\n' % number + body + b'\nendobj\n')
+        xref_offset = f.tell()
+        f.write(b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1))
+        for offset in offsets:
+            f.write(b'%010d 00000 n \n' % offset)
+        f.write(b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n'
+                % (len(objects) + 1, xref_offset))
+
+def write_transcript(segments, path, seed=0):
+    """
+    Generate a transcript and write it as text or PDF, by the path's extension.
+
+    Args:
+        segments (int): Number of speaker segments
+        path (str): Path ending in .txt or .pdf
+        seed (int): Random seed
+    """
+    text = generate_transcript(segments, seed)
+    if path.lower().endswith('.pdf'):
+        write_pdf(text, path)
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+def _pdf_string(text):
+    """Escape text for a PDF literal string."""
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+def main():
+    """Main entry point for the generator."""
+    parser = argparse.ArgumentParser(description='Generate a synthetic meeting transcript')
+    parser.add_argument('segments', type=int, help='Number of speaker segments')
+    parser.add_argument('output', help='Transcript file to write (.txt or .pdf)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed (default: 0)')
+    args = parser.parse_args()
+    write_transcript(args.segments, args.output, args.seed)
+
+if __name__ == "__main__":
+    main()
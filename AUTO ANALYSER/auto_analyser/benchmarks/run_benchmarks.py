@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Benchmark Suite
+---------------
+Time each stage of the analysis on generated transcripts of increasing
+size, and compare the results with a stored baseline.
+
+Every case (transcript size and format) runs in a fresh process, so its
+peak RSS is its own. Within a case the stages are timed separately:
+
+    extract     PDF pages (or text lines) to lines
+    segment     lines to metadata and speaker segments
+    match       PatternMatcher.analyze without sentiment
+    sentiment   VADER scoring of every segment
+    report      ReportGenerator.generate_report
+
+Usage:
+    python benchmarks/run_benchmarks.py [--sizes 100 1000 10000] [--formats pdf txt]
+                                        [--output results.json] [--baseline baseline.json]
+
+A results file can be passed back as --baseline to a later run; stages
+that got slower by more than --tolerance are reported and the run exits
+with status 1.
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import resource
+import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+# Import local modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.generate_transcript import write_transcript
+
+# Bump when the layout of the results file changes
+RESULTS_FORMAT_VERSION = 1
+
+STAGES = ('extract', 'segment', 'match', 'sentiment', 'report')
+
+DEFAULT_SIZES = (100, 1000, 10000)
+DEFAULT_FORMATS = ('pdf', 'txt')
+
+# Stages faster than this in the current run are too noisy to flag
+MIN_REGRESSION_SECONDS = 0.05
+
+def run_case(segments, file_format, seed=0, repeat=1):
+    """
+    Benchmark one transcript size and format.
+
+    Meant to run in a fresh process: the peak RSS recorded after each
+    stage is the process high-water mark so far.
+
+    Args:
+        segments (int): Number of speaker segments to generate
+        file_format (str): 'pdf' or 'txt'
+        seed (int): Generator seed
+        repeat (int): Runs of each stage; the fastest is kept
+
+    Returns:
+        dict: Case results with seconds, segments per second and peak RSS per stage
+    """
+    from pdf_processing.pdf_extractor import PDFExtractor, _split_lines
+    from pdf_processing.transcript_loaders import iter_text_lines
+    from pattern_analysis.pattern_matcher import PatternMatcher
+    from report_generation.report_generator import ReportGenerator
+
+    work_dir = tempfile.mkdtemp(prefix='auto_analyser_bench_')
+    try:
+        path = os.path.join(work_dir, f"transcript.{file_format}")
+        write_transcript(segments, path, seed)
+
+        extractor = PDFExtractor()
+        matcher = PatternMatcher(sentiment=False)
+        generator = ReportGenerator()
+        # Load the models outside the timed stages
+        matcher.sentence_tokenizer
+        scorer = PatternMatcher(sentiment=True).scorer
+
+        def extract():
+            if file_format == 'pdf':
+                return list(_split_lines(extractor._iter_page_texts(path)))
+            return list(iter_text_lines(path))
+
+        def segment():
+            metadata, segment_iter = extractor._process_lines(lines)
+            return {'metadata': metadata, 'segments': list(segment_iter)}
+
+        def match():
+            return matcher.analyze({'metadata': transcript['metadata'],
+                                    'segments': list(transcript['segments'])})
+
+        def sentiment():
+            return scorer.score([item['text'] for item in transcript['segments']])
+
+        def report():
+            return generator.generate_report(transcript, analysis_results,
+                                             os.path.join(work_dir, 'report'))
+
+        stages = {}
+
+        def timed(stage, function):
+            best = None
+            for _ in range(repeat):
+                started = time.perf_counter()
+                result = function()
+                elapsed = time.perf_counter() - started
+                best = elapsed if best is None else min(best, elapsed)
+            stages[stage] = {'seconds': round(best, 6), 'peak_rss_mb': _peak_rss_mb()}
+            return result
+
+        lines = timed('extract', extract)
+        transcript = timed('segment', segment)
+        analysis_results = timed('match', match)
+        timed('sentiment', sentiment)
+        timed('report', report)
+
+        segment_count = len(transcript['segments'])
+        for stage in stages.values():
+            seconds = stage['seconds']
+            stage['segments_per_second'] = round(segment_count / seconds, 1) if seconds else None
+
+        return {
+            'segments': segment_count,
+            'format': file_format,
+            'file_mb': round(os.path.getsize(path) / (1024 * 1024), 3),
+            'matches': len(analysis_results['patterns_found']),
+            'total_seconds': round(sum(stage['seconds'] for stage in stages.values()), 6),
+            'peak_rss_mb': _peak_rss_mb(),
+            'stages': stages
+        }
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+def run_benchmarks(sizes=DEFAULT_SIZES, formats=DEFAULT_FORMATS, seed=0, repeat=1):
+    """
+    Benchmark every combination of size and format, each in a fresh process.
+
+    Args:
+        sizes (iterable): Transcript sizes in segments
+        formats (iterable): Transcript formats ('pdf', 'txt')
+        seed (int): Generator seed
+        repeat (int): Runs of each stage; the fastest is kept
+
+    Returns:
+        dict: Results with the environment and one entry per case
+    """
+    cases = {}
+    context = multiprocessing.get_context('spawn')
+    for size in sizes:
+        for file_format in formats:
+            name = f"{file_format}-{size}"
+            print(f"Running {name}...", flush=True)
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                cases[name] = executor.submit(run_case, size, file_format, seed, repeat).result()
+            print(_format_case(name, cases[name]), flush=True)
+
+    return {
+        'format_version': RESULTS_FORMAT_VERSION,
+        'created': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'machine': platform.machine(),
+            'cpu_count': os.cpu_count()
+        },
+        'seed': seed,
+        'repeat': repeat,
+        'cases': cases
+    }
+
+def compare(results, baseline, tolerance=0.2):
+    """
+    Compare stage timings and peak RSS with a baseline.
+
+    Args:
+        results (dict): Results of run_benchmarks
+        baseline (dict): Earlier results
+        tolerance (float): Allowed slowdown (or RSS growth), as a fraction
+
+    Returns:
+        tuple: (rows, regressions) where rows are (case, stage, baseline,
+            current, ratio) tuples for every case and stage in both, and
+            regressions are the rows beyond the tolerance (ignoring stages
+            under MIN_REGRESSION_SECONDS)
+    """
+    rows = []
+    for name, case in results['cases'].items():
+        base_case = baseline.get('cases', {}).get(name)
+        if base_case is None:
+            continue
+        measures = [(stage, base_case['stages'][stage]['seconds'], case['stages'][stage]['seconds'])
+                    for stage in STAGES if stage in base_case['stages'] and stage in case['stages']]
+        measures.append(('peak_rss_mb', base_case['peak_rss_mb'], case['peak_rss_mb']))
+        for stage, before, after in measures:
+            ratio = after / before if before else None
+            rows.append((name, stage, before, after, ratio))
+    regressions = [
+        row for row in rows
+        if row[4] is not None and row[4] > 1 + tolerance
+        and (row[1] == 'peak_rss_mb' or row[3] >= MIN_REGRESSION_SECONDS)
+    ]
+    return rows, regressions
+
+def _peak_rss_mb():
+    """Return the peak resident set size of this process in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    if sys.platform == 'darwin':
+        peak /= 1024
+    return round(peak / 1024, 1)
+
+def _format_case(name, case):
+    """Format one case as a line per stage."""
+    lines = [f"  {name}: {case['segments']} segments, {case['matches']} matches, "
+             f"{case['total_seconds']:.3f} s, peak RSS {case['peak_rss_mb']} MB"]
+    for stage, result in case['stages'].items():
+        lines.append(f"    {stage:<10} {result['seconds']:10.3f} s {result['segments_per_second']:12.1f} seg/s"
+                     f" {result['peak_rss_mb']:10.1f} MB")
+    return '\n'.join(lines)
+
+def parse_arguments():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description='Benchmark the analysis stages on generated transcripts')
+    parser.add_argument(
+        '--sizes',
+        type=int,
+        nargs='+',
+        default=list(DEFAULT_SIZES),
+        help='Transcript sizes in segments (default: %s)' % ' '.join(map(str, DEFAULT_SIZES))
+    )
+    parser.add_argument(
+        '--formats',
+        nargs='+',
+        choices=('pdf', 'txt'),
+        default=list(DEFAULT_FORMATS),
+        help='Transcript formats (default: pdf txt)'
+    )
+    parser.add_argument('--seed', type=int, default=0, help='Generator seed (default: 0)')
+    parser.add_argument(
+        '--repeat',
+        type=int,
+        default=1,
+        help='Runs of each stage; the fastest is recorded (default: 1)'
+    )
+    parser.add_argument(
+        '--output', '-o',
+        default='benchmark_results.json',
+        help='Results file to write (default: benchmark_results.json)'
+    )
+    parser.add_argument('--baseline', '-b', help='Earlier results file to compare with')
+    parser.add_argument(
+        '--tolerance',
+        type=float,
+        default=0.2,
+        help='Slowdown beyond which a stage counts as a regression (default: 0.2, i.e. 20%%)'
+    )
+    return parser.parse_args()
+
+def main():
+    """Main entry point for the benchmark suite."""
+    args = parse_arguments()
+
+    baseline = None
+    if args.baseline:
+        try:
+            with open(args.baseline, 'r', encoding='utf-8') as f:
+                baseline = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error: Could not read baseline: {str(e)}")
+            sys.exit(1)
+
+    results = run_benchmarks(args.sizes, args.formats, args.seed, args.repeat)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"Results saved to: {args.output}")
+
+    if baseline is None:
+        return
+    if baseline.get('seed') != results['seed']:
+        print("Warning: the baseline was generated with a different seed")
+    rows, regressions = compare(results, baseline, args.tolerance)
+    print(f"\n{'case':<14} {'stage':<12} {'baseline':>10} {'current':>10} {'ratio':>7}")
+    for name, stage, before, after, ratio in rows:
+        flag = '  <- regression' if (name, stage, before, after, ratio) in regressions else ''
+        ratio_text = f"{ratio:.2f}" if ratio is not None else '-'
+        print(f"{name:<14} {stage:<12} {before:>10.3f} {after:>10.3f} {ratio_text:>7}{flag}")
+    if regressions:
+        print(f"\n{len(regressions)} regressions beyond {args.tolerance:.0%}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
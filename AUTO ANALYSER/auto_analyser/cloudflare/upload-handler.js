@@ -13,6 +13,9 @@ const CF_ACCOUNT_ID = process.env.CF_ACCOUNT_ID;
 const CF_API_TOKEN = process.env.CF_API_TOKEN;
 const CF_STREAM_URL = `https://api.cloudflare.com/client/v4/accounts/${CF_ACCOUNT_ID}/stream`;
 
+// Local transcript analysis service (python service.py)
+const ANALYSER_URL = process.env.ANALYSER_URL || 'http://127.0.0.1:8765';
+
 // Validate environment variables
 if (!CF_ACCOUNT_ID || !CF_API_TOKEN) {
   console.error('Missing Cloudflare environment variables');
@@ -69,6 +72,62 @@ app.post('/upload', upload.single('video'), async (req, res) => {
   }
 });
 
+// Transcript analysis endpoint: forwards the upload to the analysis service
+app.post('/analyze', upload.single('transcript'), async (req, res) => {
+  try {
+    if (!req.file) {
+      return res.status(400).json({ error: 'No transcript uploaded' });
+    }
+
+    const params = new URLSearchParams({ filename: req.file.originalname });
+    if (req.query.wait) {
+      params.set('wait', req.query.wait);
+    }
+    const response = await fetch(`${ANALYSER_URL}/jobs?${params}`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/octet-stream' },
+      body: req.file.buffer
+    });
+
+    const retryAfter = response.headers.get('Retry-After');
+    if (retryAfter) {
+      res.set('Retry-After', retryAfter);
+    }
+    res.status(response.status).json(await response.json());
+
+  } catch (error) {
+    console.error('Analysis error:', error);
+    res.status(502).json({ error: 'Analysis service unavailable' });
+  }
+});
+
+// Analysis job status, results, report and the data shards of sharded
+// reports (report_data/<shard>.js, requested relative to the report)
+app.get(['/analyze/:jobId', '/analyze/:jobId/*'], async (req, res) => {
+  try {
+    const segments = [req.params.jobId, ...(req.params[0] || '').split('/')].filter(Boolean);
+    if (segments.some((segment) => segment === '.' || segment === '..')) {
+      return res.status(404).json({ error: 'Not found' });
+    }
+    const path = segments.map(encodeURIComponent).join('/');
+    // Compressed results are passed through undecoded with their Content-Encoding
+    const response = await fetch(`${ANALYSER_URL}/jobs/${path}`, { compress: false });
+
+    res.status(response.status);
+    for (const header of ['Content-Type', 'Content-Encoding']) {
+      const value = response.headers.get(header);
+      if (value) {
+        res.set(header, value);
+      }
+    }
+    res.send(await response.buffer());
+
+  } catch (error) {
+    console.error('Analysis error:', error);
+    res.status(502).json({ error: 'Analysis service unavailable' });
+  }
+});
+
 // Start server
 const PORT = process.env.PORT || 3001;
 app.listen(PORT, () => {
@@ -2,6 +2,8 @@
 Configuration settings for the Automated Analysis System
 """
 
+import os
+
 # Pattern categories based on Ben Mak assessments
 PATTERN_CATEGORIES = {
     'system_navigation': {
@@ -68,12 +70,123 @@ REPORT_SETTINGS = {
     'template_dir': 'templates',
     'main_template': 'report_template.html',
     'report_filename': 'analysis_report.html',
+    'results_filename': 'analysis_results.json',
+    'profile_filename': 'profile.json',  # Written next to the results with --profile
     'css_filename': 'report_style.css',
-    'js_filename': 'report_script.js'
+    'js_filename': 'report_script.js',
+    'mode': 'auto',  # 'single' page, 'sharded' shell page with lazily loaded data, or 'auto'
+    'shard_threshold': 2000,  # In auto mode, transcripts with more segments are sharded
+    'shell_template': 'report_shell.html',
+    'shard_dir': 'report_data',  # Subdirectory of the output directory holding the data shards
+    'segment_shard_size': 200,  # Transcript segments per shard
+    'card_shard_size': 50,  # Pattern cards per shard
+    'results_compression': None,  # None, 'gzip' or 'zstd' (needs the zstandard package)
+    'results_indent': None,  # Indent of the results JSON; None writes it compact and in batches
+    'parallel_writes': True  # Write the results JSON on a second thread while the report renders
 }
 
+# Words of a speaker name in an inline header: a word starting with a
+# letter that is not lowercase ("Ben", "O'Neil", "(ICS)"), or a lowercase
+# particle ("Ana de la Cruz")
+_NAME_WORD = r"\(?(?![a-zß-ÿ])[^\W\d_][\w.'’&/()-]*"
+_NAME_PARTICLE = r"(?:van|von|der|den|de|del|la|le|da|di|du|dos|bin|ibn|al)"
+
 # PDF processing settings
 PDF_SETTINGS = {
     'min_line_length': 10,  # Minimum characters for a line to be considered content
-    'speaker_pattern': r'^([A-Za-z\s]+)\s+(\d+:\d+)$',  # Pattern to identify speaker and timestamp
+    # Speaker header layouts, tried in order until one matches; the first
+    # header found fixes the layout for the rest of the transcript. A
+    # grammar gives either a one-line 'header' pattern, or a 'speaker'
+    # line pattern and the 'time' line pattern that must follow it. The
+    # named groups are speaker, time ('m:ss' or 'h:mm:ss') and optionally
+    # text. 'min_line_length' overrides the setting above for the layout.
+    'header_grammars': [
+        {
+            # "Ben Mak  1:05" or "Mbalu (ICS)  1:02:05"; the lookahead
+            # rejects speech lines, which rarely end in a digit, in one scan.
+            # The speaker is up to six capitalised words or name particles,
+            # so speech ending in a time ("Let's meet at 3:15") is content
+            'name': 'inline',
+            'header': (
+                r"^(?=.*\d$)(?P<speaker>" + _NAME_WORD + r"(?:[ \t]+(?:" + _NAME_WORD + r"|" + _NAME_PARTICLE
+                + r")){0,5})\s+(?P<time>\d+:\d+(?::\d+)?)$"
+            )
+        },
+        {
+            'name': 'bracketed',  # "[0:01:05] Ben Mak: Hello" or "[01:05] Ben Mak: Hello"
+            'header': r"^\[(?P<time>\d+:\d+(?::\d+)?)\]\s*(?P<speaker>[^\W\d_][^:\]]{0,59}):\s*(?P<text>.*)$"
+        },
+        {
+            'name': 'two_line',  # Grain: "Ben Mak" then "1:05", with the speech one word per line
+            'speaker': r"^(?P<speaker>[^\W\d_][\w.'’()&/ \t-]{0,59})$",
+            'time': r'^(?P<time>\d+:\d+(?::\d+)?)$',
+            'min_line_length': 1
+        }
+    ],
+    'header_lines': 50,  # Leading lines searched for metadata and the transcript start marker
+    'min_page_chars': 50,  # Pages with fewer non-whitespace characters are re-extracted with pdfminer
+    'max_nonprintable_ratio': 0.05,  # Pages with a larger share of garbled characters are re-extracted
+}
+
+# NLTK resource settings
+NLTK_SETTINGS = {
+    # Directories searched for NLTK data before nltk's own defaults: the
+    # os.pathsep-separated AUTO_ANALYSER_NLTK_DATA variable, then the
+    # nltk_data directory bundled next to this file
+    'data_dirs': [
+        path for path in os.environ.get('AUTO_ANALYSER_NLTK_DATA', '').split(os.pathsep) if path
+    ] + [os.path.join(os.path.dirname(os.path.abspath(__file__)), 'nltk_data')],
+    'auto_download': False,  # Download missing resources instead of failing (needs network access)
+    'sentiment': True,  # Score segment sentiment with VADER
+    'sentence_sentiment': False  # Also record the sentiment of every sentence in the results
+}
+
+# Extraction cache settings
+CACHE_SETTINGS = {
+    'enabled': True,
+    'cache_dir': os.environ.get(
+        'AUTO_ANALYSER_CACHE_DIR',
+        os.path.join(os.path.expanduser('~'), '.cache', 'auto_analyser', 'extraction')
+    ),
+    'max_size_mb': 512  # Least recently used entries are evicted beyond this size
+}
+
+# Pattern pack settings
+PATTERN_PACK_SETTINGS = {
+    'compiled_dir': os.environ.get(
+        'AUTO_ANALYSER_PATTERN_CACHE_DIR',
+        os.path.join(os.path.expanduser('~'), '.cache', 'auto_analyser', 'patterns')
+    )  # Parsed YAML packs are stored here as JSON, keyed by a hash of the pack file
+}
+
+# Cross-transcript pattern index settings
+INDEX_SETTINGS = {
+    'enabled': True,  # Index every analysis written to an output directory
+    'filename': 'pattern_index.sqlite',  # Created in the top-level output directory
+    # Formats tried, in order, when reading transcript dates and --from/--to
+    'date_formats': ('%Y-%m-%d', '%d/%m/%Y', '%d-%m-%Y', '%d %B %Y', '%d %b %Y', '%B %d, %Y')
+}
+
+# SQLite results store settings
+STORE_SETTINGS = {
+    'filename': 'analysis_results.sqlite'  # Created in the top-level output directory by --sqlite
+}
+
+# Analysis service settings
+SERVICE_SETTINGS = {
+    'host': '127.0.0.1',
+    'port': 8765,
+    'output_dir': 'service_output',  # Each job writes its upload and report to a subdirectory
+    'queue_size': 16,  # Jobs waiting beyond this are refused with 503 until the queue drains
+    'threads': 1,  # Analysis threads, each with its own warm pipeline
+    'max_upload_mb': 100,
+    'max_jobs': 1000,  # Finished jobs remembered for status queries; older jobs and their output are deleted
+    'max_wait_seconds': 600,  # Longest ?wait= a submission may ask for
+    'allow_paths': False  # Accept server-side file paths as well as uploads
+}
+
+# Corpus (batch) processing settings
+CORPUS_SETTINGS = {
+    'extensions': ('.pdf', '.txt', '.vtt', '.srt', '.json', '.jsonl'),  # File types picked up when a directory is given
+    'summary_filename': 'corpus_summary.json'
 }
@@ -0,0 +1,340 @@
+"""
+Corpus Module
+------------
+This module runs the analysis pipeline over a corpus of transcripts,
+building the extractor, matcher and report generator once and streaming
+each transcript through them.
+"""
+
+import os
+import re
+import glob
+import json
+import sqlite3
+import logging
+from collections import Counter
+from datetime import datetime
+from pdf_processing.pdf_extractor import PDFExtractor
+from pdf_processing.extraction_cache import ExtractionCache
+from pattern_analysis.pattern_matcher import PatternMatcher
+from pattern_analysis.pattern_packs import PatternPackSource
+from result_storage.pattern_index import PatternIndex
+from result_storage.sqlite_store import SQLiteResultStore
+from report_generation.report_generator import ReportGenerator
+from profiling import Profiler, format_summary
+import profiling
+import config
+
+logger = logging.getLogger(__name__)
+
+def resolve_inputs(source=None, manifest=None, exclude_dir=None):
+    """
+    Resolve a directory, glob pattern or manifest file into transcript paths.
+
+    Args:
+        source (str): A transcript file, a directory of transcripts or a glob pattern
+        manifest (str): A file listing one transcript path per line; blank
+            lines and lines starting with '#' are ignored, and relative
+            paths are resolved against the manifest's directory
+        exclude_dir (str): Directory whose files are never picked up from a
+            directory walk or glob, so that reports and JSON results written
+            to an output directory inside the corpus are not re-analyzed
+
+    Returns:
+        list: Sorted, de-duplicated transcript paths
+    """
+    extensions = config.CORPUS_SETTINGS['extensions']
+    paths = []
+
+    if manifest:
+        base_dir = os.path.dirname(os.path.abspath(manifest))
+        with open(manifest, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith('#'):
+                    paths.append(os.path.join(base_dir, line))
+
+    if source:
+        found = []
+        if os.path.isdir(source):
+            for root, _, files in os.walk(source):
+                for name in files:
+                    if name.lower().endswith(extensions):
+                        found.append(os.path.join(root, name))
+        elif os.path.exists(source):
+            paths.append(source)
+        else:
+            found.extend(
+                path for path in glob.glob(source, recursive=True)
+                if os.path.isfile(path)
+            )
+
+        if exclude_dir:
+            excluded = os.path.join(os.path.abspath(exclude_dir), '')
+            found = [path for path in found if not os.path.abspath(path).startswith(excluded)]
+        paths.extend(found)
+
+    return sorted(set(paths))
+
+def is_corpus_source(source):
+    """Return True if source names a directory or a glob pattern rather than a file."""
+    return os.path.isdir(source) or (
+        not os.path.exists(source) and glob.has_magic(source)
+    )
+
+class AnalysisPipeline:
+    """Extraction, analysis and report generation with components kept warm."""
+
+    def __init__(self, workers=1, use_cache=None, refresh_cache=False, incremental=False,
+                 extract_workers=1, sentiment=None, patterns=None, index=None,
+                 store=None, report_mode=None, compression=None, profile=False,
+                 profile_summary=False, start=None, end=None, speakers=None):
+        """
+        Initialize the pipeline components.
+
+        Args:
+            workers (int): Number of worker processes for segment analysis
+            use_cache (bool): Cache extracted transcripts on disk
+                (default: config.CACHE_SETTINGS['enabled'])
+            refresh_cache (bool): Re-extract transcripts and overwrite cached entries
+            incremental (bool): Reuse results already saved in the output
+                directory, evaluating only new or changed patterns
+            extract_workers (int): Number of worker processes for PDF page extraction
+            sentiment (bool): Score segment sentiment
+                (default: config.NLTK_SETTINGS['sentiment'])
+            patterns (str): Pattern pack file to use instead of the built-in
+                patterns; it is reloaded before a transcript is analyzed
+                whenever the file has changed
+            index (str): Pattern index database every analysis is added to
+            store (str): SQLite results database every analysis is saved to
+            report_mode (str): 'single', 'sharded' or 'auto'
+                (default: config.REPORT_SETTINGS['mode'])
+            compression (str): Compression of the results JSON, None, 'gzip'
+                or 'zstd' (default: config.REPORT_SETTINGS['results_compression'])
+            profile (bool): Record stage timings and pattern and keyword
+                costs of every transcript to a profile next to its results
+            profile_summary (bool): Also print each profile as a table
+            start (int): Only analyze the segments from this many seconds
+                into each transcript
+            end (int): Only analyze the segments before this many seconds
+            speakers (list): Only analyze the segments of these speakers
+
+        Raises:
+            PatternPackError: If the pattern pack is invalid
+            ValueError: If the results compression is unknown or unavailable
+        """
+        if use_cache is None:
+            use_cache = config.CACHE_SETTINGS['enabled']
+        cache = ExtractionCache() if use_cache else None
+        self.extractor = PDFExtractor(cache=cache, refresh=refresh_cache, workers=extract_workers)
+        self.pattern_source = PatternPackSource(patterns) if patterns else None
+        self.matcher = PatternMatcher(
+            workers=workers,
+            sentiment=sentiment,
+            registry=self.pattern_source.registry if self.pattern_source else None
+        )
+        self.generator = ReportGenerator(compression=compression)
+        self.index = PatternIndex(index) if index else None
+        self.store = SQLiteResultStore(store) if store else None
+        self.incremental = incremental
+        self.report_mode = report_mode
+        self.profile = profile or profile_summary
+        self.profile_summary = profile_summary
+        self.selection = {'start': start, 'end': end, 'speakers': speakers}
+
+    def warm_up(self):
+        """Load the NLTK models and report template now instead of on the first transcript."""
+        self.matcher.sentence_tokenizer
+        if self.matcher.sentiment:
+            self.matcher.scorer
+        self.generator.env.get_template(config.REPORT_SETTINGS['main_template'])
+
+    def close(self):
+        """Release the extractor's and matcher's worker pools and the databases."""
+        self.extractor.close()
+        self.matcher.close()
+        if self.index is not None:
+            self.index.close()
+        if self.store is not None:
+            self.store.close()
+
+    def run(self, transcript_file, output_dir):
+        """
+        Analyze one transcript and write its report.
+
+        Args:
+            transcript_file (str): Path to the transcript file
+            output_dir (str): Directory to save the report
+
+        Returns:
+            tuple: (report_path, transcript_data, analysis_results)
+        """
+        # Pick up an edited pattern pack; analyses already running keep the
+        # registry they started with
+        if self.pattern_source is not None:
+            registry = self.pattern_source.poll()
+            if registry is not None:
+                print(f"Reloaded pattern pack {self.pattern_source.path} ({len(registry)} patterns)")
+                self.matcher.registry = registry
+
+        profiler = Profiler() if self.profile else None
+
+        # Analyze the transcript for patterns
+        print("Analyzing transcript for patterns...")
+        previous_results = self.generator.load_results(output_dir) if self.incremental else None
+        if previous_results is not None:
+            transcript = self.extractor.extract_text(transcript_file, profiler=profiler)
+            analysis_results = self.matcher.reanalyze(
+                transcript, previous_results, profiler=profiler, **self.selection
+            )
+        else:
+            # Segments are analyzed while the rest of the file is extracted
+            transcript = self.extractor.extract_text(transcript_file, stream=True, profiler=profiler)
+            analysis_results = self.matcher.analyze(transcript, profiler=profiler, **self.selection)
+
+        # Generate the report
+        print("Generating analysis report...")
+        report_path = self.generator.generate_report(
+            transcript, analysis_results, output_dir, mode=self.report_mode, profiler=profiler
+        )
+
+        # The report is already written, so a failure to index or store is not fatal
+        if self.index is not None:
+            try:
+                with profiling.stage(profiler, 'index'):
+                    self.index.add(output_dir, transcript, analysis_results, source=transcript_file)
+            except sqlite3.Error as e:
+                logger.error(f"Could not index {transcript_file}: {str(e)}")
+        if self.store is not None:
+            try:
+                with profiling.stage(profiler, 'store'):
+                    self.store.save(output_dir, transcript, analysis_results, source=transcript_file)
+            except sqlite3.Error as e:
+                logger.error(f"Could not store results of {transcript_file}: {str(e)}")
+
+        if profiler is not None:
+            profile_path = os.path.join(output_dir, config.REPORT_SETTINGS['profile_filename'])
+            profile = profiler.write(
+                profile_path,
+                transcript_file=transcript_file,
+                segments=len(transcript['segments']),
+                created=datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            )
+            print(f"Profile saved to: {profile_path}")
+            if self.profile_summary:
+                print(format_summary(profile))
+        return report_path, transcript, analysis_results
+
+def run_corpus(pipeline, transcript_files, output_dir):
+    """
+    Analyze every transcript in a corpus and write a corpus-level summary.
+
+    Each transcript is written to its own subdirectory of output_dir. A
+    transcript that fails is recorded in the summary and does not stop
+    the run.
+
+    Args:
+        pipeline (AnalysisPipeline): Pipeline to stream the transcripts through
+        transcript_files (list): Paths of the transcripts to analyze
+        output_dir (str): Directory to save the reports and summary
+
+    Returns:
+        str: Path to the corpus summary
+    """
+    os.makedirs(output_dir, exist_ok=True)
+
+    entries = []
+    used_names = set()
+    category_counts = Counter()
+    pattern_counts = Counter()
+    total_segments = 0
+    total_patterns = 0
+
+    for index, transcript_file in enumerate(transcript_files, 1):
+        name = _output_name(transcript_file, used_names)
+        transcript_output = os.path.join(output_dir, name)
+        logger.info(f"[{index}/{len(transcript_files)}] {transcript_file}")
+        print(f"[{index}/{len(transcript_files)}] Processing transcript: {transcript_file}")
+
+        entry = {
+            'input': transcript_file,
+            'output_dir': transcript_output
+        }
+        try:
+            report_path, transcript, analysis_results = pipeline.run(
+                transcript_file, transcript_output
+            )
+        except Exception as e:
+            logger.error(f"Analysis failed for {transcript_file}: {str(e)}")
+            entry.update({'status': 'error', 'error': str(e)})
+            entries.append(entry)
+            continue
+
+        overall = analysis_results['overall_analysis']
+        entry.update({
+            'status': 'ok',
+            'report': report_path,
+            'title': transcript['metadata'].get('title', ''),
+            'date': transcript['metadata'].get('date', ''),
+            'segments': overall['total_segments'],
+            'patterns_found': len(analysis_results['patterns_found']),
+            'dominant_category': overall.get('dominant_category'),
+            'dominant_speaker': overall.get('dominant_speaker'),
+            'category_counts': dict(overall['category_counts']),
+            'pattern_counts': dict(overall['pattern_counts'])
+        })
+        entries.append(entry)
+
+        total_segments += entry['segments']
+        total_patterns += entry['patterns_found']
+        category_counts.update(entry['category_counts'])
+        pattern_counts.update(entry['pattern_counts'])
+
+    totals = {
+        'segments': total_segments,
+        'patterns_found': total_patterns,
+        'category_counts': dict(category_counts.most_common()),
+        'pattern_counts': dict(pattern_counts.most_common())
+    }
+    if pipeline.store is not None:
+        # Aggregate the stored results of this run in SQL
+        stored = pipeline.store.corpus_totals(
+            [entry['output_dir'] for entry in entries if entry['status'] == 'ok']
+        )
+        totals = {key: stored[key] for key in totals}
+
+    summary = {
+        'generated': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'transcript_count': len(entries),
+        'failed_count': sum(1 for entry in entries if entry['status'] == 'error'),
+        'totals': totals,
+        'transcripts': entries
+    }
+
+    summary_path = os.path.join(output_dir, config.CORPUS_SETTINGS['summary_filename'])
+    with open(summary_path, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2)
+
+    return summary_path
+
+def _output_name(transcript_file, used_names):
+    """
+    Choose a unique output subdirectory name for a transcript.
+
+    Args:
+        transcript_file (str): Path to the transcript file
+        used_names (set): Names already allocated in this run; updated in place
+
+    Returns:
+        str: Directory name derived from the transcript file name
+    """
+    stem = os.path.splitext(os.path.basename(transcript_file))[0]
+    base = re.sub(r'[^\w.-]+', '_', stem).strip('._') or 'transcript'
+
+    name = base
+    suffix = 2
+    while name in used_names:
+        name = f"{base}-{suffix}"
+        suffix += 1
+    used_names.add(name)
+    return name
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Live Analysis
+-------------
+Analyze a transcript while it is being written, reporting pattern
+matches as each speaker segment completes.
+
+Usage:
+    python live.py [<transcript.txt> | -] [--follow] [--category coercive_control]
+                   [--json] [--output <output_dir>]
+
+Lines are read in the plain-text transcript layouts of
+config.PDF_SETTINGS['header_grammars'] (e.g. "Speaker  m:ss" followed
+by the speech). A segment is complete when the next speaker header
+arrives, or when the input ends.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+
+def parse_arguments():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description='Report pattern matches in a transcript as it is being written'
+    )
+    parser.add_argument(
+        'transcript_file',
+        nargs='?',
+        default='-',
+        help='Plain-text transcript to read, or - for standard input (default: -)'
+    )
+    parser.add_argument(
+        '--follow', '-f',
+        action='store_true',
+        help='Keep reading lines appended to the file until interrupted, like tail -f'
+    )
+    parser.add_argument(
+        '--category', '-c',
+        action='append',
+        help='Only report matches in this pattern category (may be repeated)'
+    )
+    parser.add_argument('--json', action='store_true', help='Print each match as a JSON line')
+    parser.add_argument(
+        '--output', '-o',
+        help='Write a report of everything analyzed to this directory when the input ends'
+    )
+    parser.add_argument(
+        '--no-sentiment',
+        action='store_true',
+        help='Skip sentiment scoring, so the VADER lexicon is never loaded'
+    )
+    return parser.parse_args()
+
+def follow_lines(file, poll_interval=0.5):
+    """
+    Yield lines from a file, waiting for more at the end instead of stopping.
+
+    Args:
+        file: Text file object
+        poll_interval (float): Seconds to wait before checking for new lines
+    """
+    pending = ''
+    while True:
+        line = file.readline()
+        if not line:
+            time.sleep(poll_interval)
+            continue
+        pending += line
+        if pending.endswith('\n'):
+            yield pending.rstrip('\n')
+            pending = ''
+
+def main():
+    """Main entry point for live analysis."""
+    args = parse_arguments()
+    if args.transcript_file != '-' and not os.path.exists(args.transcript_file):
+        print(f"Error: Transcript file '{args.transcript_file}' not found.")
+        sys.exit(1)
+
+    # Imported after argument parsing so --help does not load the analysis stack
+    from pdf_processing.pdf_extractor import PDFExtractor
+    from pattern_analysis.pattern_matcher import PatternMatcher
+    from pattern_analysis.live_analyzer import LiveAnalyzer
+
+    categories = set(args.category or ())
+
+    def report(match):
+        if categories and match['category'] not in categories:
+            return
+        if args.json:
+            print(json.dumps(match), flush=True)
+            return
+        keywords = ', '.join(sorted({hit['match_text'] for hit in match['keyword_matches']}))
+        print(f"[{match['timestamp']}] {match['speaker']}: {match['pattern_name']} "
+              f"({match['pattern_id']}, evidence {match['evidence_level']}) - {keywords}", flush=True)
+
+    matcher = PatternMatcher(sentiment=False if args.no_sentiment else None)
+    live = LiveAnalyzer(matcher, on_match=report)
+
+    file = sys.stdin if args.transcript_file == '-' else open(args.transcript_file, 'r', encoding='utf-8')
+    lines = follow_lines(file) if args.follow else (line.rstrip('\n') for line in file)
+    try:
+        # The extractor's segmenter completes each segment at the next speaker line
+        for segment in PDFExtractor()._iter_segments(lines):
+            live.add_segment(segment)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if file is not sys.stdin:
+            file.close()
+
+    print(f"Analyzed {len(live)} segments, {len(live.table)} pattern matches", file=sys.stderr)
+    if args.output and len(live):
+        from report_generation.report_generator import ReportGenerator
+        report_path = ReportGenerator().generate_report(live.transcript(), live.snapshot(), args.output)
+        print(f"Report saved to: {report_path}", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -6,16 +6,24 @@ This system analyzes transcripts to identify patterns of institutional gaslighti
 coercive control, and other problematic communication dynamics.
 
 Usage:
-    python main.py <transcript_file> [--output <output_dir>]
+    python main.py <transcript_file> [--output <output_dir>] [--jobs <n>]
+                   [--from <m:ss>] [--to <m:ss>] [--speaker <name>]
+    python main.py <directory | "glob"> [--output <output_dir>]
+    python main.py --manifest <manifest_file> [--output <output_dir>]
 """
 
 import os
 import sys
 import argparse
-from pdf_processing.pdf_extractor import PDFExtractor
-from pattern_analysis.pattern_matcher import PatternMatcher
-from report_generation.report_generator import ReportGenerator
-import config
+
+def time_argument(value):
+    """Parse a time argument given as m:ss, h:mm:ss or seconds."""
+    from pdf_processing.transcript_loaders import parse_timestamp
+
+    seconds = parse_timestamp(value)
+    if seconds is None or seconds < 0:
+        raise argparse.ArgumentTypeError(f"invalid time '{value}', expected m:ss, h:mm:ss or seconds")
+    return seconds
 
 def parse_arguments():
     """Parse command line arguments."""
@@ -24,47 +32,188 @@ def parse_arguments():
     )
     parser.add_argument(
         'transcript_file',
-        help='Path to the transcript file (PDF or text)'
+        nargs='?',
+        help='Path to the transcript file (PDF, text, VTT, SRT, JSON or JSON Lines), a directory of '
+             'transcripts, or a quoted glob pattern'
+    )
+    parser.add_argument(
+        '--manifest', '-m',
+        help='File listing one transcript path per line to analyze as a corpus'
     )
     parser.add_argument(
         '--output', '-o',
         default='output',
         help='Directory to save the analysis results (default: output)'
     )
-    return parser.parse_args()
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=1,
+        help='Number of worker processes for segment analysis (default: 1)'
+    )
+    parser.add_argument(
+        '--extract-jobs',
+        type=int,
+        default=1,
+        help='Number of worker processes for PDF page extraction (default: 1)'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Do not read or write the extracted transcript cache'
+    )
+    parser.add_argument(
+        '--refresh',
+        action='store_true',
+        help='Re-extract transcripts and overwrite their cache entries'
+    )
+    parser.add_argument(
+        '--no-sentiment',
+        action='store_true',
+        help='Skip sentiment scoring, so the VADER lexicon is never loaded'
+    )
+    parser.add_argument(
+        '--patterns',
+        help='YAML or JSON pattern pack to use instead of the built-in patterns'
+    )
+    parser.add_argument(
+        '--no-index',
+        action='store_true',
+        help='Do not add the results to the pattern index in the output directory'
+    )
+    parser.add_argument(
+        '--sqlite',
+        nargs='?',
+        const='',
+        metavar='DATABASE',
+        help='Also save the results to a SQLite database '
+             '(default: analysis_results.sqlite in the output directory)'
+    )
+    parser.add_argument(
+        '--report-mode',
+        choices=('auto', 'single', 'sharded'),
+        help='Write one self-contained report page, or a light page that loads the transcript '
+             'and pattern cards on demand (default: auto, sharded for long transcripts)'
+    )
+    parser.add_argument(
+        '--compress',
+        choices=('gzip', 'zstd'),
+        help='Compress the results JSON (zstd needs the zstandard package)'
+    )
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='Record stage timings and pattern and keyword costs to profile.json '
+             'next to the results (slows matching)'
+    )
+    parser.add_argument(
+        '--profile-summary',
+        action='store_true',
+        help='Like --profile, and also print the profile as a table'
+    )
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Reuse results in the output directory and only evaluate new or changed patterns'
+    )
+    parser.add_argument(
+        '--from',
+        dest='start',
+        type=time_argument,
+        metavar='TIME',
+        help='Only analyze the transcript from this time on (m:ss, h:mm:ss or seconds)'
+    )
+    parser.add_argument(
+        '--to',
+        dest='end',
+        type=time_argument,
+        metavar='TIME',
+        help='Only analyze the transcript up to this time (m:ss, h:mm:ss or seconds)'
+    )
+    parser.add_argument(
+        '--speaker',
+        action='append',
+        help='Only analyze what this speaker said (may be repeated; a trailing * matches by prefix)'
+    )
+    args = parser.parse_args()
+    if not args.transcript_file and not args.manifest:
+        parser.error('a transcript file, directory, glob or --manifest is required')
+    if args.start is not None and args.end is not None and args.start >= args.end:
+        parser.error('--from must be earlier than --to')
+    return args
 
 def main():
     """Main entry point for the application."""
     args = parse_arguments()
-    
-    # Check if the transcript file exists
-    if not os.path.exists(args.transcript_file):
+
+    # Imported after argument parsing so --help does not load the analysis stack
+    from corpus import AnalysisPipeline, resolve_inputs, is_corpus_source, run_corpus
+    import config
+
+    corpus_mode = bool(args.manifest) or is_corpus_source(args.transcript_file)
+
+    if corpus_mode:
+        transcript_files = resolve_inputs(args.transcript_file, args.manifest, exclude_dir=args.output)
+        if not transcript_files:
+            print("Error: No transcript files found.")
+            sys.exit(1)
+    elif not os.path.exists(args.transcript_file):
+        # Check if the transcript file exists
         print(f"Error: Transcript file '{args.transcript_file}' not found.")
         sys.exit(1)
-    
+
     # Create output directory if it doesn't exist
     os.makedirs(args.output, exist_ok=True)
-    
-    # Extract text from the transcript file
-    print(f"Processing transcript: {args.transcript_file}")
-    extractor = PDFExtractor()
-    transcript = extractor.extract_text(args.transcript_file)
-    
-    # Analyze the transcript for patterns
-    print("Analyzing transcript for patterns...")
-    matcher = PatternMatcher()
-    analysis_results = matcher.analyze(transcript)
-    
-    # Generate the report
-    print("Generating analysis report...")
-    generator = ReportGenerator()
-    report_path = generator.generate_report(
-        transcript, 
-        analysis_results, 
-        args.output
-    )
-    
-    print(f"Analysis complete. Report saved to: {report_path}")
+
+    # Every analysis written to the output directory is added to its pattern index
+    index_path = None
+    if config.INDEX_SETTINGS['enabled'] and not args.no_index:
+        index_path = os.path.join(args.output, config.INDEX_SETTINGS['filename'])
+
+    store_path = None
+    if args.sqlite is not None:
+        store_path = args.sqlite or os.path.join(args.output, config.STORE_SETTINGS['filename'])
+
+    # Build the extractor, matcher and report generator once
+    try:
+        pipeline = AnalysisPipeline(
+            workers=args.jobs,
+            use_cache=False if args.no_cache else None,
+            refresh_cache=args.refresh,
+            incremental=args.incremental,
+            extract_workers=args.extract_jobs,
+            sentiment=False if args.no_sentiment else None,
+            patterns=args.patterns,
+            index=index_path,
+            store=store_path,
+            report_mode=args.report_mode,
+            compression=args.compress,
+            profile=args.profile,
+            profile_summary=args.profile_summary,
+            start=args.start,
+            end=args.end,
+            speakers=args.speaker
+        )
+    except (OSError, LookupError, ValueError) as e:
+        print(f"Error: Could not set up the analysis: {str(e)}")
+        sys.exit(1)
+    try:
+        if corpus_mode:
+            print(f"Processing corpus of {len(transcript_files)} transcripts")
+            summary_path = run_corpus(pipeline, transcript_files, args.output)
+            print(f"Corpus analysis complete. Summary saved to: {summary_path}")
+        else:
+            print(f"Processing transcript: {args.transcript_file}")
+            report_path, _, _ = pipeline.run(args.transcript_file, args.output)
+            print(f"Analysis complete. Report saved to: {report_path}")
+    except (OSError, LookupError, ValueError) as e:
+        # Segments are read as they are analyzed, so a malformed transcript
+        # is only found during the run, as are missing NLTK resources, which
+        # are loaded the first time they are needed
+        print(f"Error: {str(e)}")
+        sys.exit(1)
+    finally:
+        pipeline.close()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,184 @@
+"""
+Live Analyzer Module
+-------------------
+This module analyzes a transcript while it is still being produced.
+Segments are added one at a time, or consumed from an async iterator,
+and each one updates the speaker statistics, sentiment sums, pattern
+counts and evidence levels in time independent of the transcript
+length. Matches are reported as soon as their segment is added, and a
+snapshot of the results so far can be taken at any time.
+"""
+
+import os
+import sys
+import hashlib
+import logging
+
+# Import local modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pattern_analysis.match_table import MatchTable
+from pattern_analysis.pattern_matcher import PatternMatcher, evidence_level, _update_fingerprint
+from pattern_analysis.sentiment import SENTIMENT_KEYS
+
+class LiveAnalyzer:
+    """Pattern analysis of a transcript that grows one segment at a time."""
+
+    def __init__(self, matcher=None, metadata=None, on_match=None):
+        """
+        Start an empty analysis.
+
+        Args:
+            matcher (PatternMatcher): Matcher whose registry, sentiment
+                settings and loaded models are used (default: a new
+                in-process PatternMatcher). The registry is pinned for the
+                whole analysis, as analyze() pins it for one transcript.
+            metadata (dict): Transcript metadata, kept for snapshot()
+            on_match (callable): Called with each match dictionary as soon
+                as its segment is added
+        """
+        self.logger = logging.getLogger(__name__)
+        self.matcher = matcher if matcher is not None else PatternMatcher()
+        self.registry = self.matcher.registry
+        self.metadata = metadata if metadata is not None else {}
+        self.on_match = on_match
+
+        self.segments = []
+        self.table = MatchTable(self.registry, self.segments)
+        # Speaker statistics in order of first appearance; sentiment holds
+        # running sums, divided by the segment count in snapshot()
+        self.speakers = {}
+        self.category_counts = {}
+        self.pattern_counts = {}
+        self.sentence_sentiment = None
+        if self.matcher.sentence_sentiment:
+            self.sentence_sentiment = {
+                column: [] for column in ('segment_index', 'start', 'end') + SENTIMENT_KEYS
+            }
+        self._fingerprint = hashlib.sha256()
+
+    def __len__(self):
+        return len(self.segments)
+
+    def add_segment(self, segment):
+        """
+        Analyze one more segment.
+
+        Args:
+            segment (dict): Segment with speaker, timestamp and text
+
+        Returns:
+            list: Match dictionaries of the patterns found in the segment,
+                with their evidence levels
+        """
+        matcher = self.matcher
+        segment_index = len(self.segments)
+        self.segments.append(segment)
+        _update_fingerprint(self._fingerprint, segment)
+
+        speaker = segment['speaker']
+        text = segment['text']
+        stats = self.speakers.get(speaker)
+        if stats is None:
+            stats = self.speakers[speaker] = {
+                'segment_count': 0,
+                'word_count': 0,
+                'patterns': {},
+                'sentiment': {'positive': 0, 'negative': 0, 'neutral': 0, 'compound': 0}
+            }
+        stats['segment_count'] += 1
+        stats['word_count'] += len(text.split())
+        if matcher.sentiment:
+            for key, value in zip(SENTIMENT_KEYS, matcher.scorer.score([text])[0].tolist()):
+                stats['sentiment'][key] += value
+
+        sentence_spans = list(matcher.sentence_tokenizer.span_tokenize(text))
+        if self.sentence_sentiment is not None and sentence_spans:
+            sentences = self.sentence_sentiment
+            scores = matcher.scorer.score_sentences(text, sentence_spans)
+            for (start, end), row in zip(sentence_spans, scores.tolist()):
+                sentences['segment_index'].append(segment_index)
+                sentences['start'].append(start)
+                sentences['end'].append(end)
+                for key, value in zip(SENTIMENT_KEYS, row):
+                    sentences[key].append(value)
+
+        # Match the segment and grade the new rows straight away
+        table = self.table
+        first_row = len(table)
+        matcher._match_segment(text, segment_index, table, sentence_spans=sentence_spans)
+        matches = []
+        for row in range(first_row, len(table)):
+            table.evidence_level[row] = evidence_level(table.confidence(row), table.hit_count(row))
+            pattern = self.registry[table.pattern_index[row]]
+            self.category_counts[pattern['category']] = self.category_counts.get(pattern['category'], 0) + 1
+            self.pattern_counts[pattern['id']] = self.pattern_counts.get(pattern['id'], 0) + 1
+            stats['patterns'][pattern['id']] = stats['patterns'].get(pattern['id'], 0) + 1
+            matches.append(table.expand(row))
+
+        if self.on_match is not None:
+            for match in matches:
+                self.on_match(match)
+        return matches
+
+    async def consume(self, segments):
+        """
+        Analyze segments from an async iterator as they arrive.
+
+        Each segment is analyzed on the event loop's thread; at the scale of
+        a single segment this takes milliseconds.
+
+        Args:
+            segments: Async iterable of segment dictionaries
+
+        Yields:
+            dict: Match dictionaries, as add_segment() returns them
+        """
+        async for segment in segments:
+            for match in self.add_segment(segment):
+                yield match
+
+    def snapshot(self):
+        """
+        Return the results for the segments added so far.
+
+        The results are what PatternMatcher.analyze() returns for a
+        transcript of these segments. Later segments do not change a
+        snapshot already taken.
+
+        Returns:
+            dict: Analysis results, as returned by PatternMatcher.analyze()
+        """
+        matcher = self.matcher
+        segments = list(self.segments)
+        results = matcher._new_results(len(segments), segments, self.registry)
+        results['patterns_found'].extend(self.table.columns())
+
+        for speaker, stats in self.speakers.items():
+            speaker_stats = results['speakers'][speaker]
+            speaker_stats['segment_count'] = stats['segment_count']
+            speaker_stats['word_count'] = stats['word_count']
+            speaker_stats['patterns'].update(stats['patterns'])
+            speaker_stats['sentiment'] = {
+                key: value / stats['segment_count'] for key, value in stats['sentiment'].items()
+            }
+        results['overall_analysis']['category_counts'].update(self.category_counts)
+        results['overall_analysis']['pattern_counts'].update(self.pattern_counts)
+        if self.sentence_sentiment is not None:
+            results['sentence_sentiment'] = {
+                column: list(values) for column, values in self.sentence_sentiment.items()
+            }
+
+        results['pattern_fingerprints'] = dict(self.registry.fingerprints)
+        results['segments_fingerprint'] = self._fingerprint.copy().hexdigest()
+        results['sentiment_enabled'] = matcher.sentiment
+        matcher._generate_overall_analysis(results)
+        return results
+
+    def transcript(self):
+        """
+        Return the transcript data of the segments added so far.
+
+        Returns:
+            dict: Transcript data with the metadata and a copy of the segment list
+        """
+        return {'metadata': self.metadata, 'segments': list(self.segments)}
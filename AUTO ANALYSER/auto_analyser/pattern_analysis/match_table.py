@@ -0,0 +1,190 @@
+"""
+Match Table Module
+-----------------
+This module stores pattern matches as parallel arrays of indices and
+character offsets. Segment text and pattern metadata are referenced
+rather than copied, and matches are only expanded to dictionaries when
+a report or JSON file is written.
+"""
+
+from array import array
+
+# Row columns: one entry per (segment, pattern) match
+_ROW_COLUMNS = ('segment_index', 'pattern_index', 'evidence_level')
+
+# Hit columns: one entry per keyword match
+_HIT_COLUMNS = ('keyword_index', 'start', 'end', 'sentence_index',
+                'context_start', 'context_end')
+
+class MatchTable:
+    """Columnar store of pattern matches that expands to match dictionaries."""
+
+    def __init__(self, registry, segments=None):
+        """
+        Initialize an empty match table.
+
+        Args:
+            registry (PatternRegistry): Patterns indexed by the pattern_index
+                column (any sequence of patterns will do)
+            segments (list): Transcript segments indexed by the segment_index
+                column; only needed to expand matches. A list that is still
+                being filled (e.g. while segments are streamed) may be passed.
+        """
+        self.registry = registry
+        self.segments = segments
+        self.segment_index = array('l')
+        self.pattern_index = array('l')
+        self.evidence_level = array('b')
+        # The hits of row r are hit_offset[r]:hit_offset[r + 1]
+        self.hit_offset = array('l', [0])
+        self.keyword_index = array('l')
+        self.start = array('l')
+        self.end = array('l')
+        self.sentence_index = array('l')
+        self.context_start = array('l')
+        self.context_end = array('l')
+
+    def __len__(self):
+        return len(self.segment_index)
+
+    def __iter__(self):
+        for row in range(len(self)):
+            yield self.expand(row)
+
+    def __getitem__(self, row):
+        return self.expand(row)
+
+    def add(self, segment_index, pattern_index, hits, evidence_level=0):
+        """
+        Append a match.
+
+        Args:
+            segment_index (int): Index of the matched segment
+            pattern_index (int): Index of the matched pattern
+            hits (list): (keyword_index, start, end, sentence_index,
+                context_start, context_end) tuple of each keyword match
+            evidence_level (int): Evidence level, if already known
+        """
+        for keyword_index, start, end, sentence_index, context_start, context_end in hits:
+            self.keyword_index.append(keyword_index)
+            self.start.append(start)
+            self.end.append(end)
+            self.sentence_index.append(sentence_index)
+            self.context_start.append(context_start)
+            self.context_end.append(context_end)
+        self.segment_index.append(segment_index)
+        self.pattern_index.append(pattern_index)
+        self.evidence_level.append(evidence_level)
+        self.hit_offset.append(len(self.keyword_index))
+
+    def hits(self, row):
+        """Return the hit tuples of a row, in the form accepted by add()."""
+        return list(zip(*(
+            getattr(self, column)[self.hit_offset[row]:self.hit_offset[row + 1]]
+            for column in _HIT_COLUMNS
+        )))
+
+    def hit_count(self, row):
+        """Return the number of keyword matches of a row."""
+        return self.hit_offset[row + 1] - self.hit_offset[row]
+
+    def confidence(self, row):
+        """Return the share of the pattern's keywords matched by a row, capped at 1."""
+        keyword_count = len(self.registry[self.pattern_index[row]]['keywords'])
+        return min(1.0, self.hit_count(row) / keyword_count)
+
+    def columns(self):
+        """
+        Return the raw columns, e.g. to send matches between processes.
+
+        Returns:
+            dict: Column name to array; hit_offset holds the hit count of each row
+        """
+        columns = {column: getattr(self, column) for column in _ROW_COLUMNS + _HIT_COLUMNS}
+        columns['hit_offset'] = array('l', (
+            self.hit_offset[row + 1] - self.hit_offset[row] for row in range(len(self))
+        ))
+        return columns
+
+    def extend(self, columns):
+        """
+        Append matches given as raw columns.
+
+        Args:
+            columns (dict): Columns returned by columns() of another table
+                over the same registry and segments
+        """
+        for column in _ROW_COLUMNS + _HIT_COLUMNS:
+            getattr(self, column).extend(columns[column])
+        offset = self.hit_offset[-1]
+        for count in columns['hit_offset']:
+            offset += count
+            self.hit_offset.append(offset)
+
+    def sort(self, key, reverse=False):
+        """
+        Reorder the rows in place, as list.sort() would (the sort is stable).
+
+        Args:
+            key (callable): Function of the row index giving its sort key
+            reverse (bool): Sort in descending order
+        """
+        ordered = MatchTable(self.registry, self.segments)
+        for row in sorted(range(len(self)), key=key, reverse=reverse):
+            ordered.add(self.segment_index[row], self.pattern_index[row], self.hits(row),
+                        self.evidence_level[row])
+        for column in _ROW_COLUMNS + _HIT_COLUMNS + ('hit_offset',):
+            setattr(self, column, getattr(ordered, column))
+
+    def expand(self, row):
+        """
+        Expand a row to the match dictionary written to reports and JSON.
+
+        Args:
+            row (int): Row index
+
+        Returns:
+            dict: Pattern match with copies of the pattern metadata and segment text
+        """
+        pattern = self.registry[self.pattern_index[row]]
+        segment_index = self.segment_index[row]
+        segment = self.segments[segment_index]
+        text = segment['text']
+
+        keyword_matches = []
+        for hit in range(self.hit_offset[row], self.hit_offset[row + 1]):
+            start = self.start[hit]
+            end = self.end[hit]
+            keyword_matches.append({
+                'keyword': pattern['keywords'][self.keyword_index[hit]],
+                'match_text': text[start:end],
+                'context': text[self.context_start[hit]:self.context_end[hit]],
+                'sentence_idx': self.sentence_index[hit],
+                'start': start,
+                'end': end
+            })
+
+        return {
+            'pattern_id': pattern['id'],
+            'pattern_name': pattern['name'],
+            'category': pattern['category'],
+            'description': pattern['description'],
+            'speaker': segment['speaker'],
+            'timestamp': segment['timestamp'],
+            'segment_index': segment_index,
+            'text': text,
+            'keyword_matches': keyword_matches,
+            'confidence': self.confidence(row),
+            'frameworks': pattern['frameworks'],
+            'evidence_level': self.evidence_level[row]
+        }
+
+    def to_dicts(self):
+        """Return every match expanded to a dictionary, in row order."""
+        return list(self)
+
+def json_default(obj):
+    """json.dump default hook that expands match tables to match dictionaries."""
+    if isinstance(obj, MatchTable):
+        return obj.to_dicts()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
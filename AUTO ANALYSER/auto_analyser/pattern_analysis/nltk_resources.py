@@ -0,0 +1,78 @@
+"""
+NLTK Resources Module
+--------------------
+This module loads the NLTK models used by the pattern matcher on first
+use, resolving them from local data directories without touching the
+network unless downloads are explicitly enabled.
+"""
+
+import os
+import sys
+import logging
+
+# Import configuration
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import config
+
+logger = logging.getLogger(__name__)
+
+# Set once the configured data directories are on nltk's search path
+_data_path_configured = False
+
+def _import_nltk():
+    """Import nltk with the configured data directories searched first."""
+    global _data_path_configured
+    import nltk
+
+    if not _data_path_configured:
+        for data_dir in reversed(config.NLTK_SETTINGS['data_dirs']):
+            if data_dir and data_dir not in nltk.data.path:
+                nltk.data.path.insert(0, data_dir)
+        _data_path_configured = True
+    return nltk
+
+def require_resource(resource, package):
+    """
+    Make sure an NLTK resource is available locally.
+
+    Args:
+        resource (str): Resource path as passed to nltk.data.find
+        package (str): Name of the nltk downloader package providing it
+
+    Raises:
+        LookupError: If the resource is missing and downloads are disabled
+    """
+    nltk = _import_nltk()
+    try:
+        nltk.data.find(resource)
+        return
+    except LookupError:
+        if not config.NLTK_SETTINGS['auto_download']:
+            raise LookupError(
+                f"NLTK resource '{package}' was not found in {nltk.data.path}. "
+                f"Install it with 'python -m nltk.downloader -d <dir> {package}' "
+                f"and set AUTO_ANALYSER_NLTK_DATA to <dir>."
+            ) from None
+
+    logger.info(f"Downloading NLTK resource '{package}'")
+    nltk.download(package, quiet=True)
+    nltk.data.find(resource)
+
+def load_sentence_tokenizer():
+    """Return the English Punkt tokenizer that nltk's sent_tokenize uses."""
+    nltk = _import_nltk()
+    try:
+        from nltk.tokenize.punkt import PunktTokenizer
+    except ImportError:
+        # Older nltk releases ship the model as a pickle
+        require_resource('tokenizers/punkt/english.pickle', 'punkt')
+        return nltk.data.load('tokenizers/punkt/english.pickle')
+    require_resource('tokenizers/punkt_tab/english/', 'punkt_tab')
+    return PunktTokenizer('english')
+
+def load_sentiment_analyzer():
+    """Return a VADER SentimentIntensityAnalyzer."""
+    _import_nltk()
+    require_resource('sentiment/vader_lexicon.zip', 'vader_lexicon')
+    from nltk.sentiment import SentimentIntensityAnalyzer
+    return SentimentIntensityAnalyzer()
@@ -10,6 +10,7 @@ import os
 import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import config
+from pattern_analysis.pattern_registry import PatternRegistry
 
 # Define patterns for each category
 PATTERNS = {
@@ -236,31 +237,22 @@ PATTERNS = {
     ]
 }
 
+# Immutable, indexed view of PATTERNS with the compiled keyword engine,
+# built once at import time
+PATTERN_REGISTRY = PatternRegistry(PATTERNS)
+
+# Keyword engine for all patterns. Pattern indices follow the order
+# returned by get_all_patterns().
+PATTERN_ENGINE = PATTERN_REGISTRY.engine
+
 def get_all_patterns():
     """Return all patterns from all categories."""
-    all_patterns = []
-    for category, patterns in PATTERNS.items():
-        for pattern in patterns:
-            pattern['category'] = category
-            all_patterns.append(pattern)
-    return all_patterns
+    return list(PATTERN_REGISTRY.patterns)
 
 def get_patterns_by_category(category):
     """Return patterns for a specific category."""
-    if category not in PATTERNS:
-        return []
-    
-    patterns = PATTERNS[category]
-    for pattern in patterns:
-        pattern['category'] = category
-    
-    return patterns
+    return list(PATTERN_REGISTRY.by_category(category))
 
 def get_pattern_by_id(pattern_id):
     """Return a specific pattern by its ID."""
-    for category, patterns in PATTERNS.items():
-        for pattern in patterns:
-            if pattern['id'] == pattern_id:
-                pattern['category'] = category
-                return pattern
-    return None
+    return PATTERN_REGISTRY.get(pattern_id)
@@ -0,0 +1,240 @@
+"""
+Pattern Engine Module
+--------------------
+This module compiles the keywords of every pattern into a single
+alternation so that a segment can be scanned for all patterns in
+one pass.
+"""
+
+import re
+import time
+from operator import itemgetter
+
+
+def _fold_keyword(keyword):
+    """Lower-case the literal characters of a keyword regex, leaving escapes intact."""
+    folded = []
+    escaped = False
+    for char in keyword:
+        if escaped:
+            folded.append(char)
+            escaped = False
+        elif char == '\\':
+            folded.append(char)
+            escaped = True
+        else:
+            folded.append(char.lower())
+    return ''.join(folded)
+
+
+def _leading_literal(keyword):
+    """
+    Return the literal character every match of the keyword starts with.
+
+    Returns None when the keyword starts with a class, group, escape or
+    optional character, or has a top-level alternation.
+    """
+    if not keyword or not (keyword[0].isalnum() or keyword[0] == ' '):
+        return None
+    if keyword[1:2] in ('?', '*', '{'):
+        return None
+
+    depth = 0
+    escaped = False
+    in_class = False
+    for char in keyword:
+        if escaped:
+            escaped = False
+        elif char == '\\':
+            escaped = True
+        elif in_class:
+            in_class = char != ']'
+        elif char == '[':
+            in_class = True
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        elif char == '|' and depth == 0:
+            return None
+    return keyword[0]
+
+
+class _KeywordBucket:
+    """Keywords that can start with the same character."""
+
+    def __init__(self, slots, keywords):
+        self.slots = slots
+        self._keywords = keywords
+        self._alternations = {}
+
+    def match(self, text, pos, first):
+        """
+        Match the bucket's keywords from index `first` onwards at `pos`.
+
+        Returns:
+            tuple: (bucket index, match) of the first keyword that matches,
+                or None
+        """
+        regex = self._alternations.get(first)
+        if regex is None:
+            # Each keyword is wrapped in a group named after its bucket index
+            # so the winning alternative is identified by match.lastgroup.
+            regex = re.compile('|'.join(
+                f'(?P<k{index}>{self._keywords[self.slots[index]]})'
+                for index in range(first, len(self.slots))
+            ))
+            self._alternations[first] = regex
+        match = regex.match(text, pos)
+        if match is None:
+            return None
+        return int(match.lastgroup[1:]), match
+
+
+class PatternEngine:
+    """Single-pass keyword matcher compiled from a list of patterns."""
+
+    def __init__(self, patterns):
+        """
+        Compile the keywords of the given patterns.
+
+        Args:
+            patterns (list): Pattern dictionaries, each with a 'keywords' list.
+                The position of a pattern in this list is the pattern index
+                reported by scan().
+        """
+        self.pattern_count = len(patterns)
+
+        # Identical keyword regexes are compiled once and fanned out to
+        # every (pattern index, keyword index) pair that uses them.
+        self._keywords = []
+        self._owners = []
+        keyword_slots = {}
+        for pattern_idx, pattern in enumerate(patterns):
+            for keyword_idx, keyword in enumerate(pattern['keywords']):
+                if re.compile(keyword).groupindex:
+                    raise ValueError(
+                        f"Keyword '{keyword}' in pattern '{pattern.get('id')}' "
+                        f"must not define named groups"
+                    )
+                if keyword not in keyword_slots:
+                    keyword_slots[keyword] = len(self._keywords)
+                    self._keywords.append(keyword)
+                    self._owners.append([])
+                self._owners[keyword_slots[keyword]].append((pattern_idx, keyword_idx))
+
+        # Case-insensitive alternations defeat the regex engine's first
+        # character optimisation, so keywords are folded to lower case and
+        # run against lower-cased text instead.
+        self._folded = [_fold_keyword(keyword) for keyword in self._keywords]
+        self._search = re.compile('|'.join(self._folded)) if self._folded else None
+        self._fallback = [re.compile(keyword, re.IGNORECASE) for keyword in self._keywords]
+
+        # Bucket keywords by leading character so that only the keywords that
+        # can start at a candidate offset are tried there.
+        heads = [_leading_literal(keyword) for keyword in self._folded]
+        wildcard = [slot for slot, head in enumerate(heads) if head is None]
+        self._wildcard = _KeywordBucket(wildcard, self._folded)
+        self._buckets = {
+            head: _KeywordBucket(
+                [slot for slot, other in enumerate(heads) if other is None or other == head],
+                self._folded
+            )
+            for head in set(heads) if head is not None
+        }
+
+    def scan(self, text):
+        """
+        Find every keyword hit for every pattern in a single pass.
+
+        The hits reported for each keyword are exactly those that
+        re.finditer(keyword, text, re.IGNORECASE) would yield, so overlapping
+        hits of different keywords (e.g. 'professional' inside
+        'professional boundaries') are all reported.
+
+        Args:
+            text (str): The text to scan
+
+        Returns:
+            list: (pattern_index, hits) tuples in pattern order, where hits is
+                a list of (keyword_index, start, end) tuples ordered by keyword
+                index and then by position
+        """
+        if self._search is None:
+            return []
+
+        folded = text.lower()
+        if len(folded) == len(text):
+            slot_hits = self._scan_folded(folded)
+        else:
+            # Lower-casing changed character offsets (e.g. 'İ'), so fall back
+            # to scanning each keyword separately.
+            slot_hits = (
+                (slot, match.start(), match.end())
+                for slot, regex in enumerate(self._fallback)
+                for match in regex.finditer(text)
+            )
+
+        hits = {}
+        for slot, start, end in slot_hits:
+            for pattern_idx, keyword_idx in self._owners[slot]:
+                hits.setdefault(pattern_idx, []).append((keyword_idx, start, end))
+
+        return [
+            (pattern_idx, sorted(hits[pattern_idx], key=itemgetter(0, 1)))
+            for pattern_idx in sorted(hits)
+        ]
+
+    def keyword_costs(self, text):
+        """
+        Time each keyword on its own against a text.
+
+        The single-pass scan cannot attribute its time to keywords, so
+        each keyword's regex is run separately instead, as a measure of
+        what it costs. Only used when profiling.
+
+        Args:
+            text (str): The text to scan
+
+        Returns:
+            list: (owners, seconds, hits) per distinct keyword, where owners
+                are the (pattern_index, keyword_index) pairs using it
+        """
+        costs = []
+        perf_counter = time.perf_counter
+        for slot, regex in enumerate(self._fallback):
+            started = perf_counter()
+            hits = sum(1 for _ in regex.finditer(text))
+            costs.append((self._owners[slot], perf_counter() - started, hits))
+        return costs
+
+    def _scan_folded(self, folded):
+        """Yield (slot, start, end) for every keyword hit in lower-cased text."""
+        # Next offset at which each keyword may match again, mirroring the
+        # non-overlapping semantics of finditer for a single keyword.
+        resume = [0] * len(self._keywords)
+        search = self._search.search
+        pos = 0
+
+        while True:
+            match = search(folded, pos)
+            if match is None:
+                break
+            start = match.start()
+
+            # Enumerate every keyword that matches at this offset
+            bucket = self._buckets.get(folded[start:start + 1], self._wildcard)
+            first = 0
+            while first < len(bucket.slots):
+                found = bucket.match(folded, start, first)
+                if found is None:
+                    break
+                index, keyword_match = found
+                slot = bucket.slots[index]
+                end = keyword_match.end()
+                if start >= resume[slot]:
+                    resume[slot] = end if end > start else end + 1
+                    yield slot, start, end
+                first = index + 1
+
+            pos = start + 1
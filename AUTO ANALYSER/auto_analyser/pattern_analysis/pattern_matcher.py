@@ -5,57 +5,396 @@ This module analyzes transcript text to identify patterns of
 institutional gaslighting, coercive control, and other dynamics.
 """
 
-import re
 import os
 import sys
+import math
+import json
+import time
+import hashlib
 import logging
+from bisect import bisect_right
 from collections import defaultdict
-import nltk
-from nltk.tokenize import sent_tokenize
-from nltk.sentiment import SentimentIntensityAnalyzer
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 
 # Import local modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import config
-from pattern_analysis.pattern_database import get_all_patterns, get_patterns_by_category, get_pattern_by_id
+import profiling
+from pattern_analysis.pattern_database import PATTERN_REGISTRY
+from pattern_analysis.pattern_engine import PatternEngine
+from pattern_analysis.match_table import MatchTable
+from pattern_analysis.nltk_resources import load_sentence_tokenizer, load_sentiment_analyzer
+from pattern_analysis.sentiment import SENTIMENT_KEYS, SentimentScorer, grouped_sums
+from pdf_processing.time_index import select_segments
 
-# Download NLTK resources if not already downloaded
-try:
-    nltk.data.find('tokenizers/punkt')
-    nltk.data.find('sentiment/vader_lexicon.zip')
-except LookupError:
-    nltk.download('punkt')
-    nltk.download('vader_lexicon')
+# Number of segments per worker task when segments are streamed
+STREAM_CHUNK_SIZE = 64
 
 class PatternMatcher:
     """Class for analyzing transcripts to identify patterns."""
     
-    def __init__(self):
-        """Initialize the pattern matcher."""
+    def __init__(self, workers=1, sentiment=None, sentence_sentiment=None, registry=None):
+        """
+        Initialize the pattern matcher.
+        
+        The sentence tokenizer and the VADER sentiment analyzer are loaded
+        on first use rather than here.
+        
+        Args:
+            workers (int): Number of worker processes used to analyze
+                segments. 1 analyzes in-process; None uses every CPU.
+            sentiment (bool): Score segment sentiment with VADER
+                (default: config.NLTK_SETTINGS['sentiment'])
+            sentence_sentiment (bool): Also score every sentence and record
+                the scores in the results
+                (default: config.NLTK_SETTINGS['sentence_sentiment'])
+            registry (PatternRegistry): Patterns to look for
+                (default: pattern_database.PATTERN_REGISTRY)
+        """
         self.logger = logging.getLogger(__name__)
-        self.patterns = get_all_patterns()
-        self.sia = SentimentIntensityAnalyzer()
+        # Replacing the registry hot-swaps the patterns; each analysis keeps
+        # the registry it started with
+        self.registry = registry if registry is not None else PATTERN_REGISTRY
+        self.sentiment = config.NLTK_SETTINGS['sentiment'] if sentiment is None else sentiment
+        if sentence_sentiment is None:
+            sentence_sentiment = config.NLTK_SETTINGS['sentence_sentiment']
+        self.sentence_sentiment = self.sentiment and sentence_sentiment
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self._executor = None
+        self._executor_registry = None
+        self._sentence_tokenizer = None
+        self._sia = None
+        self._scorer = None
+    
+    @property
+    def patterns(self):
+        """Patterns of the current registry, in pattern order."""
+        return self.registry.patterns
+    
+    @property
+    def engine(self):
+        """Keyword engine of the current registry."""
+        return self.registry.engine
+    
+    @property
+    def sentence_tokenizer(self):
+        """Punkt sentence tokenizer, loaded on first use."""
+        if self._sentence_tokenizer is None:
+            self._sentence_tokenizer = load_sentence_tokenizer()
+        return self._sentence_tokenizer
     
-    def analyze(self, transcript_data):
+    @property
+    def sia(self):
+        """VADER sentiment analyzer, loaded on first use."""
+        if self._sia is None:
+            self._sia = load_sentiment_analyzer()
+        return self._sia
+    
+    @property
+    def scorer(self):
+        """Batch sentiment scorer, built on first use."""
+        if self._scorer is None:
+            self._scorer = SentimentScorer(self.sia)
+        return self._scorer
+    
+    def close(self):
+        """Shut down the worker pool, if one was started."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+    
+    def analyze(self, transcript_data, profiler=None, start=None, end=None, speakers=None):
         """
         Analyze the transcript for patterns.
         
+        Given a time window or speakers, only the selected segments are
+        analyzed: they replace the transcript's segments, so the results
+        and the report cover just that excerpt.
+        
         Args:
             transcript_data (dict): Dictionary containing transcript data
                 - metadata: Dictionary of metadata
-                - segments: List of transcript segments with speaker, timestamp, and text
+                - segments: List of transcript segments with speaker, timestamp, and text.
+                  May also be an iterator (e.g. from PDFExtractor.extract_text with
+                  stream=True), in which case segments are analyzed as they are
+                  extracted and the list of segments replaces the iterator.
+            profiler (Profiler): Records the match, sentiment and aggregate
+                stages and the pattern and keyword counters, if given. With
+                workers > 1 the match stage includes the workers' sentiment
+                scoring and the counters are not collected.
+            start (int): Start of the time window to analyze, in seconds
+            end (int): Second the time window ends before
+            speakers (list): Speaker names to analyze, as for
+                time_index.select_segments
                 
         Returns:
             dict: Analysis results with the following structure:
-                - patterns_found: List of pattern matches with evidence
+                - patterns_found: MatchTable of pattern matches with evidence; it
+                  iterates as match dictionaries and expands to a list of them
+                  when written with match_table.json_default
                 - speakers: Dictionary of speaker statistics
                 - overall_analysis: Overall analysis of the transcript
+                - pattern_fingerprints: Fingerprint of each pattern evaluated
+                - segments_fingerprint: Fingerprint of the analyzed segments
+                - sentiment_enabled: Whether speaker sentiment was scored
+                - sentence_sentiment: Columns of per-sentence scores (segment_index,
+                  start, end, negative, neutral, positive, compound), when enabled
+                - selection: The time window and speakers analyzed, when given
         """
         self.logger.info("Analyzing transcript...")
+        registry = self.registry
+        selection = self._select(transcript_data, start, end, speakers)
+        
+        segments = transcript_data['segments']
+        streamed = not isinstance(segments, list)
+        if streamed:
+            # Keep streamed segments for the fingerprint and the report
+            collected = []
+            results = self._new_results(0, collected, registry)
+            segments = _collect(segments, collected)
+        else:
+            results = self._new_results(0, segments, registry)
+        
+        # Analyze the segments, split into chunks across the worker pool
+        with profiling.stage(profiler, 'match'):
+            if self.workers > 1:
+                for partial in self._analyze_parallel(segments, registry):
+                    self._merge_partial(results, partial)
+            else:
+                self._analyze_segments(segments, results, profiler=profiler)
+        
+        if streamed:
+            segments = transcript_data['segments'] = collected
+        results['overall_analysis']['total_segments'] = len(segments)
+        
+        with profiling.stage(profiler, 'aggregate'):
+            # Record what was analyzed so later runs can be incremental
+            results['pattern_fingerprints'] = dict(registry.fingerprints)
+            results['segments_fingerprint'] = _segments_fingerprint(segments)
+            results['sentiment_enabled'] = self.sentiment
+            
+            # Normalize sentiment values by segment count
+            for speaker, stats in results['speakers'].items():
+                if stats['segment_count'] > 0:
+                    stats['sentiment']['positive'] /= stats['segment_count']
+                    stats['sentiment']['negative'] /= stats['segment_count']
+                    stats['sentiment']['neutral'] /= stats['segment_count']
+                    stats['sentiment']['compound'] /= stats['segment_count']
+            
+            # Calculate evidence levels for each pattern found
+            self._calculate_evidence_levels(results)
+            
+            # Generate overall analysis
+            self._generate_overall_analysis(results)
+        
+        if selection is not None:
+            results['selection'] = selection
+        return results
+    
+    def reanalyze(self, transcript_data, previous_results, profiler=None, start=None,
+                  end=None, speakers=None):
+        """
+        Re-analyze a transcript, evaluating only patterns that changed.
+        
+        Matches of patterns whose fingerprint is unchanged are kept from the
+        previous results; new and edited patterns are evaluated against the
+        segments, and matches of removed patterns are dropped. Speaker
+        statistics and sentiment do not depend on the patterns and are kept
+        as they were. Falls back to a full analysis when the previous results
+        were produced from different segments, carry no fingerprints, or lack
+        sentiment scores that are now wanted.
+        
+        Args:
+            transcript_data (dict): Dictionary containing transcript data
+            previous_results (dict): Results of an earlier analyze() of the
+                same transcript, e.g. loaded from analysis_results.json
+            profiler (Profiler): Records the match and aggregate stages and
+                the counters of the re-evaluated patterns, if given
+            start (int): Start of the time window to analyze, in seconds
+            end (int): Second the time window ends before
+            speakers (list): Speaker names to analyze
+                
+        Returns:
+            dict: Analysis results, as returned by analyze()
+        """
+        registry = self.registry
+        selection = self._select(transcript_data, start, end, speakers)
+        segments = transcript_data['segments']
+        previous_fingerprints = previous_results.get('pattern_fingerprints')
+        if (previous_fingerprints is None or
+                previous_results.get('segments_fingerprint') != _segments_fingerprint(segments) or
+                (self.sentiment and not previous_results.get('sentiment_enabled', True))):
+            self.logger.info("Previous results do not match the transcript, running full analysis")
+            results = self.analyze(transcript_data, profiler=profiler)
+            if selection is not None:
+                results['selection'] = selection
+            return results
         
-        # Initialize results structure
+        fingerprints = dict(registry.fingerprints)
+        changed = [
+            pattern for pattern in registry
+            if previous_fingerprints.get(pattern['id']) != fingerprints[pattern['id']]
+        ]
+        self.logger.info(f"Re-analyzing transcript for {len(changed)} new or changed patterns")
+        
+        results = self._new_results(len(segments), segments, registry)
+        patterns_found = results['patterns_found']
+        
+        # Keep matches of patterns that still exist unchanged
+        self._keep_matches(
+            patterns_found, previous_results['patterns_found'],
+            lambda pattern_id: previous_fingerprints.get(pattern_id) == fingerprints.get(pattern_id)
+        )
+        
+        # Evaluate the new and changed patterns against every segment
+        if changed:
+            with profiling.stage(profiler, 'match'):
+                engine = PatternEngine(changed)
+                pattern_indices = [registry.index_of(pattern.id) for pattern in changed]
+                new_matches = {'patterns_found': MatchTable(registry, segments)}
+                for segment_index, segment in enumerate(segments):
+                    self._match_segment(
+                        segment['text'], segment_index, new_matches['patterns_found'],
+                        engine=engine, pattern_indices=pattern_indices, profiler=profiler
+                    )
+            with profiling.stage(profiler, 'aggregate'):
+                self._calculate_evidence_levels(new_matches)
+                patterns_found.extend(new_matches['patterns_found'].columns())
+        
+        with profiling.stage(profiler, 'aggregate'):
+            # Restore the order a full analysis produces before ranking
+            patterns_found.sort(
+                key=lambda row: (patterns_found.segment_index[row], patterns_found.pattern_index[row])
+            )
+            
+            for speaker, stats in previous_results['speakers'].items():
+                speaker_stats = results['speakers'][speaker]
+                speaker_stats['segment_count'] = stats['segment_count']
+                speaker_stats['word_count'] = stats['word_count']
+                speaker_stats['sentiment'] = dict(stats['sentiment'])
+            if 'sentence_sentiment' in previous_results:
+                results['sentence_sentiment'] = previous_results['sentence_sentiment']
+            
+            self._count_matches(results, 0)
+            
+            results['pattern_fingerprints'] = fingerprints
+            results['segments_fingerprint'] = previous_results['segments_fingerprint']
+            results['sentiment_enabled'] = previous_results.get('sentiment_enabled', True)
+            
+            # Generate overall analysis
+            self._generate_overall_analysis(results)
+        
+        if selection is not None:
+            results['selection'] = selection
+        return results
+    
+    def _select(self, transcript_data, start, end, speakers):
+        """
+        Replace the transcript's segments with those of a time window and speakers.
+        
+        Args:
+            transcript_data (dict): Transcript data; its segments may be an iterator
+            start (int): Start of the time window in seconds, or None
+            end (int): Second the time window ends before, or None
+            speakers (list): Speaker names to keep, or None
+            
+        Returns:
+            dict: The selection, with the number of segments selected and in
+                the whole transcript, or None if nothing was selected
+        """
+        if start is None and end is None and not speakers:
+            return None
+        segments = list(transcript_data['segments'])
+        selected = transcript_data['segments'] = select_segments(segments, start, end, speakers)
+        self.logger.info(f"Analyzing {len(selected)} of {len(segments)} segments")
+        return {
+            'start': start,
+            'end': end,
+            'speakers': list(speakers or []),
+            'segments': len(selected),
+            'total_segments': len(segments)
+        }
+    
+    def _keep_matches(self, table, previous_matches, keep):
+        """
+        Copy previous matches into a match table.
+        
+        Args:
+            table (MatchTable): Table to add the matches to
+            previous_matches: MatchTable or list of match dictionaries (as
+                loaded from analysis_results.json) of an earlier analysis
+            keep (callable): Function of a pattern id telling whether its
+                matches are kept
+        """
+        pattern_order = table.registry.index_of
+        
+        if isinstance(previous_matches, MatchTable):
+            for row in range(len(previous_matches)):
+                pattern_id = previous_matches.registry[previous_matches.pattern_index[row]]['id']
+                if keep(pattern_id):
+                    table.add(
+                        previous_matches.segment_index[row], pattern_order(pattern_id),
+                        previous_matches.hits(row), previous_matches.evidence_level[row]
+                    )
+            return
+        
+        # Match dictionaries carry the context sentence but not its offsets,
+        # so the sentences of each segment are located again
+        sentence_spans = {}
+        for pattern_match in previous_matches:
+            if not keep(pattern_match['pattern_id']):
+                continue
+            pattern_index = pattern_order(pattern_match['pattern_id'])
+            keywords = table.registry[pattern_index]['keywords']
+            segment_index = pattern_match['segment_index']
+            text = table.segments[segment_index]['text']
+            if segment_index not in sentence_spans:
+                sentence_spans[segment_index] = list(self.sentence_tokenizer.span_tokenize(text))
+            spans = sentence_spans[segment_index]
+            
+            hits = []
+            for keyword_match in pattern_match['keyword_matches']:
+                sentence_idx = keyword_match['sentence_idx']
+                context_start, context_end = spans[sentence_idx] if spans else (0, len(text))
+                hits.append((
+                    keywords.index(keyword_match['keyword']),
+                    keyword_match['start'], keyword_match['end'],
+                    sentence_idx, context_start, context_end
+                ))
+            table.add(segment_index, pattern_index, hits, pattern_match['evidence_level'])
+    
+    def _count_matches(self, results, first_row):
+        """
+        Add the matches from a row onwards to the category, pattern and speaker counts.
+        
+        Args:
+            results (dict): Results structure to update
+            first_row (int): First row of results['patterns_found'] to count
+        """
+        table = results['patterns_found']
+        overall = results['overall_analysis']
+        for row in range(first_row, len(table)):
+            pattern = table.registry[table.pattern_index[row]]
+            speaker = table.segments[table.segment_index[row]]['speaker']
+            overall['category_counts'][pattern['category']] += 1
+            overall['pattern_counts'][pattern['id']] += 1
+            results['speakers'][speaker]['patterns'][pattern['id']] += 1
+    
+    def _new_results(self, total_segments, segments=None, registry=None):
+        """
+        Create an empty results structure.
+        
+        Args:
+            total_segments (int): Number of segments being analyzed
+            segments (list): Segments the matches refer to
+            registry (PatternRegistry): Patterns being matched (default: self.registry)
+            
+        Returns:
+            dict: Results structure with zeroed counters
+        """
         results = {
-            'patterns_found': [],
+            'patterns_found': MatchTable(registry if registry is not None else self.registry, segments),
             'speakers': defaultdict(lambda: {
                 'segment_count': 0,
                 'word_count': 0,
@@ -63,132 +402,234 @@ class PatternMatcher:
                 'sentiment': {'positive': 0, 'negative': 0, 'neutral': 0, 'compound': 0}
             }),
             'overall_analysis': {
-                'total_segments': len(transcript_data['segments']),
+                'total_segments': total_segments,
                 'category_counts': defaultdict(int),
                 'pattern_counts': defaultdict(int)
             }
         }
+        if self.sentence_sentiment:
+            results['sentence_sentiment'] = {
+                column: [] for column in ('segment_index', 'start', 'end') + SENTIMENT_KEYS
+            }
+        return results
+    
+    def _analyze_segments(self, segments, results, first_index=0, profiler=None):
+        """
+        Accumulate speaker statistics, sentiment sums and pattern matches.
+        
+        Args:
+            segments (list): Transcript segments to analyze
+            results (dict): Results structure to update
+            first_index (int): Index of the first segment in the transcript
+            profiler (Profiler): Records the sentiment stage and pattern counters, if given
+        """
+        # Texts are scored for sentiment in one batch after the loop
+        speaker_groups = {}
+        sentiment_texts = []
+        sentiment_groups = []
+        sentences = results.get('sentence_sentiment')
+        sentence_texts = []
+        table = results['patterns_found']
+        overall = results['overall_analysis']
         
-        # Analyze each segment
-        for segment in transcript_data['segments']:
+        for segment_index, segment in enumerate(segments, first_index):
             speaker = segment['speaker']
             text = segment['text']
-            timestamp = segment['timestamp']
             
             # Update speaker statistics
             results['speakers'][speaker]['segment_count'] += 1
             results['speakers'][speaker]['word_count'] += len(text.split())
             
-            # Analyze sentiment
-            sentiment = self.sia.polarity_scores(text)
-            results['speakers'][speaker]['sentiment']['positive'] += sentiment['pos']
-            results['speakers'][speaker]['sentiment']['negative'] += sentiment['neg']
-            results['speakers'][speaker]['sentiment']['neutral'] += sentiment['neu']
-            results['speakers'][speaker]['sentiment']['compound'] += sentiment['compound']
+            # Queue the segment for sentiment scoring
+            if self.sentiment:
+                sentiment_texts.append(text)
+                sentiment_groups.append(speaker_groups.setdefault(speaker, len(speaker_groups)))
+            
+            sentence_spans = list(self.sentence_tokenizer.span_tokenize(text))
+            if sentences is not None:
+                for start, end in sentence_spans:
+                    sentences['segment_index'].append(segment_index)
+                    sentences['start'].append(start)
+                    sentences['end'].append(end)
+                    sentence_texts.append(text[start:end])
             
             # Find patterns in the segment
-            segment_patterns = self._find_patterns_in_text(text, speaker, timestamp)
+            first_row = len(table)
+            self._match_segment(text, segment_index, table, sentence_spans=sentence_spans,
+                                profiler=profiler)
             
-            # Add patterns to results
-            for pattern_match in segment_patterns:
-                results['patterns_found'].append(pattern_match)
-                
-                # Update counts
-                pattern_id = pattern_match['pattern_id']
-                category = pattern_match['category']
-                
-                results['overall_analysis']['category_counts'][category] += 1
-                results['overall_analysis']['pattern_counts'][pattern_id] += 1
-                results['speakers'][speaker]['patterns'][pattern_id] += 1
+            # Update counts
+            for row in range(first_row, len(table)):
+                pattern = table.registry[table.pattern_index[row]]
+                overall['category_counts'][pattern['category']] += 1
+                overall['pattern_counts'][pattern['id']] += 1
+                results['speakers'][speaker]['patterns'][pattern['id']] += 1
         
-        # Normalize sentiment values by segment count
-        for speaker, stats in results['speakers'].items():
-            if stats['segment_count'] > 0:
-                stats['sentiment']['positive'] /= stats['segment_count']
-                stats['sentiment']['negative'] /= stats['segment_count']
-                stats['sentiment']['neutral'] /= stats['segment_count']
-                stats['sentiment']['compound'] /= stats['segment_count']
+        with profiling.stage(profiler, 'sentiment'):
+            # Sum the sentiment of each speaker's segments
+            if sentiment_texts:
+                sums = grouped_sums(
+                    self.scorer.score(sentiment_texts), sentiment_groups, len(speaker_groups)
+                )
+                for speaker, group in speaker_groups.items():
+                    speaker_sentiment = results['speakers'][speaker]['sentiment']
+                    for key, value in zip(SENTIMENT_KEYS, sums[group].tolist()):
+                        speaker_sentiment[key] += value
+            
+            if sentence_texts:
+                scores = self.scorer.score(sentence_texts)
+                for column, key in enumerate(SENTIMENT_KEYS):
+                    sentences[key].extend(scores[:, column].tolist())
+    
+    def _analyze_parallel(self, segments, registry):
+        """
+        Analyze segments in chunks across a pool of worker processes.
         
-        # Calculate evidence levels for each pattern found
-        self._calculate_evidence_levels(results)
+        Args:
+            segments (iterable): Transcript segments to analyze
+            registry (PatternRegistry): Patterns the workers match
+            
+        Returns:
+            iterator: Partial results for each chunk, in segment order
+        """
+        if self._executor is not None and self._executor_registry is not registry:
+            # The registry was swapped: workers of the old pool finish the
+            # chunks already submitted to them and then exit
+            self._executor.shutdown(wait=False)
+            self._executor = None
         
-        # Generate overall analysis
-        self._generate_overall_analysis(results)
+        if self._executor is None:
+            self._executor_registry = registry
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(registry, self.sentiment, self.sentence_sentiment)
+            )
         
-        return results
+        if isinstance(segments, list):
+            # Several chunks per worker keeps the pool busy when segment
+            # lengths vary
+            chunk_size = max(1, math.ceil(len(segments) / (self.workers * 4)))
+        else:
+            # The length of a stream is unknown, so chunks are submitted as
+            # soon as they fill up
+            chunk_size = STREAM_CHUNK_SIZE
+        return self._executor.map(_analyze_chunk, _iter_chunks(segments, chunk_size))
     
-    def _find_patterns_in_text(self, text, speaker, timestamp):
+    def _analyze_chunk(self, first_index, segments):
         """
-        Find patterns in a segment of text.
+        Analyze a chunk of segments in a worker process.
         
         Args:
-            text (str): The text to analyze
-            speaker (str): The speaker of the text
-            timestamp (str): The timestamp of the segment
+            first_index (int): Index of the chunk's first segment in the transcript
+            segments (list): Transcript segments to analyze
             
         Returns:
-            list: List of pattern matches
+            dict: Partial results using plain (picklable) dictionaries
+        """
+        partial = self._new_results(len(segments))
+        self._analyze_segments(segments, partial, first_index)
+        
+        return {
+            'patterns_found': partial['patterns_found'].columns(),
+            'speakers': {
+                speaker: dict(stats, patterns=dict(stats['patterns']))
+                for speaker, stats in partial['speakers'].items()
+            },
+            'category_counts': dict(partial['overall_analysis']['category_counts']),
+            'pattern_counts': dict(partial['overall_analysis']['pattern_counts']),
+            'sentence_sentiment': partial.get('sentence_sentiment')
+        }
+    
+    def _merge_partial(self, results, partial):
+        """
+        Merge the partial results of one chunk into the results structure.
+        
+        Args:
+            results (dict): Results structure to update
+            partial (dict): Partial results returned by _analyze_chunk
+        """
+        results['patterns_found'].extend(partial['patterns_found'])
+        
+        if partial['sentence_sentiment'] is not None:
+            for column, values in partial['sentence_sentiment'].items():
+                results['sentence_sentiment'][column].extend(values)
+        
+        for speaker, stats in partial['speakers'].items():
+            speaker_stats = results['speakers'][speaker]
+            speaker_stats['segment_count'] += stats['segment_count']
+            speaker_stats['word_count'] += stats['word_count']
+            for pattern_id, count in stats['patterns'].items():
+                speaker_stats['patterns'][pattern_id] += count
+            for key, value in stats['sentiment'].items():
+                speaker_stats['sentiment'][key] += value
+        
+        overall = results['overall_analysis']
+        for category, count in partial['category_counts'].items():
+            overall['category_counts'][category] += count
+        for pattern_id, count in partial['pattern_counts'].items():
+            overall['pattern_counts'][pattern_id] += count
+    
+    def _match_segment(self, text, segment_index, table, engine=None, pattern_indices=None,
+                       sentence_spans=None, profiler=None):
+        """
+        Find patterns in a segment of text and add them to a match table.
+        
+        Args:
+            text (str): The text to analyze
+            segment_index (int): Index of the segment in the transcript
+            table (MatchTable): Table to add the matches to
+            engine (PatternEngine): Engine to scan with (default: all patterns)
+            pattern_indices (list): Index in the table's registry of each pattern the
+                engine was compiled from
+            sentence_spans (list): (start, end) offsets of the sentences of
+                the text, if already tokenized
+            profiler (Profiler): Records the scan and the standalone cost of
+                each keyword, if given
         """
-        pattern_matches = []
+        # Index sentence spans once so each match resolves with a bisect
+        if sentence_spans is None:
+            sentence_spans = list(self.sentence_tokenizer.span_tokenize(text))
+        sentence_starts = [start for start, _ in sentence_spans]
+        
+        if engine is None:
+            engine = table.registry.engine
         
-        # Split text into sentences for more granular analysis
-        sentences = sent_tokenize(text)
+        # Scan the text once for the keywords of every pattern
+        if profiler is None:
+            scanned = engine.scan(text)
+        else:
+            started = time.perf_counter()
+            scanned = engine.scan(text)
+            profiler.record_scan(table.registry, pattern_indices, len(sentence_spans),
+                                 time.perf_counter() - started, scanned)
+            # Timing every keyword separately is overhead of profiling, not matching
+            with profiler.stage('profiling'):
+                profiler.record_keyword_costs(table.registry, pattern_indices, engine.keyword_costs(text))
         
-        # Check each pattern against the text
-        for pattern in self.patterns:
-            # Check if any keywords match
+        for pattern_idx, hits in scanned:
             keyword_matches = []
-            for keyword in pattern['keywords']:
-                regex = re.compile(keyword, re.IGNORECASE)
-                matches = regex.finditer(text)
+            for keyword_idx, match_start, match_end in hits:
+                # Find the sentence containing the match; text between
+                # sentences belongs to the preceding one
+                sentence_idx = max(bisect_right(sentence_starts, match_start) - 1, 0)
                 
-                for match in matches:
-                    # Find the sentence containing the match
-                    match_start = match.start()
-                    match_end = match.end()
-                    match_text = match.group(0)
-                    
-                    # Find which sentence contains this match
-                    sentence_idx = 0
-                    char_count = 0
-                    for i, sentence in enumerate(sentences):
-                        if char_count <= match_start < char_count + len(sentence) + 1:  # +1 for space
-                            sentence_idx = i
-                            break
-                        char_count += len(sentence) + 1  # +1 for space
-                    
-                    # Get context (the sentence containing the match)
-                    context = sentences[sentence_idx] if sentence_idx < len(sentences) else text
-                    
-                    keyword_matches.append({
-                        'keyword': keyword,
-                        'match_text': match_text,
-                        'context': context,
-                        'sentence_idx': sentence_idx
-                    })
+                # Get context (the sentence containing the match)
+                if sentence_spans:
+                    context_start, context_end = sentence_spans[sentence_idx]
+                else:
+                    context_start, context_end = 0, len(text)
+                
+                keyword_matches.append((
+                    keyword_idx, match_start, match_end,
+                    sentence_idx, context_start, context_end
+                ))
             
             # If we have matches, create a pattern match entry
             if keyword_matches:
-                # Calculate confidence based on number of keyword matches
-                confidence = min(1.0, len(keyword_matches) / len(pattern['keywords']))
-                
-                pattern_match = {
-                    'pattern_id': pattern['id'],
-                    'pattern_name': pattern['name'],
-                    'category': pattern['category'],
-                    'description': pattern['description'],
-                    'speaker': speaker,
-                    'timestamp': timestamp,
-                    'text': text,
-                    'keyword_matches': keyword_matches,
-                    'confidence': confidence,
-                    'frameworks': pattern['frameworks'],
-                    'evidence_level': 0  # Will be calculated later
-                }
-                
-                pattern_matches.append(pattern_match)
-        
-        return pattern_matches
+                if pattern_indices is not None:
+                    pattern_idx = pattern_indices[pattern_idx]
+                table.add(segment_index, pattern_idx, keyword_matches)
     
     def _calculate_evidence_levels(self, results):
         """
@@ -197,24 +638,9 @@ class PatternMatcher:
         Args:
             results (dict): Analysis results
         """
-        for pattern_match in results['patterns_found']:
-            # Base evidence level on confidence and number of keyword matches
-            confidence = pattern_match['confidence']
-            num_matches = len(pattern_match['keyword_matches'])
-            
-            # Calculate evidence level (1-5 scale)
-            if confidence < 0.2 or num_matches == 1:
-                evidence_level = 1  # Basic evidence
-            elif confidence < 0.4 or num_matches == 2:
-                evidence_level = 2  # Moderate evidence
-            elif confidence < 0.6 or num_matches == 3:
-                evidence_level = 3  # Strong evidence
-            elif confidence < 0.8 or num_matches <= 5:
-                evidence_level = 4  # Very strong evidence
-            else:
-                evidence_level = 5  # Exceptional evidence
-            
-            pattern_match['evidence_level'] = evidence_level
+        table = results['patterns_found']
+        for row in range(len(table)):
+            table.evidence_level[row] = evidence_level(table.confidence(row), table.hit_count(row))
     
     def _generate_overall_analysis(self, results):
         """
@@ -224,7 +650,8 @@ class PatternMatcher:
             results (dict): Analysis results
         """
         # Sort patterns by evidence level
-        results['patterns_found'].sort(key=lambda x: x['evidence_level'], reverse=True)
+        table = results['patterns_found']
+        table.sort(key=table.evidence_level.__getitem__, reverse=True)
         
         # Calculate dominant categories
         category_counts = results['overall_analysis']['category_counts']
@@ -247,13 +674,14 @@ class PatternMatcher:
             results['overall_analysis']['dominant_speaker'] = dominant_speaker
         
         # Calculate top patterns
+        registry = results['patterns_found'].registry
         pattern_counts = results['overall_analysis']['pattern_counts']
         if pattern_counts:
             top_patterns = sorted(pattern_counts.items(), key=lambda x: x[1], reverse=True)[:5]
             results['overall_analysis']['top_patterns'] = [
                 {
                     'id': pattern_id,
-                    'name': get_pattern_by_id(pattern_id)['name'],
+                    'name': registry.get(pattern_id).name,
                     'count': count
                 }
                 for pattern_id, count in top_patterns
@@ -277,3 +705,69 @@ class PatternMatcher:
                 overall_sentiment['compound'] += stats['sentiment']['compound'] * segment_ratio
         
         results['overall_analysis']['sentiment'] = overall_sentiment
+
+
+def evidence_level(confidence, num_matches):
+    """
+    Grade a match on the 1-5 evidence scale.
+    
+    Args:
+        confidence (float): Share of the pattern's keywords matched
+        num_matches (int): Number of keyword matches
+        
+    Returns:
+        int: Evidence level (see config.EVIDENCE_LEVELS)
+    """
+    if confidence < 0.2 or num_matches == 1:
+        return 1  # Basic evidence
+    elif confidence < 0.4 or num_matches == 2:
+        return 2  # Moderate evidence
+    elif confidence < 0.6 or num_matches == 3:
+        return 3  # Strong evidence
+    elif confidence < 0.8 or num_matches <= 5:
+        return 4  # Very strong evidence
+    return 5  # Exceptional evidence
+
+# Matcher owned by each worker process of the analysis pool
+_worker_matcher = None
+
+def _init_worker(registry, sentiment, sentence_sentiment):
+    """Build the pattern engine and sentiment analyzer once per worker."""
+    global _worker_matcher
+    _worker_matcher = PatternMatcher(
+        sentiment=sentiment, sentence_sentiment=sentence_sentiment, registry=registry
+    )
+
+def _analyze_chunk(chunk):
+    """Analyze a (first_index, segments) chunk with the worker's matcher."""
+    return _worker_matcher._analyze_chunk(*chunk)
+
+def _collect(segments, collected):
+    """Yield segments, appending each one to collected."""
+    for segment in segments:
+        collected.append(segment)
+        yield segment
+
+def _iter_chunks(segments, chunk_size):
+    """Yield (first_index, segments) chunks of at most chunk_size segments."""
+    segments = iter(segments)
+    first_index = 0
+    while True:
+        chunk = list(islice(segments, chunk_size))
+        if not chunk:
+            return
+        yield first_index, chunk
+        first_index += len(chunk)
+
+def _segments_fingerprint(segments):
+    """Return a digest of the speaker, timestamp and text of every segment."""
+    digest = hashlib.sha256()
+    for segment in segments:
+        _update_fingerprint(digest, segment)
+    return digest.hexdigest()
+
+def _update_fingerprint(digest, segment):
+    """Add a segment to a segments fingerprint digest."""
+    digest.update(json.dumps(
+        [segment['speaker'], segment['timestamp'], segment['text']]
+    ).encode('utf-8'))
@@ -0,0 +1,303 @@
+"""
+Pattern Packs Module
+-------------------
+This module loads pattern packs: YAML or JSON files defining patterns in
+the same shape as pattern_database.PATTERNS. Parsing YAML dominates the
+cost of loading a pack, so a YAML pack is parsed once and stored as a
+JSON artifact for later loads, and a PatternPackSource reloads a pack
+when its file changes.
+"""
+
+import os
+import re
+import sys
+import json
+import hashlib
+import logging
+import tempfile
+
+# PyYAML is only needed for YAML packs
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+# Import configuration
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import config
+from pattern_analysis.pattern_registry import PatternRegistry
+
+logger = logging.getLogger(__name__)
+
+# Bump when the structure of pack artifacts changes
+PACK_FORMAT_VERSION = 2
+
+# Fields of a pattern definition and whether they are required
+PATTERN_FIELDS = {
+    'id': True,
+    'name': True,
+    'description': True,
+    'keywords': True,
+    'frameworks': False,
+    'example': False
+}
+
+class PatternPackError(ValueError):
+    """Raised when a pattern pack cannot be read or fails validation."""
+
+    def __init__(self, path, errors):
+        self.path = path
+        self.errors = list(errors)
+        super().__init__(f"Invalid pattern pack {path}: " + '; '.join(self.errors))
+
+def load_pattern_pack(path, compiled_dir=None):
+    """
+    Load a pattern pack into a registry.
+
+    The first time the contents of a YAML pack are seen, its validated
+    definitions are written as a JSON artifact, keyed by a hash of the
+    file, to compiled_dir; later loads of the same contents read the
+    artifact instead of parsing the YAML. Artifacts are validated again
+    when read, which is cheap, so an edited artifact cannot introduce
+    patterns a pack could not. Regexes are compiled when the registry is
+    matched, as Python cannot store compiled patterns. JSON packs parse
+    as fast as an artifact would, so they have none.
+
+    Args:
+        path (str): Path to a .yaml, .yml or .json pattern pack
+        compiled_dir (str): Directory of pack artifacts
+            (default: config.PATTERN_PACK_SETTINGS['compiled_dir']);
+            False disables artifacts
+
+    Returns:
+        PatternRegistry: Registry of the pack's patterns
+
+    Raises:
+        PatternPackError: If the pack cannot be parsed or is invalid
+    """
+    with open(path, 'rb') as f:
+        content = f.read()
+
+    if compiled_dir is None:
+        compiled_dir = config.PATTERN_PACK_SETTINGS['compiled_dir']
+    artifact_path = None
+    if compiled_dir and os.path.splitext(path)[1].lower() in ('.yaml', '.yml'):
+        digest = hashlib.sha256(f"v{PACK_FORMAT_VERSION}\n".encode('utf-8') + content).hexdigest()
+        artifact_path = os.path.join(compiled_dir, f"{digest}.json")
+
+    definitions = _read_artifact(path, artifact_path) if artifact_path else None
+    if definitions is None:
+        definitions = validate_pack(path, _parse_pack(path, content))
+        if artifact_path:
+            _write_artifact(artifact_path, definitions)
+
+    return PatternRegistry(definitions)
+
+def validate_pack(path, pack):
+    """
+    Validate a parsed pattern pack.
+
+    Args:
+        path (str): Path of the pack, for error messages
+        pack (dict): Parsed pack, with a 'patterns' mapping of category to
+            a list of pattern definitions
+
+    Returns:
+        dict: Category to list of normalized pattern definitions
+
+    Raises:
+        PatternPackError: Listing every problem found
+    """
+    errors = []
+    if not isinstance(pack, dict) or not isinstance(pack.get('patterns'), dict):
+        raise PatternPackError(path, ["expected a mapping with a 'patterns' mapping of categories"])
+
+    definitions = {}
+    seen_ids = set()
+    for category, patterns in pack['patterns'].items():
+        if category not in config.PATTERN_CATEGORIES:
+            errors.append(f"unknown category '{category}'")
+            continue
+        if not isinstance(patterns, list):
+            errors.append(f"category '{category}' must be a list of patterns")
+            continue
+
+        definitions[category] = []
+        for position, definition in enumerate(patterns):
+            where = f"{category}[{position}]"
+            pattern_errors = _validate_pattern(definition, where)
+            if not pattern_errors:
+                if definition['id'] in seen_ids:
+                    pattern_errors.append(f"{where}: duplicate id '{definition['id']}'")
+                seen_ids.add(definition['id'])
+            if pattern_errors:
+                errors.extend(pattern_errors)
+                continue
+            definitions[category].append({
+                'id': definition['id'],
+                'name': definition['name'],
+                'description': definition['description'],
+                'keywords': list(definition['keywords']),
+                'frameworks': list(definition.get('frameworks', [])),
+                'example': definition.get('example', '')
+            })
+
+    if not seen_ids and not errors:
+        errors.append("the pack defines no patterns")
+    if errors:
+        raise PatternPackError(path, errors)
+    return definitions
+
+class PatternPackSource:
+    """A pattern pack file whose registry is reloaded when the file changes."""
+
+    def __init__(self, path, compiled_dir=None):
+        """
+        Load a pattern pack.
+
+        Args:
+            path (str): Path to the pattern pack
+            compiled_dir (str): Directory of pack artifacts
+                (default: config.PATTERN_PACK_SETTINGS['compiled_dir'])
+
+        Raises:
+            PatternPackError: If the pack is invalid
+        """
+        self.logger = logging.getLogger(__name__)
+        self.path = path
+        self.compiled_dir = compiled_dir
+        self._stat = self._file_stat()
+        self.registry = load_pattern_pack(path, compiled_dir)
+
+    def poll(self):
+        """
+        Reload the pack if its file changed since it was last loaded.
+
+        A pack that fails to load is logged and the previous registry is
+        kept, so a bad edit never interrupts analysis.
+
+        Returns:
+            PatternRegistry: The new registry, or None if nothing changed
+        """
+        stat = self._file_stat()
+        if stat == self._stat:
+            return None
+        self._stat = stat
+
+        try:
+            registry = load_pattern_pack(self.path, self.compiled_dir)
+        except (OSError, PatternPackError) as e:
+            self.logger.error(f"Keeping previous patterns, reload failed: {str(e)}")
+            return None
+
+        self.logger.info(f"Reloaded pattern pack {self.path} ({len(registry)} patterns)")
+        self.registry = registry
+        return registry
+
+    def _file_stat(self):
+        """Return the modification time and size of the pack file, or None."""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+def _parse_pack(path, content):
+    """Parse the raw contents of a pattern pack."""
+    extension = os.path.splitext(path)[1].lower()
+    try:
+        if extension in ('.yaml', '.yml'):
+            if yaml is None:
+                raise PatternPackError(path, ["PyYAML is required for YAML pattern packs (pip install pyyaml)"])
+            return yaml.safe_load(content)
+        if extension == '.json':
+            return json.loads(content)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise PatternPackError(path, [f"could not be parsed: {str(e)}"]) from None
+    except Exception as e:
+        if yaml is not None and isinstance(e, yaml.YAMLError):
+            raise PatternPackError(path, [f"could not be parsed: {str(e)}"]) from None
+        raise
+    raise PatternPackError(path, ["pattern packs must be .yaml, .yml or .json files"])
+
+def _validate_pattern(definition, where):
+    """Return the problems found in one pattern definition."""
+    if not isinstance(definition, dict):
+        return [f"{where}: expected a mapping"]
+
+    errors = []
+    for field in definition:
+        if field not in PATTERN_FIELDS:
+            errors.append(f"{where}: unknown field '{field}'")
+    for field, required in PATTERN_FIELDS.items():
+        if required and field not in definition:
+            errors.append(f"{where}: missing field '{field}'")
+
+    for field in ('id', 'name', 'description', 'example'):
+        if field in definition and not isinstance(definition[field], str):
+            errors.append(f"{where}: '{field}' must be a string")
+
+    keywords = definition.get('keywords')
+    if keywords is not None:
+        if not isinstance(keywords, list) or not keywords:
+            errors.append(f"{where}: 'keywords' must be a non-empty list")
+        else:
+            for keyword in keywords:
+                if not isinstance(keyword, str) or not keyword:
+                    errors.append(f"{where}: keywords must be non-empty strings")
+                    continue
+                try:
+                    compiled = re.compile(keyword)
+                except re.error as e:
+                    errors.append(f"{where}: invalid keyword regex '{keyword}': {str(e)}")
+                    continue
+                if compiled.groupindex:
+                    errors.append(f"{where}: keyword '{keyword}' must not define named groups")
+
+    frameworks = definition.get('frameworks', [])
+    if not isinstance(frameworks, list):
+        errors.append(f"{where}: 'frameworks' must be a list")
+    else:
+        for framework in frameworks:
+            if framework not in config.EXPERT_FRAMEWORKS:
+                errors.append(f"{where}: unknown framework '{framework}'")
+
+    return errors
+
+def _read_artifact(path, artifact_path):
+    """Return the validated definitions stored in a pack artifact, or None."""
+    try:
+        with open(artifact_path, 'r', encoding='utf-8') as f:
+            artifact = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable pattern artifact {artifact_path}: {str(e)}")
+        return None
+    if not isinstance(artifact, dict) or artifact.get('format') != PACK_FORMAT_VERSION:
+        return None
+    try:
+        return validate_pack(path, {'patterns': artifact.get('definitions')})
+    except PatternPackError as e:
+        logger.warning(f"Ignoring invalid pattern artifact {artifact_path}: {str(e)}")
+        return None
+
+def _write_artifact(artifact_path, definitions):
+    """Write a pack artifact atomically, ignoring errors."""
+    compiled_dir = os.path.dirname(artifact_path)
+    tmp_path = None
+    try:
+        os.makedirs(compiled_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=compiled_dir, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({'format': PACK_FORMAT_VERSION, 'definitions': definitions}, f)
+        os.replace(tmp_path, artifact_path)
+        tmp_path = None
+    except (OSError, TypeError, ValueError) as e:
+        logger.warning(f"Could not write pattern artifact {artifact_path}: {str(e)}")
+    finally:
+        if tmp_path is not None:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
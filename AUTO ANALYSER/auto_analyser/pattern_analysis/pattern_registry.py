@@ -0,0 +1,179 @@
+"""
+Pattern Registry Module
+----------------------
+This module holds the pattern definitions as immutable objects, indexed
+by id and category, together with the keyword engine compiled from them.
+"""
+
+import json
+import hashlib
+from types import MappingProxyType
+from pattern_analysis.pattern_engine import PatternEngine
+
+def pattern_fingerprint(pattern):
+    """
+    Return a digest of the parts of a pattern that determine its matches.
+
+    Covers the keywords, frameworks and category, plus the name and
+    description that are copied into every match of the pattern.
+    """
+    fields = {
+        key: pattern[key]
+        for key in ('keywords', 'frameworks', 'category', 'name', 'description')
+    }
+    return hashlib.sha256(json.dumps(fields, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+class Pattern:
+    """
+    Read-only pattern definition.
+
+    Fields are read as attributes or, like the pattern dictionaries they
+    replace, with pattern['field'].
+    """
+
+    __slots__ = ('id', 'name', 'category', 'description', 'keywords', 'frameworks',
+                 'example', 'fingerprint')
+
+    # Fields included in to_dict(), in definition order
+    FIELDS = ('id', 'name', 'category', 'description', 'keywords', 'frameworks', 'example')
+
+    def __init__(self, category, definition):
+        """
+        Create a pattern from its definition.
+
+        Args:
+            category (str): Category the pattern belongs to
+            definition (dict): Pattern definition with id, name, description,
+                keywords, frameworks and optionally example
+        """
+        values = {
+            'id': definition['id'],
+            'name': definition['name'],
+            'category': category,
+            'description': definition['description'],
+            'keywords': tuple(definition['keywords']),
+            'frameworks': tuple(definition.get('frameworks', ())),
+            'example': definition.get('example', '')
+        }
+        values['fingerprint'] = pattern_fingerprint(values)
+        for field, value in values.items():
+            object.__setattr__(self, field, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"Pattern '{self.id}' is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"Pattern '{self.id}' is immutable")
+
+    def __getitem__(self, key):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key):
+        return key in self.__slots__
+
+    def __reduce__(self):
+        return (Pattern, (self.category, self.to_dict()))
+
+    def __repr__(self):
+        return f"Pattern(id={self.id!r}, category={self.category!r})"
+
+    def get(self, key, default=None):
+        """Return a field, or default if the pattern has no such field."""
+        return self[key] if key in self.__slots__ else default
+
+    def to_dict(self):
+        """Return the pattern as a plain dictionary."""
+        return {
+            field: list(getattr(self, field)) if field in ('keywords', 'frameworks')
+            else getattr(self, field)
+            for field in self.FIELDS
+        }
+
+class PatternRegistry:
+    """
+    Immutable, indexed collection of patterns with their compiled keyword engine.
+
+    fingerprints is a read-only mapping of pattern id to pattern_fingerprint();
+    copy it with dict() to keep or modify it.
+    """
+
+    __slots__ = ('patterns', 'engine', 'fingerprints', '_by_id', '_by_category', '_index')
+
+    def __init__(self, definitions):
+        """
+        Build the registry.
+
+        Args:
+            definitions (dict): Category to list of pattern definitions. The
+                order of categories and of patterns within them is the
+                pattern order of the registry.
+        """
+        patterns = tuple(
+            Pattern(category, definition)
+            for category, category_definitions in definitions.items()
+            for definition in category_definitions
+        )
+
+        by_id = {}
+        for pattern in patterns:
+            if pattern.id in by_id:
+                raise ValueError(f"Duplicate pattern id '{pattern.id}'")
+            by_id[pattern.id] = pattern
+
+        by_category = {category: () for category in definitions}
+        for pattern in patterns:
+            by_category[pattern.category] += (pattern,)
+
+        set_field = object.__setattr__
+        set_field(self, 'patterns', patterns)
+        set_field(self, 'engine', PatternEngine(patterns))
+        set_field(self, 'fingerprints', MappingProxyType(
+            {pattern.id: pattern.fingerprint for pattern in patterns}
+        ))
+        set_field(self, '_by_id', by_id)
+        set_field(self, '_by_category', by_category)
+        set_field(self, '_index', {pattern.id: index for index, pattern in enumerate(patterns)})
+
+    def __setattr__(self, name, value):
+        raise AttributeError("PatternRegistry is immutable")
+
+    def __reduce__(self):
+        # Rebuilt from plain definitions, recompiling the engine on unpickling
+        return (PatternRegistry, (self.definitions(),))
+
+    def __len__(self):
+        return len(self.patterns)
+
+    def __iter__(self):
+        return iter(self.patterns)
+
+    def __getitem__(self, index):
+        return self.patterns[index]
+
+    def __contains__(self, pattern_id):
+        return pattern_id in self._by_id
+
+    def get(self, pattern_id):
+        """Return the pattern with an id, or None."""
+        return self._by_id.get(pattern_id)
+
+    def index_of(self, pattern_id):
+        """Return the position of a pattern in the registry, or None."""
+        return self._index.get(pattern_id)
+
+    def by_category(self, category):
+        """Return the patterns of a category, as a tuple."""
+        return self._by_category.get(category, ())
+
+    def categories(self):
+        """Return the categories, in definition order."""
+        return tuple(self._by_category)
+
+    def definitions(self):
+        """Return the patterns as plain definitions, grouped by category."""
+        return {
+            category: [pattern.to_dict() for pattern in patterns]
+            for category, patterns in self._by_category.items()
+        }
@@ -0,0 +1,106 @@
+"""
+Sentiment Module
+---------------
+This module scores batches of segments or sentences with VADER and
+returns the scores as NumPy arrays, so that per-speaker and overall
+sentiment become grouped reductions.
+"""
+
+import numpy as np
+
+# Columns of the score arrays, in VADER's neg/neu/pos/compound order
+SENTIMENT_KEYS = ('negative', 'neutral', 'positive', 'compound')
+
+# Punctuation VADER strips from the ends of a token before the lexicon lookup
+_TOKEN_PUNCTUATION = '!"#$%&\'()*+,-./:;<=>?@[\\]^_`{|}~'
+
+class SentimentScorer:
+    """Batch VADER scoring with a fast path for texts without sentiment words."""
+
+    def __init__(self, analyzer):
+        """
+        Initialize the scorer.
+
+        Args:
+            analyzer (SentimentIntensityAnalyzer): VADER analyzer used for
+                texts that contain lexicon words
+        """
+        self.analyzer = analyzer
+        self._lexicon = analyzer.lexicon.keys()
+
+    def score(self, texts):
+        """
+        Score a batch of texts.
+
+        Each distinct text is scored once. Texts that contain no token of
+        the VADER lexicon score exactly as polarity_scores() would without
+        running the rule-based scorer: neutral 1.0, or all zeros when they
+        have no tokens at all.
+
+        Args:
+            texts (list): Texts to score
+
+        Returns:
+            numpy.ndarray: Array of shape (len(texts), 4) with the negative,
+                neutral, positive and compound score of each text
+        """
+        scored = {}
+        rows = []
+        for text in texts:
+            row = scored.get(text)
+            if row is None:
+                row = scored[text] = self._score_text(text)
+            rows.append(row)
+        return np.array(rows, dtype=float).reshape(len(rows), len(SENTIMENT_KEYS))
+
+    def score_sentences(self, text, spans):
+        """
+        Score the sentences of a text.
+
+        Args:
+            text (str): The text the spans index into
+            spans (list): (start, end) offsets of each sentence
+
+        Returns:
+            numpy.ndarray: Array of shape (len(spans), 4), as returned by score()
+        """
+        return self.score([text[start:end] for start, end in spans])
+
+    def _score_text(self, text):
+        """Return the (neg, neu, pos, compound) scores of one text."""
+        # VADER ignores single-character tokens
+        words = [token for token in text.split() if len(token) > 1]
+        if not words:
+            return (0.0, 0.0, 0.0, 0.0)
+
+        # Every token VADER looks up is a word as written or with leading or
+        # trailing punctuation removed, so checking both forms is exhaustive
+        candidates = set()
+        for word in words:
+            word = word.lower()
+            candidates.add(word)
+            candidates.add(word.strip(_TOKEN_PUNCTUATION))
+        if self._lexicon.isdisjoint(candidates):
+            return (0.0, 1.0, 0.0, 0.0)
+
+        scores = self.analyzer.polarity_scores(text)
+        return (scores['neg'], scores['neu'], scores['pos'], scores['compound'])
+
+def grouped_sums(scores, groups, group_count):
+    """
+    Sum score rows by group.
+
+    Args:
+        scores (numpy.ndarray): Array of shape (n, 4) from SentimentScorer.score()
+        groups (list): Group index of each row
+        group_count (int): Number of groups
+
+    Returns:
+        numpy.ndarray: Array of shape (group_count, 4) with the summed scores
+            of each group
+    """
+    groups = np.asarray(groups, dtype=np.intp)
+    return np.stack([
+        np.bincount(groups, weights=scores[:, column], minlength=group_count)
+        for column in range(scores.shape[1])
+    ], axis=1)
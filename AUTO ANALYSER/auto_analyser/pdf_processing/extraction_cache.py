@@ -0,0 +1,148 @@
+"""
+Extraction Cache Module
+----------------------
+This module keeps an on-disk cache of extracted transcripts, keyed by
+the contents of the source file and the extractor settings, so that a
+transcript is only parsed once.
+"""
+
+import os
+import json
+import hashlib
+import logging
+import tempfile
+
+# Import configuration
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import config
+
+# Bump when the structure of extracted transcripts changes
+CACHE_FORMAT_VERSION = 2
+
+class ExtractionCache:
+    """Content-addressed, size-limited cache of extracted transcript data."""
+
+    def __init__(self, cache_dir=None, max_size_mb=None):
+        """
+        Initialize the extraction cache.
+
+        Args:
+            cache_dir (str): Directory holding cache entries
+                (default: config.CACHE_SETTINGS['cache_dir'])
+            max_size_mb (int): Size limit of the cache; least recently used
+                entries are evicted beyond it (default: config.CACHE_SETTINGS['max_size_mb'])
+        """
+        self.logger = logging.getLogger(__name__)
+        self.cache_dir = cache_dir or config.CACHE_SETTINGS['cache_dir']
+        if max_size_mb is None:
+            max_size_mb = config.CACHE_SETTINGS['max_size_mb']
+        self.max_size = int(max_size_mb * 1024 * 1024)
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def key_for(self, file_path):
+        """
+        Compute the cache key of a transcript file.
+
+        The key covers the file contents and the extractor settings, so
+        renaming or moving a file keeps its entry while editing it, or
+        changing config.PDF_SETTINGS, does not.
+
+        Args:
+            file_path (str): Path to the transcript file
+
+        Returns:
+            str: Hex digest identifying the extraction result
+        """
+        digest = hashlib.sha256()
+        digest.update(f"v{CACHE_FORMAT_VERSION}\n".encode('utf-8'))
+        digest.update(json.dumps(config.PDF_SETTINGS, sort_keys=True).encode('utf-8'))
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def get(self, key):
+        """
+        Return the cached transcript data for a key.
+
+        Args:
+            key (str): Cache key from key_for()
+
+        Returns:
+            dict: Transcript data, or None on a miss
+        """
+        path = self._entry_path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                transcript_data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Discarding unreadable cache entry {path}: {str(e)}")
+            self._remove(path)
+            return None
+
+        # Mark the entry as recently used for LRU eviction
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return transcript_data
+
+    def put(self, key, transcript_data):
+        """
+        Store transcript data under a key and enforce the size limit.
+
+        Args:
+            key (str): Cache key from key_for()
+            transcript_data (dict): Transcript data to store
+        """
+        path = self._entry_path(key)
+
+        # Write to a temporary file first so concurrent readers never see
+        # a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(transcript_data, f, separators=(',', ':'))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            self.logger.warning(f"Could not write cache entry {path}: {str(e)}")
+            self._remove(tmp_path)
+            return
+
+        self._evict()
+
+    def _entry_path(self, key):
+        """Return the file path of a cache entry."""
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _evict(self):
+        """Remove least recently used entries until the cache fits its size limit."""
+        entries = []
+        total_size = 0
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if not entry.name.endswith('.json'):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total_size += stat.st_size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total_size <= self.max_size:
+                break
+            self._remove(path)
+            total_size -= size
+
+    def _remove(self, path):
+        """Delete a file, ignoring errors."""
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -2,111 +2,241 @@
 PDF Extractor Module
 -------------------
 This module handles the extraction of text from PDF transcript files,
-including speaker identification and timestamp parsing.
+including speaker identification and timestamp parsing. Plain-text,
+caption and JSON transcripts are read directly by the loaders in
+transcript_loaders.
 """
 
 import os
 import re
-import io
-import PyPDF2
-from pdfminer.high_level import extract_text
-from pdfminer.layout import LAParams
+import sys
+import math
 import logging
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice
 
 # Import configuration
-import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import config
+import profiling
+from pdf_processing.transcript_loaders import (
+    iter_text_lines, load_caption_transcript, load_json_transcript, load_json_lines_transcript,
+    parse_timestamp
+)
+
+logger = logging.getLogger(__name__)
+
+# Loaders for transcript formats that are read without PDF extraction
+TRANSCRIPT_LOADERS = {
+    '.vtt': load_caption_transcript,
+    '.srt': load_caption_transcript,
+    '.json': load_json_transcript,
+    '.jsonl': load_json_lines_transcript
+}
+
+# A line holding only a timestamp, repeated by some exports within long turns
+TIME_LINE_PATTERN = re.compile(r'^\d+:\d+(?::\d+)?$')
 
 class PDFExtractor:
-    """Class for extracting text and metadata from PDF transcripts."""
+    """Class for extracting text and metadata from PDF and exported transcripts."""
     
-    def __init__(self):
-        """Initialize the PDF extractor."""
+    def __init__(self, cache=None, refresh=False, workers=1):
+        """
+        Initialize the PDF extractor.
+        
+        Args:
+            cache (ExtractionCache): Cache of extracted transcripts; None disables caching
+            refresh (bool): Re-extract every file and overwrite its cache entry
+            workers (int): Number of worker processes that extract page ranges
+                in parallel. 1 extracts in-process.
+        """
         self.logger = logging.getLogger(__name__)
+        self.cache = cache
+        self.refresh = refresh
+        self.workers = workers
+        self._executor = None
         self.min_line_length = config.PDF_SETTINGS['min_line_length']
-        self.speaker_pattern = re.compile(config.PDF_SETTINGS['speaker_pattern'])
+        self.header_lines = config.PDF_SETTINGS['header_lines']
+        self.min_page_chars = config.PDF_SETTINGS['min_page_chars']
+        self.max_nonprintable_ratio = config.PDF_SETTINGS['max_nonprintable_ratio']
+        self.header_grammars = _compile_grammars(
+            config.PDF_SETTINGS['header_grammars'], self.min_line_length
+        )
     
-    def extract_text(self, file_path):
+    def close(self):
+        """Shut down the extraction worker pool, if one was started."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+    
+    def extract_text(self, file_path, stream=False, profiler=None):
         """
-        Extract text from a PDF file.
+        Extract text from a transcript file.
         
         Args:
-            file_path (str): Path to the PDF file
+            file_path (str): Path to the transcript file (.pdf, .txt, .vtt,
+                .srt, .json or .jsonl)
+            stream (bool): Return the segments as a generator that extracts the
+                PDF page by page while it is consumed, so analysis can start
+                before extraction finishes. The result is cached once the
+                generator is exhausted.
+            profiler (Profiler): Records the extract and segment stages, if given
             
         Returns:
             dict: A dictionary containing the transcript data with the following keys:
                 - metadata: Dictionary of metadata (title, date, etc.)
                 - segments: List of transcript segments with speaker, timestamp, and text
+                  (a generator of segments when stream is True and the file is not cached)
         """
         if not os.path.exists(file_path):
             self.logger.error(f"File not found: {file_path}")
             raise FileNotFoundError(f"File not found: {file_path}")
         
-        # Check if the file is a PDF
-        if not file_path.lower().endswith('.pdf'):
-            self.logger.error(f"File is not a PDF: {file_path}")
-            raise ValueError(f"File is not a PDF: {file_path}")
+        # Check if the file is a supported transcript format
+        extension = os.path.splitext(file_path)[1].lower()
+        if extension not in ('.pdf', '.txt') and extension not in TRANSCRIPT_LOADERS:
+            self.logger.error(f"Unsupported transcript format: {file_path}")
+            raise ValueError(f"Unsupported transcript format: {file_path}")
+        
+        # Reuse a previous extraction of the same file contents
+        cache_key = None
+        if self.cache is not None:
+            with profiling.stage(profiler, 'extract'):
+                cache_key = self.cache.key_for(file_path)
+                transcript_data = None if self.refresh else self.cache.get(cache_key)
+            if transcript_data is not None:
+                self.logger.info(f"Using cached extraction for {file_path}")
+                return transcript_data
         
         try:
-            # First try with PyPDF2
-            text = self._extract_with_pypdf2(file_path)
-            
-            # If PyPDF2 fails or returns empty text, try with pdfminer
-            if not text or len(text.strip()) < 100:  # Arbitrary threshold
-                self.logger.info("PyPDF2 extraction yielded insufficient text, trying pdfminer")
-                text = self._extract_with_pdfminer(file_path)
-            
-            # Process the extracted text
-            transcript_data = self._process_transcript(text)
-            
-            return transcript_data
-            
+            # Parsing the header for metadata is segmentation; reading the
+            # lines it needs is extraction
+            with profiling.stage(profiler, 'segment'):
+                metadata, segments = self.stream_transcript(file_path, profiler=profiler)
         except Exception as e:
-            self.logger.error(f"Error extracting text from PDF: {str(e)}")
+            self.logger.error(f"Error extracting text from {file_path}: {str(e)}")
             raise
+        
+        if profiler is not None:
+            segments = profiler.iterate('segment', segments)
+        segments = self._cached_segments(segments, metadata, cache_key, profiler)
+        return {
+            'metadata': metadata,
+            'segments': segments if stream else list(segments)
+        }
     
-    def _extract_with_pypdf2(self, file_path):
-        """Extract text using PyPDF2."""
-        text = ""
-        try:
-            with open(file_path, 'rb') as file:
-                reader = PyPDF2.PdfReader(file)
-                for page in reader.pages:
-                    text += page.extract_text() + "\n"
-            return text
-        except Exception as e:
-            self.logger.warning(f"PyPDF2 extraction failed: {str(e)}")
-            return ""
+    def stream_transcript(self, file_path, profiler=None):
+        """
+        Extract a transcript incrementally.
+        
+        Only the header lines needed for the metadata are read up front; the
+        rest of the document is extracted as the segments are consumed, and
+        each segment is yielded as soon as the next speaker header is read.
+        PDFs are extracted page by page and plain-text files line by line,
+        both through the same speaker and timestamp parsing; caption and
+        JSON exports are read by their loaders.
+        
+        Args:
+            file_path (str): Path to the transcript file
+            profiler (Profiler): Records reading the pages or lines as the
+                extract stage, if given
+            
+        Returns:
+            tuple: (metadata, segments) where segments is a generator of
+                segment dictionaries
+        """
+        extension = os.path.splitext(file_path)[1].lower()
+        if extension in TRANSCRIPT_LOADERS:
+            with profiling.stage(profiler, 'extract'):
+                return TRANSCRIPT_LOADERS[extension](file_path)
+        if extension == '.txt':
+            chunks = iter_text_lines(file_path)
+        else:
+            chunks = _split_lines(self._iter_page_texts(file_path))
+        if profiler is not None:
+            chunks = profiler.iterate('extract', chunks)
+        return self._process_lines(chunks)
     
-    def _extract_with_pdfminer(self, file_path):
-        """Extract text using pdfminer.six."""
+    def _cached_segments(self, segments, metadata, cache_key, profiler=None):
+        """Yield segments, storing the transcript in the cache once they are exhausted."""
+        collected = []
         try:
-            laparams = LAParams()
-            text = extract_text(file_path, laparams=laparams)
-            return text
+            for segment in segments:
+                collected.append(segment)
+                yield segment
         except Exception as e:
-            self.logger.error(f"pdfminer extraction failed: {str(e)}")
+            self.logger.error(f"Error extracting text: {str(e)}")
             raise
+        
+        if self.cache is not None:
+            with profiling.stage(profiler, 'extract'):
+                self.cache.put(cache_key, {'metadata': metadata, 'segments': collected})
+    
+    def _iter_page_texts(self, file_path):
+        """
+        Yield the text of each page, as extracted text chunks.
+        
+        Pages are extracted with PyPDF2; pages whose text fails the quality
+        check are re-extracted with pdfminer.
+        """
+        if self.workers > 1:
+            yield from self._iter_pages_parallel(file_path)
+        else:
+            yield from _iter_selected_pages(
+                file_path, 0, None, self.min_page_chars, self.max_nonprintable_ratio
+            )
+    
+    def _iter_pages_parallel(self, file_path):
+        """
+        Extract page ranges across the worker pool and yield pages in order.
+        
+        Args:
+            file_path (str): Path to the PDF file
+        """
+        page_count = _count_pages(file_path)
+        if page_count == 0:
+            return
+        
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        
+        # Two ranges per worker balances uneven pages against the cost of
+        # each worker re-opening the document
+        range_size = max(1, math.ceil(page_count / (self.workers * 2)))
+        starts = range(0, page_count, range_size)
+        ends = [min(start + range_size, page_count) for start in starts]
+        
+        for page_texts in self._executor.map(
+            _extract_page_range,
+            [file_path] * len(ends), starts, ends,
+            [self.min_page_chars] * len(ends),
+            [self.max_nonprintable_ratio] * len(ends)
+        ):
+            yield from page_texts
     
-    def _process_transcript(self, text):
+    def _process_lines(self, lines):
         """
-        Process the extracted text to identify speakers, timestamps, and segments.
+        Split a stream of lines into metadata and a stream of segments.
         
         Args:
-            text (str): The extracted text from the PDF
+            lines (iterable): Text lines
             
         Returns:
-            dict: A dictionary containing the transcript data
+            tuple: (metadata, segments) where segments is a generator
         """
-        lines = text.split('\n')
-        metadata = self._extract_metadata(lines)
-        segments = self._extract_segments(lines)
+        lines = iter(lines)
+        header = list(islice(lines, self.header_lines))
+        metadata = self._extract_metadata(header)
         
-        return {
-            'metadata': metadata,
-            'segments': segments
-        }
+        # Skip header lines (metadata)
+        start_idx = 0
+        for i, line in enumerate(header):
+            if 'Transcription' in line or 'Transcript' in line:
+                start_idx = i + 1
+                break
+        
+        segments = self._iter_segments(chain(header[start_idx:], lines))
+        return metadata, segments
     
     def _extract_metadata(self, lines):
         """
@@ -153,70 +283,322 @@ class PDFExtractor:
         
         return metadata
     
-    def _extract_segments(self, lines):
+    def _iter_segments(self, lines):
         """
         Extract transcript segments with speaker, timestamp, and text.
         
+        A single pass over the lines: the header grammars of
+        config.PDF_SETTINGS are tried until the first speaker header is
+        found, and the rest of the transcript is split with the grammar
+        that matched it alone.
+        
         Args:
-            lines (list): List of text lines
+            lines (iterable): Text lines following the transcript header
             
-        Returns:
-            list: List of segment dictionaries
+        Yields:
+            dict: Segment dictionaries with speaker, timestamp, start time
+                in seconds and text, each as soon as it is complete
         """
-        segments = []
-        current_speaker = None
-        current_timestamp = None
-        current_text = []
+        lines = iter(lines)
+        first_header = _find_first_header(lines, self.header_grammars)
+        if first_header is None:
+            return
+        grammar, speaker, timestamp, current_text = first_header
+        min_line_length = grammar['min_line_length']
+        is_time_line = TIME_LINE_PATTERN.match
         
-        # Skip header lines (metadata)
-        start_idx = 0
-        for i, line in enumerate(lines):
-            if 'Transcription' in line or 'Transcript' in line:
-                start_idx = i + 1
-                break
-        
-        # Process transcript lines
-        for line in lines[start_idx:]:
-            line = line.strip()
-            
-            # Skip empty or too short lines
-            if not line or len(line) < self.min_line_length:
-                continue
-            
-            # Check if this line starts a new speaker segment
-            speaker_match = re.search(r'^([A-Za-z\s]+)\s+(\d+:\d+)$', line)
-            
-            if speaker_match:
-                # If we have a current segment, save it
-                if current_speaker and current_text:
-                    segments.append({
-                        'speaker': current_speaker,
-                        'timestamp': current_timestamp,
-                        'text': ' '.join(current_text)
-                    })
+        if grammar['header'] is not None:
+            match_header = grammar['header'].match
+            has_text = grammar['has_text']
+            for line in lines:
+                line = line.strip()
                 
-                # Start a new segment
-                current_speaker = speaker_match.group(1).strip()
-                current_timestamp = speaker_match.group(2)
-                current_text = []
-            else:
-                # Check if this is a continuation line with just a timestamp
-                timestamp_match = re.search(r'^(\d+:\d+)$', line)
+                # Skip empty or too short lines
+                if not line or len(line) < min_line_length:
+                    continue
                 
-                if timestamp_match:
-                    # This is just a timestamp line, skip it
+                header_match = match_header(line)
+                if header_match:
+                    if current_text:
+                        yield _segment(speaker, timestamp, current_text)
+                    speaker = header_match.group('speaker').strip()
+                    timestamp = header_match.group('time')
+                    current_text = []
+                    if has_text and header_match.group('text'):
+                        current_text.append(header_match.group('text'))
+                elif not (line[-1].isdigit() and is_time_line(line)):
+                    # Repeated timestamps are skipped; anything else is content
+                    current_text.append(line)
+        else:
+            # A speaker line is held back until the next line shows whether
+            # a timestamp follows; if not, it was speech
+            match_speaker = grammar['speaker'].match
+            match_time = grammar['time'].match
+            pending = None
+            for line in lines:
+                line = line.strip()
+                if not line or len(line) < min_line_length:
                     continue
                 
-                # This is content for the current speaker
-                if current_speaker:
+                if pending is not None:
+                    time_match = match_time(line)
+                    if time_match:
+                        if current_text:
+                            yield _segment(speaker, timestamp, current_text)
+                        speaker = pending.group('speaker').strip()
+                        timestamp = time_match.group('time')
+                        current_text = []
+                        pending = None
+                        continue
+                    current_text.append(pending.string)
+                    pending = None
+                
+                speaker_match = match_speaker(line)
+                if speaker_match:
+                    pending = speaker_match
+                elif not (line[-1].isdigit() and is_time_line(line)):
                     current_text.append(line)
+            
+            if pending is not None:
+                current_text.append(pending.string)
         
-        # Add the last segment if there is one
-        if current_speaker and current_text:
-            segments.append({
-                'speaker': current_speaker,
-                'timestamp': current_timestamp,
-                'text': ' '.join(current_text)
-            })
+        # Emit the last segment if there is one
+        if current_text:
+            yield _segment(speaker, timestamp, current_text)
+
+def _find_first_header(lines, grammars):
+    """
+    Consume lines up to the first speaker header matching any grammar.
+    
+    Args:
+        lines (iterator): Text lines; those up to the header are consumed
+        grammars (list): Compiled header grammars, in order of preference
+        
+    Returns:
+        tuple: (grammar, speaker, timestamp, text lines) of the header, or
+            None if no line matches
+    """
+    # (grammar, speaker match) of two-line grammars whose speaker line
+    # matched the previous line
+    pending = []
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        
+        for grammar, speaker_match in pending:
+            time_match = grammar['time'].match(line)
+            if time_match:
+                return grammar, speaker_match.group('speaker').strip(), time_match.group('time'), []
+        pending = []
+        
+        for grammar in grammars:
+            if len(line) < grammar['min_line_length']:
+                continue
+            if grammar['header'] is None:
+                speaker_match = grammar['speaker'].match(line)
+                if speaker_match:
+                    pending.append((grammar, speaker_match))
+                continue
+            header_match = grammar['header'].match(line)
+            if header_match:
+                text = header_match.group('text') if grammar['has_text'] else None
+                return (grammar, header_match.group('speaker').strip(), header_match.group('time'),
+                        [text] if text else [])
+    return None
+
+def _compile_grammars(grammars, min_line_length):
+    """
+    Compile the header grammars of config.PDF_SETTINGS.
+    
+    Args:
+        grammars (list): Grammar dictionaries with a 'header' pattern, or
+            'speaker' and 'time' patterns
+        min_line_length (int): Minimum content line length of grammars
+            that do not set their own
         
-        return segments
+    Returns:
+        list: Grammar dictionaries with compiled patterns
+    """
+    compiled = []
+    for grammar in grammars:
+        header = re.compile(grammar['header']) if grammar.get('header') else None
+        if header is None and not (grammar.get('speaker') and grammar.get('time')):
+            raise ValueError(f"Header grammar {grammar.get('name')!r} needs a header, "
+                             f"or a speaker and a time pattern")
+        compiled.append({
+            'name': grammar.get('name', ''),
+            'header': header,
+            'has_text': header is not None and 'text' in header.groupindex,
+            'speaker': re.compile(grammar['speaker']) if header is None else None,
+            'time': re.compile(grammar['time']) if header is None else None,
+            'min_line_length': grammar.get('min_line_length', min_line_length)
+        })
+    return compiled
+
+def _segment(speaker, timestamp, text_lines):
+    """Return a segment dictionary for a speaker header and its content lines."""
+    return {
+        'speaker': speaker,
+        'timestamp': timestamp,
+        'seconds': parse_timestamp(timestamp),
+        'text': ' '.join(text_lines)
+    }
+
+def _iter_selected_pages(file_path, first_page, last_page, min_page_chars, max_nonprintable_ratio):
+    """
+    Yield the text of pages [first_page, last_page), choosing the extractor per page.
+    
+    Each page is extracted with PyPDF2 and judged on its character density
+    and the share of non-printable characters. Pages that fail, or that
+    PyPDF2 cannot extract at all, are re-extracted with pdfminer, and the
+    text with more printable characters is kept. pdfminer opens the
+    document only once the first page needs it.
+    
+    Args:
+        file_path (str): Path to the PDF file
+        first_page (int): Index of the first page
+        last_page (int): Index after the last page; None for the end of the document
+        min_page_chars (int): Minimum non-whitespace characters of a usable page
+        max_nonprintable_ratio (float): Maximum share of non-printable
+            characters of a usable page
+    """
+    # Imported on first use so runs over text transcripts do not pay for them
+    import PyPDF2
+    
+    fallback = None
+    try:
+        with open(file_path, 'rb') as file:
+            try:
+                pages = PyPDF2.PdfReader(file).pages
+                page_count = len(pages)
+            except Exception as e:
+                logger.warning(f"PyPDF2 extraction failed, using pdfminer: {str(e)}")
+                pages = None
+                fallback = _PdfminerPages(file_path)
+                page_count = len(fallback)
+            
+            if last_page is None:
+                last_page = page_count
+            
+            for page_index in range(first_page, last_page):
+                text = None
+                if pages is not None:
+                    try:
+                        text = (pages[page_index].extract_text() or '') + "\n"
+                    except Exception as e:
+                        logger.warning(f"PyPDF2 failed on page {page_index + 1}: {str(e)}")
+                
+                if text is None or not _is_usable_page(text, min_page_chars, max_nonprintable_ratio):
+                    if fallback is None:
+                        fallback = _PdfminerPages(file_path)
+                    if pages is not None:
+                        logger.info(f"Re-extracting page {page_index + 1} with pdfminer")
+                    alternative = fallback.page_text(page_index)
+                    if text is None or _printable_chars(alternative) > _printable_chars(text):
+                        text = alternative
+                
+                yield text
+    finally:
+        if fallback is not None:
+            fallback.close()
+
+def _extract_page_range(file_path, first_page, last_page, min_page_chars, max_nonprintable_ratio):
+    """Return the text of pages [first_page, last_page) in a worker process."""
+    return list(_iter_selected_pages(
+        file_path, first_page, last_page, min_page_chars, max_nonprintable_ratio
+    ))
+
+def _printable_chars(text):
+    """Return the number of printable, non-whitespace characters in text."""
+    visible = ''.join(text.split())
+    if visible.isprintable() and '\ufffd' not in visible:
+        return len(visible)
+    return sum(1 for char in visible if char.isprintable() and char != '\ufffd')
+
+def _is_usable_page(text, min_page_chars, max_nonprintable_ratio):
+    """Return True if extracted page text is dense and clean enough to keep."""
+    visible = len(''.join(text.split()))
+    if visible < min_page_chars:
+        return False
+    return (visible - _printable_chars(text)) / visible <= max_nonprintable_ratio
+
+def _count_pages(file_path):
+    """Return the number of pages in a PDF, using pdfminer if PyPDF2 cannot read it."""
+    import PyPDF2
+    
+    try:
+        with open(file_path, 'rb') as file:
+            return len(PyPDF2.PdfReader(file).pages)
+    except Exception:
+        pages = _PdfminerPages(file_path)
+        try:
+            return len(pages)
+        finally:
+            pages.close()
+
+class _PdfminerPages:
+    """Random access to the text of individual pages with pdfminer.six."""
+    
+    def __init__(self, file_path):
+        from pdfminer.converter import PDFPageAggregator
+        from pdfminer.layout import LAParams
+        from pdfminer.pdfdocument import PDFDocument
+        from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+        from pdfminer.pdfpage import PDFPage
+        from pdfminer.pdfparser import PDFParser
+        
+        self._file = open(file_path, 'rb')
+        try:
+            document = PDFDocument(PDFParser(self._file))
+            self._pages = list(PDFPage.create_pages(document))
+        except Exception as e:
+            self._file.close()
+            logger.error(f"pdfminer extraction failed: {str(e)}")
+            raise
+        resource_manager = PDFResourceManager()
+        self._device = PDFPageAggregator(resource_manager, laparams=LAParams())
+        self._interpreter = PDFPageInterpreter(resource_manager, self._device)
+    
+    def __len__(self):
+        return len(self._pages)
+    
+    def page_text(self, page_index):
+        """Return the text of a page, rendered as pdfminer's extract_text would."""
+        try:
+            self._interpreter.process_page(self._pages[page_index])
+        except Exception as e:
+            logger.error(f"pdfminer extraction failed: {str(e)}")
+            raise
+        return _render_layout(self._device.get_result())
+    
+    def close(self):
+        self._file.close()
+
+def _split_lines(chunks):
+    """Yield the lines of text arriving in chunks, as ''.join(chunks).split('\\n') would."""
+    pending = ''
+    for chunk in chunks:
+        lines = (pending + chunk).split('\n')
+        pending = lines.pop()
+        yield from lines
+    yield pending
+
+def _render_layout(item):
+    """Render a pdfminer layout to text the way pdfminer's TextConverter does."""
+    from pdfminer.layout import LTContainer, LTText, LTTextBox
+    
+    parts = []
+    
+    def render(item):
+        if isinstance(item, LTContainer):
+            for child in item:
+                render(child)
+        elif isinstance(item, LTText):
+            parts.append(item.get_text())
+        if isinstance(item, LTTextBox):
+            parts.append('\n')
+    
+    render(item)
+    parts.append('\f')
+    return ''.join(parts)
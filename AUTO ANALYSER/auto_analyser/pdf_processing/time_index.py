@@ -0,0 +1,119 @@
+"""
+Time Index Module
+-----------------
+This module indexes the segments of a transcript by their start time,
+so later stages can find the segments spoken in a time window, or at a
+given moment, with a binary search instead of a scan.
+"""
+
+import os
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+
+# Import local modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pdf_processing.transcript_loaders import parse_timestamp
+
+class TimeIndex:
+    """Start times of the segments of a transcript, in a sorted array."""
+
+    def __init__(self, segments):
+        """
+        Index a list of segments.
+
+        Start times are taken from each segment's 'seconds', or parsed
+        from its 'timestamp' for segments extracted before 'seconds' was
+        recorded. Segments without a usable time are left out.
+
+        Args:
+            segments (list): Segment dictionaries
+        """
+        times = []
+        for position, segment in enumerate(segments):
+            seconds = segment.get('seconds')
+            if seconds is None and segment.get('timestamp'):
+                seconds = parse_timestamp(segment['timestamp'])
+            if seconds is not None:
+                times.append((seconds, position))
+
+        # Transcripts are almost always in time order already
+        if any(times[i][0] > times[i + 1][0] for i in range(len(times) - 1)):
+            times.sort()
+        self.seconds = array('q', (seconds for seconds, _ in times))
+        self.positions = array('q', (position for _, position in times))
+
+    def __len__(self):
+        return len(self.seconds)
+
+    def between(self, start=None, end=None):
+        """
+        Return the segments starting within a time window.
+
+        Args:
+            start (int): First second of the window (default: the start of
+                the recording)
+            end (int): Second the window ends before (default: the end of
+                the recording)
+
+        Returns:
+            list: Positions of the segments in the segment list, in
+                transcript order
+        """
+        first = bisect_left(self.seconds, start) if start is not None else 0
+        last = bisect_left(self.seconds, end) if end is not None else len(self.seconds)
+        return sorted(self.positions[first:last])
+
+    def at(self, seconds):
+        """
+        Return the segment being spoken at a moment.
+
+        Args:
+            seconds (int): Offset from the start of the recording
+
+        Returns:
+            int: Position of the last segment starting at or before the
+                moment, or None if the moment precedes every segment
+        """
+        index = bisect_right(self.seconds, seconds)
+        return self.positions[index - 1] if index else None
+
+def select_segments(segments, start=None, end=None, speakers=None):
+    """
+    Return the segments spoken in a time window, by the given speakers.
+
+    The window is resolved against a TimeIndex; a segment already under
+    way at the start of the window is included. Speaker names are
+    compared case-insensitively, and a name ending in '*' matches by
+    prefix (e.g. 'Mbalu*').
+
+    Args:
+        segments (iterable): Segment dictionaries
+        start (int): Start of the window in seconds (default: the start of
+            the recording)
+        end (int): Second the window ends before (default: the end of the
+            recording)
+        speakers (iterable): Speaker names to keep (default: every speaker)
+
+    Returns:
+        list: The selected segments, in transcript order
+    """
+    segments = list(segments)
+    if start is not None or end is not None:
+        index = TimeIndex(segments)
+        positions = index.between(start, end)
+        if start is not None:
+            current = index.at(start)
+            if current is not None and current not in positions:
+                positions = sorted(positions + [current])
+        segments = [segments[position] for position in positions]
+
+    if speakers:
+        names = {name.strip().lower() for name in speakers if not name.endswith('*')}
+        prefixes = tuple(name[:-1].strip().lower() for name in speakers if name.endswith('*'))
+        segments = [
+            segment for segment in segments
+            if segment['speaker'].strip().lower() in names
+            or segment['speaker'].strip().lower().startswith(prefixes)
+        ]
+    return segments
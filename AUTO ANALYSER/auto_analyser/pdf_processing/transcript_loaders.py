@@ -0,0 +1,295 @@
+"""
+Transcript Loaders Module
+------------------------
+This module reads transcripts exported by meeting platforms as plain
+text, WebVTT/SRT captions or JSON, producing the same segments as the
+PDF extractor without a round-trip through PDF.
+"""
+
+import re
+import json
+import math
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Caption cue timing line, e.g. "00:01:02.500 --> 00:01:05.000 align:start"
+CUE_TIMING_PATTERN = re.compile(
+    r'^\s*((?:\d+:)?\d{1,2}:\d{2}(?:[.,]\d{1,3})?)\s*-->\s*'
+    r'((?:\d+:)?\d{1,2}:\d{2}(?:[.,]\d{1,3})?)'
+)
+
+# WebVTT voice span, e.g. "<v Ben Mak>" or "<v.loud Ben Mak>"
+VOICE_TAG_PATTERN = re.compile(r'<v(?:\.[^\s>]*)?\s+([^>]+)>')
+
+# Speaker prefix used by platforms without voice spans, e.g. "Ben Mak: Hello"
+SPEAKER_PREFIX_PATTERN = re.compile(r"^([A-Z][\w .'’()-]{0,59}?):\s+(.*)$")
+
+# Any remaining markup tag in cue text
+TAG_PATTERN = re.compile(r'</?[^>]*>')
+
+def iter_text_lines(file_path):
+    """
+    Yield the lines of a plain-text transcript without line endings.
+
+    Args:
+        file_path (str): Path to the text file
+
+    Yields:
+        str: Each line of the file
+    """
+    with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            yield line.rstrip('\r\n')
+
+def load_caption_transcript(file_path):
+    """
+    Load a WebVTT or SRT caption file as transcript segments.
+
+    Consecutive cues from the same speaker are merged into one segment
+    that carries the start time of its first cue. The speaker of a cue is
+    taken from a WebVTT voice span or a "Name: " prefix; cues with
+    neither continue the previous speaker.
+
+    Args:
+        file_path (str): Path to the .vtt or .srt file
+
+    Returns:
+        tuple: (metadata, segments) where segments is a generator of segment
+            dictionaries. Participants are added to the metadata as their
+            first cue is read.
+    """
+    metadata = _empty_metadata()
+    return metadata, _iter_caption_segments(file_path, metadata)
+
+def load_json_transcript(file_path):
+    """
+    Load a JSON transcript export as transcript segments.
+
+    The file holds either a list of segments or an object with a
+    'segments' list and optional 'metadata'. Each segment needs 'speaker'
+    and 'text', plus either a 'timestamp' string or a 'start' offset in
+    seconds.
+
+    Unlike the other loaders, this one reads the whole document into
+    memory before yielding the first segment, since a JSON document
+    cannot be split without a streaming parser. Long transcripts are
+    better exported as JSON Lines (load_json_lines_transcript).
+
+    Args:
+        file_path (str): Path to the .json file
+
+    Returns:
+        tuple: (metadata, segments) where segments is a generator of segment
+            dictionaries
+    """
+    with open(file_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    metadata = _empty_metadata()
+    if isinstance(data, dict):
+        metadata.update(data.get('metadata') or {})
+        items = data.get('segments')
+    else:
+        items = data
+
+    if not isinstance(items, list):
+        raise ValueError(f"JSON transcript has no list of segments: {file_path}")
+
+    return metadata, _iter_json_segments(items)
+
+def load_json_lines_transcript(file_path):
+    """
+    Load a JSON Lines transcript export as transcript segments, one line at a time.
+
+    Each non-blank line holds one segment object, in the format accepted
+    by load_json_transcript. The first line may instead be an object with
+    only a 'metadata' entry.
+
+    Args:
+        file_path (str): Path to the .jsonl file
+
+    Returns:
+        tuple: (metadata, segments) where segments is a generator of segment
+            dictionaries, reading the file as it is consumed
+    """
+    metadata = _empty_metadata()
+    first = next(_iter_json_lines(file_path), None)
+    has_header = isinstance(first, dict) and 'metadata' in first and 'text' not in first
+    if has_header:
+        metadata.update(first['metadata'] or {})
+
+    return metadata, _iter_json_segments(_iter_json_lines(file_path, skip=1 if has_header else 0))
+
+def format_timestamp(seconds):
+    """
+    Format an offset in seconds the way transcripts print timestamps.
+
+    Args:
+        seconds (float): Offset from the start of the recording
+
+    Returns:
+        str: 'm:ss', or 'h:mm:ss' from one hour onwards
+    """
+    seconds = int(seconds)
+    hours, remainder = divmod(seconds, 3600)
+    minutes, seconds = divmod(remainder, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{seconds:02d}"
+    return f"{minutes}:{seconds:02d}"
+
+def parse_timestamp(timestamp):
+    """
+    Convert a transcript timestamp to whole seconds.
+
+    Args:
+        timestamp (str): 'm:ss', 'h:mm:ss' or a number of seconds; a
+            fractional part is dropped
+
+    Returns:
+        int: Offset from the start of the recording, or None if the
+            timestamp cannot be parsed or is not finite ('inf', 'nan')
+    """
+    seconds = 0
+    try:
+        for part in str(timestamp).strip().split(':'):
+            value = float(part)
+            if not math.isfinite(value):
+                return None
+            seconds = seconds * 60 + int(value)
+    except (ValueError, OverflowError):
+        return None
+    return seconds
+
+def _parse_cue_time(value):
+    """Convert a cue time such as '01:02:03.500' or '02:03,5' to seconds."""
+    seconds = 0.0
+    for part in value.replace(',', '.').split(':'):
+        seconds = seconds * 60 + float(part)
+    return seconds
+
+def _empty_metadata():
+    """Return the metadata structure produced by the PDF extractor."""
+    return {
+        'title': '',
+        'date': '',
+        'participants': []
+    }
+
+def _iter_caption_segments(file_path, metadata):
+    """Yield merged speaker segments from the cues of a caption file."""
+    speaker = None
+    segment = None
+
+    for start, cue_lines in _iter_cues(file_path):
+        text = ' '.join(cue_lines)
+
+        # Identify the speaker of the cue
+        voice_match = VOICE_TAG_PATTERN.search(text)
+        if voice_match:
+            cue_speaker = voice_match.group(1).strip()
+        else:
+            prefix_match = SPEAKER_PREFIX_PATTERN.match(TAG_PATTERN.sub('', text))
+            if prefix_match:
+                cue_speaker = prefix_match.group(1).strip()
+                text = prefix_match.group(2)
+            else:
+                cue_speaker = speaker or 'Unknown'
+
+        text = ' '.join(TAG_PATTERN.sub('', text).split())
+        if not text:
+            continue
+
+        if cue_speaker not in metadata['participants']:
+            metadata['participants'].append(cue_speaker)
+
+        # Extend the current segment while the speaker stays the same
+        if segment is not None and cue_speaker == speaker:
+            segment['text'] += ' ' + text
+            continue
+
+        if segment is not None:
+            yield segment
+        speaker = cue_speaker
+        segment = {
+            'speaker': cue_speaker,
+            'timestamp': format_timestamp(start),
+            'seconds': int(start),
+            'text': text
+        }
+
+    if segment is not None:
+        yield segment
+
+def _iter_cues(file_path):
+    """Yield (start_seconds, text_lines) for each cue of a WebVTT or SRT file."""
+    start = None
+    cue_lines = []
+
+    for line in iter_text_lines(file_path):
+        line = line.strip()
+        timing_match = CUE_TIMING_PATTERN.match(line)
+
+        if timing_match:
+            if start is not None and cue_lines:
+                yield start, cue_lines
+            start = _parse_cue_time(timing_match.group(1))
+            cue_lines = []
+        elif not line:
+            # A blank line ends the cue; SRT indices and VTT identifiers
+            # that follow are skipped until the next timing line
+            if start is not None and cue_lines:
+                yield start, cue_lines
+            start = None
+            cue_lines = []
+        elif start is not None:
+            cue_lines.append(line)
+
+    if start is not None and cue_lines:
+        yield start, cue_lines
+
+def _iter_json_segments(items):
+    """Yield segments from the entries of a JSON transcript."""
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            raise ValueError(f"JSON transcript segment {index} is not an object")
+
+        text = ' '.join(str(item.get('text') or '').split())
+        if not text:
+            continue
+
+        timestamp = item.get('timestamp')
+        seconds = None
+        if item.get('start') is not None:
+            try:
+                start = float(item['start'])
+            except (TypeError, ValueError):
+                start = math.nan
+            if not math.isfinite(start) or start < 0:
+                raise ValueError(f"JSON transcript segment {index} has an invalid start "
+                                 f"{item['start']!r}, expected a number of seconds")
+            seconds = int(start)
+            if timestamp is None:
+                timestamp = format_timestamp(seconds)
+        elif timestamp is not None:
+            seconds = parse_timestamp(timestamp)
+
+        yield {
+            'speaker': str(item.get('speaker') or 'Unknown').strip(),
+            'timestamp': str(timestamp) if timestamp is not None else '',
+            'seconds': seconds,
+            'text': text
+        }
+
+def _iter_json_lines(file_path, skip=0):
+    """Yield the value of each non-blank line of a JSON Lines file, after the first skip values."""
+    for line_number, line in enumerate(iter_text_lines(file_path), 1):
+        if not line.strip():
+            continue
+        if skip:
+            skip -= 1
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as e:
+            raise ValueError(f"Invalid JSON on line {line_number} of {file_path}: {str(e)}") from e
@@ -0,0 +1,259 @@
+"""
+Profiling Module
+----------------
+This module records where an analysis spends its time: the exclusive
+wall time of each pipeline stage and the cost of each pattern and
+keyword. The pipeline creates a Profiler per transcript when profiling
+is enabled and passes it to the extractor, matcher and report generator.
+"""
+
+import json
+import time
+import threading
+from contextlib import contextmanager, nullcontext
+
+# Stages in pipeline order; the summary lists them in this order
+STAGES = ('extract', 'segment', 'match', 'sentiment', 'aggregate', 'render', 'write',
+          'index', 'store')
+
+def stage(profiler, name):
+    """
+    Time a stage if there is a profiler.
+
+    Args:
+        profiler (Profiler): Profiler to record to, or None
+        name (str): Stage name
+
+    Returns:
+        A context manager timing the block, or doing nothing without a profiler
+    """
+    return profiler.stage(name) if profiler is not None else nullcontext()
+
+class Profiler:
+    """Per-stage timings and per-pattern and per-keyword counters of one analysis."""
+
+    def __init__(self):
+        """Start profiling."""
+        self.started = time.perf_counter()
+        self.stages = {}
+        # Counters per group of patterns scanned together, keyed by the
+        # registry and the registry indices of the group (None for all)
+        self._scans = {}
+        self._pattern_matches = {}
+        self._keyword_costs = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @contextmanager
+    def stage(self, name):
+        """
+        Time a block as a stage.
+
+        Stages nest: time spent in an inner stage (e.g. extracting the
+        next page while segmenting) is counted only for the inner one.
+        Each thread keeps its own nesting, so stages running on other
+        threads overlap rather than nest.
+
+        Args:
+            name (str): Stage name
+        """
+        stack = self._local.__dict__.setdefault('stack', [])
+        frame = [time.perf_counter(), 0.0]
+        stack.append(frame)
+        try:
+            yield
+        finally:
+            stack.pop()
+            elapsed = time.perf_counter() - frame[0]
+            if stack:
+                stack[-1][1] += elapsed
+            with self._lock:
+                self.stages[name] = self.stages.get(name, 0.0) + elapsed - frame[1]
+
+    def iterate(self, name, iterable):
+        """
+        Yield the items of an iterable, timing the production of each as a stage.
+
+        Args:
+            name (str): Stage name
+            iterable: Iterable to time, typically a generator
+
+        Yields:
+            The items of the iterable
+        """
+        iterator = iter(iterable)
+        while True:
+            with self.stage(name):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+
+    def record_scan(self, registry, pattern_indices, sentence_count, seconds, matches):
+        """
+        Record one engine scan of a segment.
+
+        Args:
+            registry (PatternRegistry): Registry the scanned patterns belong to
+            pattern_indices (list): Registry index of each pattern the engine
+                was compiled from, or None for the whole registry
+            sentence_count (int): Sentences in the segment
+            seconds (float): Time the scan took
+            matches (list): (pattern index, hits) tuples the scan returned,
+                with pattern indices in the engine's numbering
+        """
+        key = (registry, tuple(pattern_indices) if pattern_indices is not None else None)
+        counters = self._scans.get(key)
+        if counters is None:
+            counters = self._scans[key] = [0, 0, 0.0]
+        counters[0] += 1
+        counters[1] += sentence_count
+        counters[2] += seconds
+
+        pattern_matches = self._pattern_matches
+        for pattern_idx, hits in matches:
+            if pattern_indices is not None:
+                pattern_idx = pattern_indices[pattern_idx]
+            counts = pattern_matches.get((registry, pattern_idx))
+            if counts is None:
+                counts = pattern_matches[(registry, pattern_idx)] = [0, 0]
+            counts[0] += 1
+            counts[1] += len(hits)
+
+    def record_keyword_costs(self, registry, pattern_indices, costs):
+        """
+        Record the standalone cost of each keyword on one segment.
+
+        Args:
+            registry (PatternRegistry): Registry the scanned patterns belong to
+            pattern_indices (list): Registry index of each engine pattern, or None
+            costs (iterable): (owners, seconds, hits) per keyword, as returned
+                by PatternEngine.keyword_costs
+        """
+        keyword_costs = self._keyword_costs
+        for owners, seconds, hits in costs:
+            for pattern_idx, keyword_idx in owners:
+                if pattern_indices is not None:
+                    pattern_idx = pattern_indices[pattern_idx]
+                key = (registry, pattern_idx, keyword_idx)
+                counters = keyword_costs.get(key)
+                if counters is None:
+                    counters = keyword_costs[key] = [0.0, 0]
+                counters[0] += seconds
+                counters[1] += hits
+
+    def to_dict(self):
+        """
+        Return the profile as a JSON-serializable dictionary.
+
+        Returns:
+            dict: Total wall time, exclusive seconds per stage, scan totals,
+                and pattern and keyword counters, costliest first
+        """
+        stages = {name: round(self.stages[name], 6) for name in STAGES if name in self.stages}
+        stages.update((name, round(seconds, 6)) for name, seconds in self.stages.items()
+                      if name not in stages)
+
+        patterns = {}
+        scan_count = 0
+        scan_seconds = 0.0
+        for (registry, pattern_indices), (scans, sentences, seconds) in self._scans.items():
+            scan_count += scans
+            scan_seconds += seconds
+            for pattern_idx in pattern_indices if pattern_indices is not None else range(len(registry)):
+                entry = self._pattern_entry(patterns, registry, pattern_idx)
+                entry['segments_scanned'] += scans
+                entry['sentences_scanned'] += sentences
+        for (registry, pattern_idx), (matches, hits) in self._pattern_matches.items():
+            entry = self._pattern_entry(patterns, registry, pattern_idx)
+            entry['matches'] += matches
+            entry['hits'] += hits
+
+        keywords = []
+        for (registry, pattern_idx, keyword_idx), (seconds, hits) in self._keyword_costs.items():
+            pattern = registry[pattern_idx]
+            self._pattern_entry(patterns, registry, pattern_idx)['regex_seconds'] += seconds
+            keywords.append({
+                'pattern_id': pattern['id'],
+                'keyword': pattern['keywords'][keyword_idx],
+                'regex_seconds': round(seconds, 6),
+                'hits': hits
+            })
+        for entry in patterns.values():
+            entry['regex_seconds'] = round(entry['regex_seconds'], 6)
+
+        return {
+            'total_seconds': round(time.perf_counter() - self.started, 6),
+            'stages': stages,
+            'scan': {'segments': scan_count, 'seconds': round(scan_seconds, 6)},
+            'patterns': sorted(patterns.values(), key=lambda entry: (-entry['regex_seconds'], entry['id'])),
+            'keywords': sorted(keywords, key=lambda entry: -entry['regex_seconds'])
+        }
+
+    def write(self, path, **extra):
+        """
+        Write the profile as JSON.
+
+        Args:
+            path (str): File to write
+            **extra: Additional top-level entries, e.g. the transcript path
+
+        Returns:
+            dict: The profile written
+        """
+        profile = dict(extra, **self.to_dict())
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(profile, f, indent=2)
+        return profile
+
+    @staticmethod
+    def _pattern_entry(patterns, registry, pattern_idx):
+        pattern = registry[pattern_idx]
+        entry = patterns.get(pattern['id'])
+        if entry is None:
+            entry = patterns[pattern['id']] = {
+                'id': pattern['id'],
+                'name': pattern['name'],
+                'category': pattern['category'],
+                'segments_scanned': 0,
+                'sentences_scanned': 0,
+                'matches': 0,
+                'hits': 0,
+                'regex_seconds': 0.0
+            }
+        return entry
+
+def format_summary(profile, top=10):
+    """
+    Format a profile as a text summary table.
+
+    Args:
+        profile (dict): Profile as returned by Profiler.to_dict
+        top (int): Number of patterns and keywords to list
+
+    Returns:
+        str: The summary
+    """
+    total = profile['total_seconds'] or 1.0
+    lines = [f"{'stage':<12} {'seconds':>10} {'share':>7}"]
+    for name, seconds in profile['stages'].items():
+        lines.append(f"{name:<12} {seconds:>10.3f} {seconds / total:>7.1%}")
+    lines.append(f"{'total':<12} {profile['total_seconds']:>10.3f}")
+    lines.append(f"Engine scans: {profile['scan']['segments']} segments in {profile['scan']['seconds']:.3f} s")
+
+    if profile['patterns']:
+        width = max(len('pattern'), *(len(entry['id']) for entry in profile['patterns'][:top]))
+        lines.append('')
+        lines.append(f"{'pattern':<{width}} {'regex s':>9} {'matches':>8} {'hits':>7} {'sentences':>10}  name")
+        for entry in profile['patterns'][:top]:
+            lines.append(f"{entry['id']:<{width}} {entry['regex_seconds']:>9.3f} {entry['matches']:>8} "
+                         f"{entry['hits']:>7} {entry['sentences_scanned']:>10}  {entry['name']}")
+    if profile['keywords']:
+        width = max(len('pattern'), *(len(entry['pattern_id']) for entry in profile['keywords'][:top]))
+        lines.append('')
+        lines.append(f"{'pattern':<{width}} {'regex s':>9} {'hits':>7}  keyword")
+        for entry in profile['keywords'][:top]:
+            keyword = entry['keyword'] if len(entry['keyword']) <= 60 else entry['keyword'][:57] + '...'
+            lines.append(f"{entry['pattern_id']:<{width}} {entry['regex_seconds']:>9.3f} {entry['hits']:>7}  {keyword}")
+    return '\n'.join(lines)
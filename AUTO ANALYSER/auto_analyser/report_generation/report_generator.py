@@ -4,25 +4,60 @@ Report Generator Module
 This module generates HTML reports from transcript analysis results.
 """
 
+import io
 import os
 import sys
+import gzip
 import json
 import logging
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from jinja2 import Environment, FileSystemLoader
 
+# zstandard is only needed for zstd-compressed results
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
 # Import local modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import config
+import profiling
+from pattern_analysis.match_table import MatchTable, json_default
+from pdf_processing.transcript_loaders import format_timestamp
+
+# Suffix added to the results filename for each compression
+RESULTS_COMPRESSION = {None: '', 'gzip': '.gz', 'zstd': '.zst'}
+
+# Matches encoded per json.dumps call when writing compact results
+_RESULTS_BATCH_SIZE = 1000
 
 class ReportGenerator:
     """Class for generating HTML reports from analysis results."""
     
-    def __init__(self):
-        """Initialize the report generator."""
+    def __init__(self, compression=None):
+        """
+        Initialize the report generator.
+        
+        Args:
+            compression (str): Compression of the results JSON, None, 'gzip' or
+                'zstd' (default: config.REPORT_SETTINGS['results_compression'])
+            
+        Raises:
+            ValueError: If the compression is unknown or zstandard is not installed
+        """
         self.logger = logging.getLogger(__name__)
         
+        if compression is None:
+            compression = config.REPORT_SETTINGS['results_compression']
+        if compression not in RESULTS_COMPRESSION:
+            raise ValueError(f"Unknown results compression '{compression}'")
+        if compression == 'zstd' and zstandard is None:
+            raise ValueError("zstandard is required for zstd-compressed results (pip install zstandard)")
+        self.compression = compression
+        
         # Set up Jinja2 environment
         template_dir = os.path.join(
             os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
@@ -30,7 +65,8 @@ class ReportGenerator:
         )
         self.env = Environment(loader=FileSystemLoader(template_dir))
     
-    def generate_report(self, transcript_data, analysis_results, output_dir):
+    def generate_report(self, transcript_data, analysis_results, output_dir, mode=None,
+                        profiler=None):
         """
         Generate an HTML report from analysis results.
         
@@ -38,6 +74,11 @@ class ReportGenerator:
             transcript_data (dict): The transcript data
             analysis_results (dict): The analysis results
             output_dir (str): Directory to save the report
+            mode (str): 'single' for one self-contained page, 'sharded' for a
+                shell page that loads the transcript and pattern cards from
+                data shards on demand, or 'auto' to shard long transcripts
+                (default: config.REPORT_SETTINGS['mode'])
+            profiler (Profiler): Records the render and write stages, if given
             
         Returns:
             str: Path to the generated report
@@ -48,28 +89,113 @@ class ReportGenerator:
         os.makedirs(output_dir, exist_ok=True)
         
         # Copy static files (CSS, JS)
-        self._copy_static_files(output_dir)
+        with profiling.stage(profiler, 'render'):
+            self._copy_static_files(output_dir)
         
-        # Generate report data
-        report_data = self._prepare_report_data(transcript_data, analysis_results)
-        
-        # Render the template
-        template = self.env.get_template(config.REPORT_SETTINGS['main_template'])
-        html_content = template.render(**report_data)
-        
-        # Write the report to file
+        # Save the analysis results as JSON for reference, on a second
+        # thread while the report is built unless parallel writes are off
+        json_path = results_path(output_dir, self.compression)
         report_path = os.path.join(output_dir, config.REPORT_SETTINGS['report_filename'])
-        with open(report_path, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            if config.REPORT_SETTINGS['parallel_writes']:
+                results_written = executor.submit(
+                    self._write_results, analysis_results, json_path, profiler
+                )
+            else:
+                self._write_results(analysis_results, json_path, profiler)
+                results_written = None
+            
+            with profiling.stage(profiler, 'render'):
+                # Generate report data
+                if mode is None:
+                    mode = config.REPORT_SETTINGS['mode']
+                if mode == 'auto':
+                    shard_threshold = config.REPORT_SETTINGS['shard_threshold']
+                    mode = 'sharded' if len(transcript_data['segments']) > shard_threshold else 'single'
+                if mode == 'sharded':
+                    report_data = self._write_report_shards(transcript_data, analysis_results, output_dir)
+                    template_name = config.REPORT_SETTINGS['shell_template']
+                else:
+                    report_data = self._prepare_report_data(transcript_data, analysis_results)
+                    template_name = config.REPORT_SETTINGS['main_template']
+                
+                # Stream the rendered template to file rather than building the page in memory
+                template = self.env.get_template(template_name)
+                with open(report_path, 'w', encoding='utf-8') as f:
+                    template.stream(**report_data).dump(f)
+            
+            if results_written is not None:
+                results_written.result()
+        
+        # Remove results left in another compression by an earlier run
+        for suffix in RESULTS_COMPRESSION.values():
+            stale_path = results_path(output_dir) + suffix
+            if stale_path != json_path and os.path.exists(stale_path):
+                os.remove(stale_path)
         
-        # Save the analysis results as JSON for reference
-        json_path = os.path.join(output_dir, 'analysis_results.json')
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(analysis_results, f, indent=2)
+        # Remove the data shards of an earlier sharded report, which would
+        # otherwise keep the old transcript next to the new report
+        if mode != 'sharded':
+            self._remove_report_shards(output_dir)
         
         self.logger.info(f"Report generated: {report_path}")
         return report_path
     
+    def load_results(self, output_dir):
+        """
+        Load the analysis results saved by a previous generate_report().
+        
+        Args:
+            output_dir (str): Directory the report was saved to
+            
+        Returns:
+            dict: The saved analysis results, or None if there are none
+        """
+        json_path = find_results(output_dir)
+        if json_path is None:
+            return None
+        
+        try:
+            with open_results(json_path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError, EOFError) as e:
+            self.logger.warning(f"Could not load previous results from {json_path}: {str(e)}")
+            return None
+    
+    def _write_results(self, analysis_results, json_path, profiler=None):
+        """
+        Write the analysis results JSON.
+        
+        Unless REPORT_SETTINGS['results_indent'] is set, the JSON is compact
+        and the match list is encoded in batches, so neither the full list
+        of match dictionaries nor the whole document is held in memory.
+        
+        Args:
+            analysis_results (dict): The analysis results
+            json_path (str): Path to write, compressed according to its suffix
+            profiler (Profiler): Records the write stage, if given
+        """
+        indent = config.REPORT_SETTINGS['results_indent']
+        with profiling.stage(profiler, 'write'), open_results(json_path, 'w') as f:
+            if indent is not None:
+                json.dump(analysis_results, f, indent=indent, default=json_default)
+                return
+            
+            separators = (',', ':')
+            f.write('{')
+            for position, (key, value) in enumerate(analysis_results.items()):
+                f.write((',' if position else '') + json.dumps(key) + ':')
+                if not isinstance(value, (MatchTable, list)):
+                    f.write(json.dumps(value, separators=separators, default=json_default))
+                    continue
+                f.write('[')
+                for start in range(0, len(value), _RESULTS_BATCH_SIZE):
+                    batch = [value[row] for row in range(start, min(start + _RESULTS_BATCH_SIZE, len(value)))]
+                    f.write((',' if start else '') +
+                            json.dumps(batch, separators=separators, default=json_default)[1:-1])
+                f.write(']')
+            f.write('}')
+    
     def _copy_static_files(self, output_dir):
         """
         Copy static files (CSS, JS) to the output directory.
@@ -106,18 +232,15 @@ class ReportGenerator:
         Returns:
             dict: Data for the report template
         """
-        # Get metadata
-        metadata = transcript_data.get('metadata', {})
-        title = metadata.get('title', 'Transcript Analysis')
-        date = metadata.get('date', datetime.now().strftime('%Y-%m-%d'))
-        participants = metadata.get('participants', [])
+        # Expand the matches once for the template
+        patterns_found = list(analysis_results['patterns_found'])
         
         # Get patterns by category
         patterns_by_category = {}
         for category in config.PATTERN_CATEGORIES:
             patterns_by_category[category] = []
         
-        for pattern in analysis_results['patterns_found']:
+        for pattern in patterns_found:
             category = pattern['category']
             patterns_by_category[category].append(pattern)
         
@@ -131,28 +254,274 @@ class ReportGenerator:
         
         # Get top patterns (highest evidence level)
         top_patterns = sorted(
-            analysis_results['patterns_found'],
+            patterns_found,
             key=lambda x: x['evidence_level'],
             reverse=True
         )[:5]
         
-        # Get speaker statistics
-        speakers = analysis_results['speakers']
-        
         # Prepare data for the template
-        report_data = {
-            'title': title,
-            'date': date,
-            'participants': participants,
-            'analysis_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            'overall_analysis': analysis_results['overall_analysis'],
+        report_data = self._common_report_data(transcript_data, analysis_results)
+        report_data.update({
+            'pattern_total': len(patterns_found),
             'patterns_by_category': patterns_by_category,
             'top_patterns': top_patterns,
-            'speakers': speakers,
-            'categories': config.PATTERN_CATEGORIES,
             'evidence_levels': config.EVIDENCE_LEVELS,
             'frameworks': config.EXPERT_FRAMEWORKS,
             'transcript_segments': transcript_data['segments']
+        })
+        
+        return report_data
+    
+    def _common_report_data(self, transcript_data, analysis_results):
+        """
+        Prepare the header, summary and participant data shared by both report modes.
+        
+        Args:
+            transcript_data (dict): The transcript data
+            analysis_results (dict): The analysis results
+            
+        Returns:
+            dict: Data for the report template
+        """
+        metadata = transcript_data.get('metadata', {})
+        return {
+            'title': metadata.get('title', 'Transcript Analysis'),
+            'date': metadata.get('date', datetime.now().strftime('%Y-%m-%d')),
+            'participants': metadata.get('participants', []),
+            'analysis_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'overall_analysis': analysis_results['overall_analysis'],
+            'speakers': analysis_results['speakers'],
+            'sentiment_enabled': analysis_results.get('sentiment_enabled', True),
+            'categories': config.PATTERN_CATEGORIES,
+            'selection': _describe_selection(analysis_results.get('selection'))
         }
+    
+    def _write_report_shards(self, transcript_data, analysis_results, output_dir):
+        """
+        Write the transcript and pattern cards as data shards for the shell page.
+        
+        Segment text is written once, to the segment shards. Pattern cards
+        refer to their segment by index and to their matches and contexts by
+        character offsets into its text.
         
+        Args:
+            transcript_data (dict): The transcript data
+            analysis_results (dict): The analysis results
+            output_dir (str): Directory the report is written to
+            
+        Returns:
+            dict: Data for the shell template
+        """
+        settings = config.REPORT_SETTINGS
+        data_dir = os.path.join(output_dir, settings['shard_dir'])
+        self._remove_report_shards(output_dir)
+        os.makedirs(data_dir, exist_ok=True)
+        
+        # Segment rows: [speaker index, timestamp, text]
+        segments = transcript_data['segments']
+        speakers = {}
+        segment_rows = [
+            [speakers.setdefault(segment['speaker'], len(speakers)), segment['timestamp'], segment['text']]
+            for segment in segments
+        ]
+        segment_shards = self._write_shards(
+            data_dir, 'segments', segment_rows, settings['segment_shard_size']
+        )
+        
+        # Card rows: [pattern index, segment index, evidence level, confidence,
+        # [[start, end, context start, context end], ...]]
+        pattern_indices = {}
+        patterns = []
+        cards = {category: [] for category in config.PATTERN_CATEGORIES}
+        for pattern, segment_index, evidence_level, confidence, hits in _report_cards(
+                analysis_results['patterns_found'], segments):
+            if pattern['id'] not in pattern_indices:
+                pattern_indices[pattern['id']] = len(patterns)
+                patterns.append({
+                    'id': pattern['id'],
+                    'name': pattern['name'],
+                    'description': pattern['description'],
+                    'frameworks': list(pattern['frameworks'])
+                })
+            cards.setdefault(pattern['category'], []).append(
+                [pattern_indices[pattern['id']], segment_index, evidence_level,
+                 round(confidence, 4), hits]
+            )
+        
+        card_shards = {}
+        for category, rows in cards.items():
+            # Highest evidence first, as in the single-page report
+            rows.sort(key=lambda row: row[2], reverse=True)
+            card_shards[category] = self._write_shards(
+                data_dir, f"patterns-{category}", rows, settings['card_shard_size']
+            )
+        
+        report_data = self._common_report_data(transcript_data, analysis_results)
+        report_data.update({
+            'pattern_total': sum(len(rows) for rows in cards.values()),
+            'card_counts': {category: len(rows) for category, rows in cards.items()},
+            'card_shards': card_shards,
+            'segment_shards': segment_shards,
+            'report_index': {
+                'data_dir': settings['shard_dir'],
+                'segment_count': len(segments),
+                'segment_shard_size': settings['segment_shard_size'],
+                'card_shard_size': settings['card_shard_size'],
+                'speakers': list(speakers),
+                'patterns': patterns,
+                'categories': {
+                    category: info['name'] for category, info in config.PATTERN_CATEGORIES.items()
+                },
+                'frameworks': config.EXPERT_FRAMEWORKS,
+                'evidence_levels': config.EVIDENCE_LEVELS
+            }
+        })
         return report_data
+    
+    def _remove_report_shards(self, output_dir):
+        """Remove the data shards of a sharded report, and their directory once empty."""
+        data_dir = os.path.join(output_dir, config.REPORT_SETTINGS['shard_dir'])
+        if not os.path.isdir(data_dir):
+            return
+        for name in os.listdir(data_dir):
+            if name.endswith('.js'):
+                os.remove(os.path.join(data_dir, name))
+        try:
+            os.rmdir(data_dir)
+        except OSError:
+            # Keep files the report generator did not write
+            pass
+    
+    def _write_shards(self, data_dir, name, rows, shard_size):
+        """
+        Write rows as JSONP shards that the report script loads with script tags.
+        
+        Script tags, unlike fetch(), also work when the report is opened
+        from the file system.
+        
+        Args:
+            data_dir (str): Directory to write the shards to
+            name (str): Shard name prefix
+            rows (list): Rows to write
+            shard_size (int): Rows per shard
+            
+        Returns:
+            list: Number of rows in each shard
+        """
+        counts = []
+        for first in range(0, len(rows), shard_size):
+            shard_name = f"{name}-{len(counts)}"
+            shard = rows[first:first + shard_size]
+            with open(os.path.join(data_dir, f"{shard_name}.js"), 'w', encoding='utf-8') as f:
+                f.write(f"reportShard({json.dumps(shard_name)}, ")
+                json.dump(shard, f, separators=(',', ':'))
+                f.write(');\n')
+            counts.append(len(shard))
+        return counts
+
+def results_path(output_dir, compression=None):
+    """
+    Return the path of the results JSON in an output directory.
+    
+    Args:
+        output_dir (str): Directory the report is saved to
+        compression (str): None, 'gzip' or 'zstd'
+        
+    Returns:
+        str: Path to the results file
+    """
+    filename = config.REPORT_SETTINGS['results_filename'] + RESULTS_COMPRESSION[compression]
+    return os.path.join(output_dir, filename)
+
+def find_results(output_dir):
+    """
+    Find the results JSON of an output directory, in whichever compression it was written.
+    
+    Args:
+        output_dir (str): Directory the report was saved to
+        
+    Returns:
+        str: Path to the results file, or None if there is none
+    """
+    for compression in RESULTS_COMPRESSION:
+        json_path = results_path(output_dir, compression)
+        if os.path.exists(json_path):
+            return json_path
+    return None
+
+def open_results(path, mode='r'):
+    """
+    Open a results JSON file as text, decompressing by its suffix.
+    
+    Args:
+        path (str): Path ending in .json, .json.gz or .json.zst
+        mode (str): 'r' or 'w'
+        
+    Returns:
+        A text file object
+    """
+    if path.endswith(RESULTS_COMPRESSION['gzip']):
+        return gzip.open(path, mode + 't', encoding='utf-8', compresslevel=6)
+    if path.endswith(RESULTS_COMPRESSION['zstd']):
+        if zstandard is None:
+            raise OSError(f"zstandard is required to read {path} (pip install zstandard)")
+        raw = open(path, mode + 'b')
+        if mode == 'w':
+            stream = zstandard.ZstdCompressor().stream_writer(raw, closefd=True)
+        else:
+            stream = zstandard.ZstdDecompressor().stream_reader(raw, closefd=True)
+        return io.TextIOWrapper(stream, encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+def _report_cards(patterns_found, segments):
+    """
+    Yield (pattern, segment index, evidence level, confidence, hits) of each match.
+    
+    Hits are [start, end, context start, context end] offsets into the
+    segment text. A MatchTable is read without expanding its matches; for
+    match dictionaries the context is located in the segment text.
+    """
+    if isinstance(patterns_found, MatchTable):
+        registry = patterns_found.registry
+        for row in range(len(patterns_found)):
+            hits = [
+                [patterns_found.start[hit], patterns_found.end[hit],
+                 patterns_found.context_start[hit], patterns_found.context_end[hit]]
+                for hit in range(patterns_found.hit_offset[row], patterns_found.hit_offset[row + 1])
+            ]
+            yield (registry[patterns_found.pattern_index[row]], patterns_found.segment_index[row],
+                   patterns_found.evidence_level[row], patterns_found.confidence(row), hits)
+        return
+    
+    for match in patterns_found:
+        text = segments[match['segment_index']]['text']
+        hits = []
+        for keyword_match in match['keyword_matches']:
+            context_start = text.find(keyword_match['context'])
+            if context_start < 0:
+                context_start, context_end = keyword_match['start'], keyword_match['end']
+            else:
+                context_end = context_start + len(keyword_match['context'])
+            hits.append([keyword_match['start'], keyword_match['end'], context_start, context_end])
+        pattern = {
+            'id': match['pattern_id'],
+            'name': match['pattern_name'],
+            'category': match['category'],
+            'description': match['description'],
+            'frameworks': match['frameworks']
+        }
+        yield pattern, match['segment_index'], match['evidence_level'], match['confidence'], hits
+
+def _describe_selection(selection):
+    """Describe the time window and speakers of a partial analysis, or return None."""
+    if not selection:
+        return None
+    parts = []
+    if selection.get('start') is not None or selection.get('end') is not None:
+        start = format_timestamp(selection['start']) if selection.get('start') is not None else 'start'
+        end = format_timestamp(selection['end']) if selection.get('end') is not None else 'end'
+        parts.append(f"{start} to {end}")
+    if selection.get('speakers'):
+        parts.append(', '.join(selection['speakers']))
+    parts.append(f"{selection['segments']} of {selection['total_segments']} segments")
+    return '; '.join(parts)
@@ -0,0 +1,295 @@
+"""
+Pattern Index Module
+-------------------
+This module keeps an on-disk inverted index of pattern matches across
+transcripts, built from the patterns_found and metadata of each
+analysis, so matches can be looked up by pattern, category, speaker,
+keyword and date without re-reading every results file.
+"""
+
+import os
+import sys
+import sqlite3
+import logging
+import threading
+from datetime import datetime
+
+# Import configuration
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import config
+
+# Bump when the schema changes; older indexes are rebuilt from scratch
+INDEX_FORMAT_VERSION = 1
+
+# Fields with postings; a trailing '*' in a query term matches by prefix
+INDEX_FIELDS = ('pattern', 'category', 'speaker', 'keyword')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS transcripts (
+    id INTEGER PRIMARY KEY,
+    results_dir TEXT NOT NULL UNIQUE,
+    source TEXT,
+    title TEXT,
+    date TEXT,
+    indexed TEXT
+);
+CREATE INDEX IF NOT EXISTS transcripts_date ON transcripts (date);
+CREATE TABLE IF NOT EXISTS segments (
+    transcript_id INTEGER NOT NULL,
+    segment_index INTEGER NOT NULL,
+    speaker TEXT,
+    timestamp TEXT,
+    text TEXT,
+    PRIMARY KEY (transcript_id, segment_index)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS matches (
+    id INTEGER PRIMARY KEY,
+    transcript_id INTEGER NOT NULL,
+    segment_index INTEGER NOT NULL,
+    pattern_id TEXT NOT NULL,
+    pattern_name TEXT,
+    category TEXT,
+    confidence REAL,
+    evidence_level INTEGER
+);
+CREATE INDEX IF NOT EXISTS matches_transcript ON matches (transcript_id);
+CREATE TABLE IF NOT EXISTS postings (
+    field TEXT NOT NULL,
+    term TEXT NOT NULL,
+    match_id INTEGER NOT NULL,
+    PRIMARY KEY (field, term, match_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS postings_match ON postings (match_id);
+"""
+
+def parse_date(value):
+    """
+    Convert a transcript date to ISO format.
+
+    Args:
+        value (str): Date in one of config.INDEX_SETTINGS['date_formats']
+
+    Returns:
+        str: The date as YYYY-MM-DD, or None if it is empty or not recognized
+    """
+    value = (value or '').strip()
+    for date_format in config.INDEX_SETTINGS['date_formats']:
+        try:
+            return datetime.strptime(value, date_format).date().isoformat()
+        except ValueError:
+            continue
+    return None
+
+class PatternIndex:
+    """SQLite-backed inverted index of pattern matches across transcripts."""
+
+    def __init__(self, path):
+        """
+        Open or create an index.
+
+        Args:
+            path (str): Path to the index database
+        """
+        self.logger = logging.getLogger(__name__)
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        # The connection is shared by the threads of a pipeline; the lock
+        # serializes them
+        self._lock = threading.Lock()
+        self.connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self._create_schema()
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self.connection.close()
+
+    def add(self, results_dir, transcript_data, analysis_results, source=None):
+        """
+        Index the matches of one analysis, replacing any earlier entry.
+
+        Args:
+            results_dir (str): Directory the analysis was written to; it
+                identifies the transcript in the index
+            transcript_data (dict): The transcript data (its metadata is indexed)
+            analysis_results (dict): The analysis results
+            source (str): Path of the analyzed transcript file
+        """
+        metadata = transcript_data.get('metadata', {})
+        results_dir = os.path.abspath(results_dir)
+
+        segments = {}
+        matches = []
+        postings = []
+        for match in analysis_results['patterns_found']:
+            segment_index = match['segment_index']
+            segments[segment_index] = (match['speaker'], match['timestamp'], match['text'])
+            terms = {
+                ('pattern', match['pattern_id']),
+                ('category', match['category']),
+                ('speaker', match['speaker'].strip().lower())
+            }
+            terms.update(
+                ('keyword', keyword_match['match_text'].strip().lower())
+                for keyword_match in match['keyword_matches']
+            )
+            matches.append((segment_index, match['pattern_id'], match['pattern_name'],
+                            match['category'], match['confidence'], match['evidence_level']))
+            postings.append(terms)
+
+        with self._lock, self.connection:
+            cursor = self.connection.cursor()
+            self._delete(cursor, results_dir)
+            cursor.execute(
+                'INSERT INTO transcripts (results_dir, source, title, date, indexed) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (results_dir, source, metadata.get('title', ''), parse_date(metadata.get('date')),
+                 datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+            )
+            transcript_id = cursor.lastrowid
+            cursor.executemany(
+                'INSERT INTO segments VALUES (?, ?, ?, ?, ?)',
+                [(transcript_id, index) + segment for index, segment in segments.items()]
+            )
+            for match, terms in zip(matches, postings):
+                cursor.execute(
+                    'INSERT INTO matches (transcript_id, segment_index, pattern_id, pattern_name, '
+                    'category, confidence, evidence_level) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                    (transcript_id,) + match
+                )
+                match_id = cursor.lastrowid
+                cursor.executemany(
+                    'INSERT INTO postings VALUES (?, ?, ?)',
+                    [(field, term, match_id) for field, term in terms]
+                )
+        self.logger.info(f"Indexed {len(matches)} matches from {results_dir}")
+
+    def remove(self, results_dir):
+        """Remove a transcript and its matches from the index."""
+        with self._lock, self.connection:
+            self._delete(self.connection.cursor(), os.path.abspath(results_dir))
+
+    def search(self, pattern=None, category=None, speaker=None, keyword=None,
+               date_from=None, date_to=None, limit=100):
+        """
+        Find indexed matches.
+
+        Every given criterion must hold. pattern, category, speaker and
+        keyword take a term or a list of alternative terms; a term ending
+        in '*' matches by prefix (e.g. 'cc_*'). Speakers and keywords are
+        matched case-insensitively.
+
+        Args:
+            pattern: Pattern id(s)
+            category: Category key(s)
+            speaker: Speaker name(s)
+            keyword: Matched keyword text(s)
+            date_from (str): Earliest transcript date, inclusive
+            date_to (str): Latest transcript date, inclusive
+            limit (int): Maximum number of matches to return (None for all)
+
+        Returns:
+            list: Match dictionaries with the transcript, segment and pattern
+                of each match, ordered by transcript date and segment
+        """
+        conditions = []
+        parameters = []
+        for field, terms in zip(INDEX_FIELDS, (pattern, category, speaker, keyword)):
+            if terms is None:
+                continue
+            if isinstance(terms, str):
+                terms = [terms]
+            alternatives = []
+            parameters.append(field)
+            for term in terms:
+                if field in ('speaker', 'keyword'):
+                    term = term.strip().lower()
+                if term.endswith('*'):
+                    alternatives.append('term GLOB ?')
+                    parameters.append(_glob_escape(term[:-1]) + '*')
+                else:
+                    alternatives.append('term = ?')
+                    parameters.append(term)
+            conditions.append(
+                'm.id IN (SELECT match_id FROM postings WHERE field = ? AND (' +
+                ' OR '.join(alternatives) + '))'
+            )
+
+        for operator, value in (('>=', date_from), ('<=', date_to)):
+            if value:
+                date = parse_date(value)
+                if date is None:
+                    raise ValueError(f"Unrecognized date '{value}'")
+                conditions.append(f"t.date {operator} ?")
+                parameters.append(date)
+
+        query = (
+            'SELECT t.results_dir, t.source, t.title, t.date, m.segment_index, s.speaker, '
+            's.timestamp, s.text, m.pattern_id, m.pattern_name, m.category, m.confidence, '
+            'm.evidence_level '
+            'FROM matches m JOIN transcripts t ON t.id = m.transcript_id '
+            'JOIN segments s ON s.transcript_id = m.transcript_id AND s.segment_index = m.segment_index'
+        )
+        if conditions:
+            query += ' WHERE ' + ' AND '.join(conditions)
+        query += ' ORDER BY t.date, t.id, m.segment_index, m.id'
+        if limit is not None:
+            query += ' LIMIT ?'
+            parameters.append(limit)
+
+        columns = ('results_dir', 'source', 'title', 'date', 'segment_index', 'speaker',
+                   'timestamp', 'text', 'pattern_id', 'pattern_name', 'category',
+                   'confidence', 'evidence_level')
+        with self._lock:
+            rows = self.connection.execute(query, parameters).fetchall()
+        return [dict(zip(columns, row)) for row in rows]
+
+    def terms(self, field):
+        """
+        Return the indexed terms of a field with their match counts.
+
+        Args:
+            field (str): One of INDEX_FIELDS
+
+        Returns:
+            list: (term, match count) tuples, most frequent first
+        """
+        with self._lock:
+            return self.connection.execute(
+                'SELECT term, COUNT(*) FROM postings WHERE field = ? '
+                'GROUP BY term ORDER BY COUNT(*) DESC, term',
+                (field,)
+            ).fetchall()
+
+    def _create_schema(self):
+        """Create the tables, rebuilding an index written by another format version."""
+        with self._lock, self.connection:
+            version = self.connection.execute('PRAGMA user_version').fetchone()[0]
+            if version not in (0, INDEX_FORMAT_VERSION):
+                self.logger.warning(f"Rebuilding pattern index {self.path} (format {version})")
+                for table in ('postings', 'matches', 'segments', 'transcripts'):
+                    self.connection.execute(f"DROP TABLE IF EXISTS {table}")
+            self.connection.executescript(_SCHEMA)
+            self.connection.execute(f"PRAGMA user_version = {INDEX_FORMAT_VERSION}")
+
+    def _delete(self, cursor, results_dir):
+        """Delete a transcript's rows. Called inside a transaction."""
+        row = cursor.execute(
+            'SELECT id FROM transcripts WHERE results_dir = ?', (results_dir,)
+        ).fetchone()
+        if row is None:
+            return
+        transcript_id = row[0]
+        cursor.execute(
+            'DELETE FROM postings WHERE match_id IN '
+            '(SELECT id FROM matches WHERE transcript_id = ?)', (transcript_id,)
+        )
+        cursor.execute('DELETE FROM matches WHERE transcript_id = ?', (transcript_id,))
+        cursor.execute('DELETE FROM segments WHERE transcript_id = ?', (transcript_id,))
+        cursor.execute('DELETE FROM transcripts WHERE id = ?', (transcript_id,))
+
+def _glob_escape(text):
+    """Escape GLOB wildcards so text matches literally."""
+    return ''.join(f"[{char}]" if char in '*?[' else char for char in text)
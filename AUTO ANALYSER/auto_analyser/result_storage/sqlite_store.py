@@ -0,0 +1,340 @@
+"""
+SQLite Store Module
+------------------
+This module stores analysis results in a SQLite database, one row per
+transcript, segment, pattern match, keyword match and speaker, so that
+corpus-level counts and cross-meeting comparisons are SQL aggregations
+rather than a pass over every results file.
+"""
+
+import os
+import sys
+import sqlite3
+import logging
+import threading
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pattern_analysis.match_table import MatchTable
+from result_storage.pattern_index import parse_date
+
+# Bump when the schema changes; older stores are rebuilt from scratch
+STORE_FORMAT_VERSION = 1
+
+_TABLES = ('keyword_matches', 'matches', 'speaker_stats', 'segments', 'transcripts')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS transcripts (
+    id INTEGER PRIMARY KEY,
+    results_dir TEXT NOT NULL UNIQUE,
+    source TEXT,
+    title TEXT,
+    date TEXT,
+    analyzed TEXT,
+    total_segments INTEGER,
+    patterns_found INTEGER,
+    dominant_category TEXT,
+    dominant_speaker TEXT
+);
+CREATE INDEX IF NOT EXISTS transcripts_date ON transcripts (date);
+CREATE TABLE IF NOT EXISTS segments (
+    transcript_id INTEGER NOT NULL,
+    segment_index INTEGER NOT NULL,
+    speaker TEXT,
+    timestamp TEXT,
+    text TEXT,
+    PRIMARY KEY (transcript_id, segment_index)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS matches (
+    transcript_id INTEGER NOT NULL,
+    match_index INTEGER NOT NULL,
+    segment_index INTEGER NOT NULL,
+    pattern_id TEXT NOT NULL,
+    category TEXT NOT NULL,
+    speaker TEXT,
+    confidence REAL,
+    evidence_level INTEGER,
+    PRIMARY KEY (transcript_id, match_index)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS matches_category ON matches (category, transcript_id);
+CREATE INDEX IF NOT EXISTS matches_pattern ON matches (pattern_id, transcript_id);
+CREATE INDEX IF NOT EXISTS matches_speaker ON matches (transcript_id, speaker, pattern_id);
+CREATE TABLE IF NOT EXISTS keyword_matches (
+    transcript_id INTEGER NOT NULL,
+    match_index INTEGER NOT NULL,
+    hit_index INTEGER NOT NULL,
+    keyword TEXT,
+    start INTEGER,
+    end INTEGER,
+    sentence_idx INTEGER,
+    PRIMARY KEY (transcript_id, match_index, hit_index)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS speaker_stats (
+    transcript_id INTEGER NOT NULL,
+    speaker TEXT NOT NULL,
+    segment_count INTEGER,
+    word_count INTEGER,
+    negative REAL,
+    neutral REAL,
+    positive REAL,
+    compound REAL,
+    PRIMARY KEY (transcript_id, speaker)
+) WITHOUT ROWID;
+"""
+
+class SQLiteResultStore:
+    """Analysis results of many transcripts in one SQLite database."""
+
+    def __init__(self, path):
+        """
+        Open or create a results store.
+
+        Args:
+            path (str): Path to the database
+        """
+        self.logger = logging.getLogger(__name__)
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # The connection is shared by the threads of a pipeline; the lock
+        # serializes them
+        self._lock = threading.Lock()
+        self.connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self._create_schema()
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self.connection.close()
+
+    def save(self, results_dir, transcript_data, analysis_results, source=None):
+        """
+        Store the results of one analysis, replacing any earlier ones.
+
+        Args:
+            results_dir (str): Directory the analysis was written to; it
+                identifies the transcript in the store
+            transcript_data (dict): The transcript data
+            analysis_results (dict): The analysis results
+            source (str): Path of the analyzed transcript file
+
+        Returns:
+            int: Id of the transcript in the store
+        """
+        metadata = transcript_data.get('metadata', {})
+        overall = analysis_results['overall_analysis']
+        patterns_found = analysis_results['patterns_found']
+        results_dir = os.path.abspath(results_dir)
+
+        with self._lock, self.connection:
+            cursor = self.connection.cursor()
+            self._delete(cursor, results_dir)
+            cursor.execute(
+                'INSERT INTO transcripts (results_dir, source, title, date, analyzed, '
+                'total_segments, patterns_found, dominant_category, dominant_speaker) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (results_dir, source, metadata.get('title', ''), parse_date(metadata.get('date')),
+                 datetime.now().strftime('%Y-%m-%d %H:%M:%S'), overall['total_segments'],
+                 len(patterns_found), overall.get('dominant_category'),
+                 overall.get('dominant_speaker'))
+            )
+            transcript_id = cursor.lastrowid
+
+            cursor.executemany(
+                'INSERT INTO segments VALUES (?, ?, ?, ?, ?)',
+                ((transcript_id, index, segment['speaker'], segment['timestamp'], segment['text'])
+                 for index, segment in enumerate(transcript_data['segments']))
+            )
+
+            matches, hits = _match_rows(transcript_id, patterns_found, transcript_data['segments'])
+            cursor.executemany('INSERT INTO matches VALUES (?, ?, ?, ?, ?, ?, ?, ?)', matches)
+            cursor.executemany('INSERT INTO keyword_matches VALUES (?, ?, ?, ?, ?, ?, ?)', hits)
+
+            cursor.executemany(
+                'INSERT INTO speaker_stats VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                ((transcript_id, speaker, stats['segment_count'], stats['word_count'],
+                  stats['sentiment']['negative'], stats['sentiment']['neutral'],
+                  stats['sentiment']['positive'], stats['sentiment']['compound'])
+                 for speaker, stats in analysis_results['speakers'].items())
+            )
+
+        self.logger.info(f"Stored results of {results_dir} ({len(matches)} matches)")
+        return transcript_id
+
+    def remove(self, results_dir):
+        """Remove the results of a transcript."""
+        with self._lock, self.connection:
+            self._delete(self.connection.cursor(), os.path.abspath(results_dir))
+
+    def corpus_totals(self, results_dirs=None):
+        """
+        Aggregate segment, match, category and pattern counts over transcripts.
+
+        Args:
+            results_dirs (list): Results directories to include (default: all)
+
+        Returns:
+            dict: 'transcripts', 'segments' and 'patterns_found' totals, and
+                'category_counts' and 'pattern_counts' ordered by count
+        """
+        with self._lock, self.connection:
+            selection = self._select(results_dirs)
+            transcripts, segments, patterns_found = self.connection.execute(
+                'SELECT COUNT(*), COALESCE(SUM(total_segments), 0), '
+                f"COALESCE(SUM(patterns_found), 0) FROM transcripts WHERE {selection}"
+            ).fetchone()
+            counts = {}
+            for column in ('category', 'pattern_id'):
+                counts[column] = dict(self.connection.execute(
+                    f"SELECT {column}, COUNT(*) FROM matches WHERE transcript_id IN "
+                    f"(SELECT id FROM transcripts WHERE {selection}) "
+                    f"GROUP BY {column} ORDER BY COUNT(*) DESC, {column}"
+                ).fetchall())
+
+        return {
+            'transcripts': transcripts,
+            'segments': segments,
+            'patterns_found': patterns_found,
+            'category_counts': counts['category'],
+            'pattern_counts': counts['pattern_id']
+        }
+
+    def compare(self, category=None, pattern_id=None, speaker=None):
+        """
+        Count matches per transcript, for comparing meetings.
+
+        Args:
+            category (str): Only count matches of this category
+            pattern_id (str): Only count matches of this pattern
+            speaker (str): Only count matches in this speaker's segments
+
+        Returns:
+            list: Dictionaries with the results_dir, title, date, segment
+                count and match count of every transcript, in date order
+        """
+        conditions = []
+        parameters = []
+        for column, value in (('category', category), ('pattern_id', pattern_id),
+                              ('speaker', speaker)):
+            if value is not None:
+                conditions.append(f"m.{column} = ?")
+                parameters.append(value)
+        join_condition = ''.join(f" AND {condition}" for condition in conditions)
+
+        with self._lock:
+            rows = self.connection.execute(
+                'SELECT t.results_dir, t.title, t.date, t.total_segments, COUNT(m.match_index) '
+                'FROM transcripts t LEFT JOIN matches m ON m.transcript_id = t.id' + join_condition +
+                ' GROUP BY t.id ORDER BY t.date, t.id',
+                parameters
+            ).fetchall()
+        columns = ('results_dir', 'title', 'date', 'segments', 'matches')
+        return [dict(zip(columns, row)) for row in rows]
+
+    def speaker_pattern_counts(self, results_dir):
+        """
+        Count the matches of each pattern per speaker in one transcript.
+
+        Args:
+            results_dir (str): Results directory of the transcript
+
+        Returns:
+            dict: Speaker to a dictionary of pattern id to match count
+        """
+        with self._lock:
+            rows = self.connection.execute(
+                'SELECT m.speaker, m.pattern_id, COUNT(*) FROM matches m '
+                'JOIN transcripts t ON t.id = m.transcript_id WHERE t.results_dir = ? '
+                'GROUP BY m.speaker, m.pattern_id',
+                (os.path.abspath(results_dir),)
+            ).fetchall()
+        counts = {}
+        for speaker, pattern_id, count in rows:
+            counts.setdefault(speaker, {})[pattern_id] = count
+        return counts
+
+    def _select(self, results_dirs):
+        """
+        Return a transcripts condition limited to results_dirs.
+
+        Called inside a transaction; the directories are staged in a
+        temporary table rather than bound as one parameter each.
+        """
+        if results_dirs is None:
+            return '1'
+        self.connection.execute(
+            'CREATE TEMP TABLE IF NOT EXISTS selected (results_dir TEXT PRIMARY KEY)'
+        )
+        self.connection.execute('DELETE FROM selected')
+        self.connection.executemany(
+            'INSERT OR IGNORE INTO selected VALUES (?)',
+            ((os.path.abspath(results_dir),) for results_dir in results_dirs)
+        )
+        return 'results_dir IN (SELECT results_dir FROM selected)'
+
+    def _create_schema(self):
+        """Create the tables, rebuilding a store written by another format version."""
+        with self._lock, self.connection:
+            version = self.connection.execute('PRAGMA user_version').fetchone()[0]
+            if version not in (0, STORE_FORMAT_VERSION):
+                self.logger.warning(f"Rebuilding results store {self.path} (format {version})")
+                for table in _TABLES:
+                    self.connection.execute(f"DROP TABLE IF EXISTS {table}")
+            self.connection.executescript(_SCHEMA)
+            self.connection.execute(f"PRAGMA user_version = {STORE_FORMAT_VERSION}")
+
+    def _delete(self, cursor, results_dir):
+        """Delete a transcript's rows. Called inside a transaction."""
+        row = cursor.execute(
+            'SELECT id FROM transcripts WHERE results_dir = ?', (results_dir,)
+        ).fetchone()
+        if row is None:
+            return
+        for table in _TABLES[:-1]:
+            cursor.execute(f"DELETE FROM {table} WHERE transcript_id = ?", (row[0],))
+        cursor.execute('DELETE FROM transcripts WHERE id = ?', (row[0],))
+
+def _match_rows(transcript_id, patterns_found, segments):
+    """
+    Build the matches and keyword_matches rows of an analysis.
+
+    A MatchTable is read column by column without expanding its matches;
+    a list of match dictionaries (as loaded from JSON) is read as is.
+
+    Returns:
+        tuple: (match rows, keyword match rows)
+    """
+    matches = []
+    hits = []
+    if isinstance(patterns_found, MatchTable):
+        registry = patterns_found.registry
+        for row in range(len(patterns_found)):
+            pattern = registry[patterns_found.pattern_index[row]]
+            segment_index = patterns_found.segment_index[row]
+            matches.append((
+                transcript_id, row, segment_index, pattern.id, pattern.category,
+                segments[segment_index]['speaker'], patterns_found.confidence(row),
+                patterns_found.evidence_level[row]
+            ))
+            for hit_index, hit in enumerate(range(patterns_found.hit_offset[row],
+                                                  patterns_found.hit_offset[row + 1])):
+                hits.append((
+                    transcript_id, row, hit_index,
+                    pattern.keywords[patterns_found.keyword_index[hit]],
+                    patterns_found.start[hit], patterns_found.end[hit],
+                    patterns_found.sentence_index[hit]
+                ))
+        return matches, hits
+
+    for row, match in enumerate(patterns_found):
+        matches.append((
+            transcript_id, row, match['segment_index'], match['pattern_id'], match['category'],
+            match['speaker'], match['confidence'], match['evidence_level']
+        ))
+        for hit_index, keyword_match in enumerate(match['keyword_matches']):
+            hits.append((
+                transcript_id, row, hit_index, keyword_match['keyword'],
+                keyword_match['start'], keyword_match['end'], keyword_match['sentence_idx']
+            ))
+    return matches, hits
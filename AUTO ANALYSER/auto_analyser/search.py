@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Pattern Search
+--------------
+Query the pattern index that main.py builds in its output directory.
+
+Usage:
+    python search.py [--index <index_file>] [--pattern <id>] [--category <key>]
+                     [--speaker <name>] [--keyword <text>] [--from <date>] [--to <date>]
+    python search.py --terms speaker
+
+A term ending in '*' matches by prefix, e.g. --pattern 'cc_*'. Options may
+be repeated to match any of several terms.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+
+import config
+
+def parse_arguments():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description='Search pattern matches across analyzed transcripts'
+    )
+    parser.add_argument(
+        '--index', '-i',
+        default=os.path.join('output', config.INDEX_SETTINGS['filename']),
+        help='Pattern index to search (default: output/%s)' % config.INDEX_SETTINGS['filename']
+    )
+    parser.add_argument('--pattern', '-p', action='append', help="Pattern id, e.g. cc_01 or 'cc_*'")
+    parser.add_argument('--category', '-c', action='append', help='Pattern category key')
+    parser.add_argument('--speaker', '-s', action='append', help='Speaker name')
+    parser.add_argument('--keyword', '-k', action='append', help='Matched keyword text')
+    parser.add_argument('--from', dest='date_from', help='Earliest transcript date')
+    parser.add_argument('--to', dest='date_to', help='Latest transcript date')
+    parser.add_argument(
+        '--limit', '-n',
+        type=int,
+        default=100,
+        help='Maximum number of matches to show (default: 100; 0 for all)'
+    )
+    parser.add_argument(
+        '--terms',
+        choices=('pattern', 'category', 'speaker', 'keyword'),
+        help='List the indexed terms of a field instead of searching'
+    )
+    parser.add_argument('--json', action='store_true', help='Print the matches as JSON')
+    return parser.parse_args()
+
+def main():
+    """Main entry point for the search tool."""
+    args = parse_arguments()
+    if not os.path.exists(args.index):
+        print(f"Error: Pattern index '{args.index}' not found.")
+        sys.exit(1)
+
+    from result_storage.pattern_index import PatternIndex
+    index = PatternIndex(args.index)
+    try:
+        if args.terms:
+            for term, count in index.terms(args.terms):
+                print(f"{count:8d}  {term}")
+            return
+
+        started = time.perf_counter()
+        try:
+            matches = index.search(
+                pattern=args.pattern,
+                category=args.category,
+                speaker=args.speaker,
+                keyword=args.keyword,
+                date_from=args.date_from,
+                date_to=args.date_to,
+                limit=args.limit or None
+            )
+        except ValueError as e:
+            print(f"Error: {str(e)}")
+            sys.exit(1)
+        elapsed = (time.perf_counter() - started) * 1000
+    finally:
+        index.close()
+
+    if args.json:
+        json.dump(matches, sys.stdout, indent=2)
+        print()
+        return
+
+    for match in matches:
+        text = ' '.join(match['text'].split())
+        if len(text) > 120:
+            text = text[:117] + '...'
+        print(f"{match['date'] or '----------'}  {match['title'] or match['source']}")
+        print(f"    [{match['pattern_id']}] {match['pattern_name']} - "
+              f"{match['speaker']} {match['timestamp']}")
+        print(f"    {text}")
+    print(f"{len(matches)} matches in {elapsed:.1f} ms")
+
+if __name__ == "__main__":
+    main()
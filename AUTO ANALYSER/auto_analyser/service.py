@@ -0,0 +1,536 @@
+#!/usr/bin/env python3
+"""
+Analysis Service
+----------------
+A local HTTP service that keeps the analysis pipeline warm and analyzes
+transcripts submitted as jobs, so an interactive analysis only pays for
+the analysis itself.
+
+Endpoints:
+    POST /jobs                  Submit a transcript. The body is the file itself,
+                                named with ?filename= or an X-Filename header, or
+                                with allow_paths a JSON object {"path": "..."}.
+                                ?wait=<seconds> waits for the job to finish.
+    GET  /jobs                  List known jobs
+    GET  /jobs/<id>             Job status and, once done, a summary of the results
+    GET  /jobs/<id>/results     The analysis results JSON
+    GET  /jobs/<id>/report      The HTML report
+    GET  /jobs/<id>/report_data/<shard>.js
+                                A data shard of a sharded report
+    GET  /health                Queue and worker state
+
+Usage:
+    python service.py [--port <port>] [--output <output_dir>] [--jobs <n>]
+"""
+
+import os
+import sys
+import json
+import math
+import queue
+import uuid
+import shutil
+import logging
+import sqlite3
+import argparse
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+import config
+from corpus import AnalysisPipeline
+from report_generation.report_generator import find_results
+
+logger = logging.getLogger(__name__)
+
+class Job:
+    """A transcript submitted to the service and the state of its analysis."""
+
+    def __init__(self, transcript_file, output_dir, job_id):
+        """
+        Initialize a queued job.
+
+        Args:
+            transcript_file (str): Path to the transcript to analyze
+            output_dir (str): Directory to save the report and results
+            job_id (str): Job id
+        """
+        self.id = job_id
+        self.transcript_file = transcript_file
+        self.output_dir = output_dir
+        self.status = 'queued'
+        self.error = None
+        self.summary = None
+        self.submitted = datetime.now()
+        self.started = None
+        self.finished = None
+        self.done = threading.Event()
+
+    def to_dict(self):
+        """Return the job status as a JSON-serializable dictionary."""
+        job = {
+            'id': self.id,
+            'status': self.status,
+            'input': os.path.basename(self.transcript_file),
+            'submitted': self.submitted.strftime('%Y-%m-%d %H:%M:%S')
+        }
+        if self.started:
+            job['queue_seconds'] = round((self.started - self.submitted).total_seconds(), 3)
+        if self.finished:
+            job['analysis_seconds'] = round((self.finished - self.started).total_seconds(), 3)
+        if self.error:
+            job['error'] = self.error
+        if self.summary:
+            job['summary'] = self.summary
+            job['results'] = f"/jobs/{self.id}/results"
+            job['report'] = f"/jobs/{self.id}/report"
+        return job
+
+class AnalysisService:
+    """Bounded job queue served by analysis threads with warm pipelines."""
+
+    def __init__(self, output_dir=None, queue_size=None, threads=None, max_jobs=None,
+                 **pipeline_options):
+        """
+        Build and warm up the pipelines.
+
+        Args:
+            output_dir (str): Directory jobs write to
+                (default: config.SERVICE_SETTINGS['output_dir'])
+            queue_size (int): Maximum number of waiting jobs
+                (default: config.SERVICE_SETTINGS['queue_size'])
+            threads (int): Number of analysis threads, each with its own pipeline
+                (default: config.SERVICE_SETTINGS['threads'])
+            max_jobs (int): Number of finished jobs to remember; the output
+                of older jobs is deleted (default: config.SERVICE_SETTINGS['max_jobs'])
+            **pipeline_options: Keyword arguments for AnalysisPipeline
+        """
+        settings = config.SERVICE_SETTINGS
+        self.logger = logging.getLogger(__name__)
+        self.output_dir = output_dir or settings['output_dir']
+        self.max_jobs = max_jobs or settings['max_jobs']
+        self.queue = queue.Queue(maxsize=queue_size or settings['queue_size'])
+        self.jobs = {}
+        self._lock = threading.Lock()
+        self._running = 0
+        self._stopping = threading.Event()
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        if config.INDEX_SETTINGS['enabled']:
+            pipeline_options.setdefault(
+                'index', os.path.join(self.output_dir, config.INDEX_SETTINGS['filename'])
+            )
+        self.pipelines = []
+        for _ in range(threads or settings['threads']):
+            pipeline = AnalysisPipeline(**pipeline_options)
+            pipeline.warm_up()
+            self.pipelines.append(pipeline)
+
+        self._threads = [
+            threading.Thread(target=self._work, args=(pipeline,), daemon=True,
+                             name=f"analysis-{index}")
+            for index, pipeline in enumerate(self.pipelines)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, transcript_file, job_id=None):
+        """
+        Queue a transcript for analysis.
+
+        Args:
+            transcript_file (str): Path to the transcript
+            job_id (str): Id to give the job, e.g. that of its upload directory
+
+        Returns:
+            Job: The queued job
+
+        Raises:
+            queue.Full: If the queue is full
+        """
+        job_id = job_id or uuid.uuid4().hex
+        job = Job(transcript_file, self.job_dir(job_id), job_id)
+        with self._lock:
+            self.queue.put_nowait(job)
+            self.jobs[job.id] = job
+            forgotten = self._forget_old_jobs()
+        for old_job in forgotten:
+            self._delete_output(old_job)
+        return job
+
+    def job_dir(self, job_id):
+        """Return the directory a job writes to."""
+        return os.path.join(self.output_dir, job_id)
+
+    def get(self, job_id):
+        """Return a job by id, or None."""
+        with self._lock:
+            return self.jobs.get(job_id)
+
+    def list_jobs(self):
+        """Return the status of every known job, oldest first."""
+        with self._lock:
+            return [job.to_dict() for job in self.jobs.values()]
+
+    def status(self):
+        """Return the state of the queue and workers."""
+        with self._lock:
+            return {
+                'status': 'stopping' if self._stopping.is_set() else 'ok',
+                'queued': self.queue.qsize(),
+                'queue_size': self.queue.maxsize,
+                'running': self._running,
+                'threads': len(self._threads),
+                'jobs': len(self.jobs)
+            }
+
+    def close(self):
+        """Stop the analysis threads after their current job and release the pipelines."""
+        self._stopping.set()
+        for thread in self._threads:
+            thread.join()
+        for pipeline in self.pipelines:
+            pipeline.close()
+
+    def _work(self, pipeline):
+        """Analyze queued jobs until the service stops."""
+        while not self._stopping.is_set():
+            try:
+                job = self.queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+
+            with self._lock:
+                self._running += 1
+            job.status = 'running'
+            job.started = datetime.now()
+            try:
+                _, transcript, analysis_results = pipeline.run(job.transcript_file, job.output_dir)
+                overall = analysis_results['overall_analysis']
+                job.summary = {
+                    'title': transcript['metadata'].get('title', ''),
+                    'segments': overall['total_segments'],
+                    'patterns_found': len(analysis_results['patterns_found']),
+                    'dominant_category': overall.get('dominant_category'),
+                    'dominant_speaker': overall.get('dominant_speaker'),
+                    'category_counts': dict(overall['category_counts'])
+                }
+                job.status = 'done'
+            except Exception as e:
+                self.logger.error(f"Job {job.id} failed: {str(e)}")
+                job.error = str(e)
+                job.status = 'failed'
+            finally:
+                job.finished = datetime.now()
+                with self._lock:
+                    self._running -= 1
+                job.done.set()
+                self.queue.task_done()
+
+    def _forget_old_jobs(self):
+        """
+        Drop the oldest finished jobs beyond max_jobs. Called with the lock held.
+
+        Returns:
+            list: The jobs dropped
+        """
+        excess = len(self.jobs) - self.max_jobs
+        if excess <= 0:
+            return []
+        forgotten = [job for job in self.jobs.values() if job.done.is_set()][:excess]
+        for job in forgotten:
+            del self.jobs[job.id]
+        return forgotten
+
+    def _delete_output(self, job):
+        """Delete the output directory of a forgotten job and its pattern index entry."""
+        # Only directories the service created are deleted
+        if os.path.dirname(os.path.abspath(job.output_dir)) != os.path.abspath(self.output_dir):
+            return
+        index = self.pipelines[0].index if self.pipelines else None
+        if index is not None:
+            try:
+                index.remove(job.output_dir)
+            except sqlite3.Error as e:
+                self.logger.error(f"Could not remove job {job.id} from the index: {str(e)}")
+        shutil.rmtree(job.output_dir, ignore_errors=True)
+
+class ServiceRequestHandler(BaseHTTPRequestHandler):
+    """HTTP front end of an AnalysisService."""
+
+    server_version = 'AutoAnalyser/1.0'
+
+    # Files of a job directory served under /jobs/<id>/<name>
+    JOB_FILES = {
+        'results': config.REPORT_SETTINGS['results_filename'],
+        'report': config.REPORT_SETTINGS['report_filename'],
+        config.REPORT_SETTINGS['css_filename']: config.REPORT_SETTINGS['css_filename'],
+        config.REPORT_SETTINGS['js_filename']: config.REPORT_SETTINGS['js_filename']
+    }
+
+    CONTENT_TYPES = {
+        '.json': 'application/json',
+        '.html': 'text/html; charset=utf-8',
+        '.css': 'text/css',
+        '.js': 'application/javascript'
+    }
+
+    # Compressed results are sent as-is with the matching Content-Encoding
+    CONTENT_ENCODINGS = {
+        '.gz': 'gzip',
+        '.zst': 'zstd'
+    }
+
+    @property
+    def service(self):
+        return self.server.service
+
+    def do_GET(self):
+        """Serve health, job status and job output."""
+        parts = [part for part in urlsplit(self.path).path.split('/') if part]
+
+        if parts == ['health']:
+            return self._send_json(200, self.service.status())
+        if parts == ['jobs']:
+            return self._send_json(200, {'jobs': self.service.list_jobs()})
+        if len(parts) == 4 and parts[0] == 'jobs' and parts[2] == config.REPORT_SETTINGS['shard_dir']:
+            return self._send_shard(parts[1], parts[3])
+        if len(parts) in (2, 3) and parts[0] == 'jobs':
+            job = self.service.get(parts[1])
+            if job is None:
+                return self._send_error(404, f"Unknown job '{parts[1]}'")
+            if len(parts) == 2:
+                return self._send_json(200, job.to_dict())
+            if parts[2] not in self.JOB_FILES:
+                return self._send_error(404, f"Unknown job resource '{parts[2]}'")
+            if job.status != 'done':
+                return self._send_error(409, f"Job is {job.status}")
+            if parts[2] == 'results':
+                # The results may have been written compressed
+                path = find_results(job.output_dir) or ''
+            else:
+                path = os.path.join(job.output_dir, self.JOB_FILES[parts[2]])
+            return self._send_file(path)
+        return self._send_error(404, 'Not found')
+
+    def do_POST(self):
+        """Accept a transcript upload or path as a new job."""
+        url = urlsplit(self.path)
+        if url.path.rstrip('/') != '/jobs':
+            return self._send_error(404, 'Not found')
+        query = parse_qs(url.query)
+
+        try:
+            wait = float(query.get('wait', ['0'])[0])
+        except ValueError:
+            wait = 0
+        if math.isnan(wait):
+            return self._send_error(400, 'wait must be a number of seconds')
+        wait = min(wait, config.SERVICE_SETTINGS['max_wait_seconds'])
+
+        try:
+            length = int(self.headers.get('Content-Length', ''))
+        except ValueError:
+            return self._send_error(411, 'Content-Length is required')
+        if length < 0:
+            # rfile.read(-1) would block until the client closes the connection
+            return self._send_error(400, 'Content-Length must not be negative')
+        if length > config.SERVICE_SETTINGS['max_upload_mb'] * 1024 * 1024:
+            return self._send_error(413, 'Transcript is too large')
+        body = self.rfile.read(length)
+
+        content_type = self.headers.get('Content-Type', '').split(';')[0].strip()
+        job_id = uuid.uuid4().hex
+        if content_type == 'application/json':
+            if not config.SERVICE_SETTINGS['allow_paths']:
+                return self._send_error(403, 'Submitting server-side paths is disabled')
+            try:
+                transcript_file = json.loads(body)['path']
+            except (ValueError, KeyError, TypeError):
+                return self._send_error(400, 'Expected a JSON object with a "path"')
+            if not os.path.isfile(transcript_file):
+                return self._send_error(400, f"Transcript file '{transcript_file}' not found")
+        else:
+            filename = (query.get('filename') or [self.headers.get('X-Filename', '')])[0]
+            filename = os.path.basename(filename)
+            if not filename.lower().endswith(config.CORPUS_SETTINGS['extensions']):
+                return self._send_error(
+                    415, 'Name the upload with ?filename= or X-Filename; supported types are '
+                    + ', '.join(config.CORPUS_SETTINGS['extensions'])
+                )
+            upload_dir = self.service.job_dir(job_id)
+            os.makedirs(upload_dir, exist_ok=True)
+            transcript_file = os.path.join(upload_dir, filename)
+            with open(transcript_file, 'wb') as f:
+                f.write(body)
+
+        try:
+            job = self.service.submit(transcript_file, job_id)
+        except queue.Full:
+            if transcript_file.startswith(self.service.job_dir(job_id)):
+                os.remove(transcript_file)
+                os.rmdir(self.service.job_dir(job_id))
+            return self._send_error(503, 'The analysis queue is full, retry later',
+                                    headers={'Retry-After': '5'})
+
+        if wait > 0:
+            job.done.wait(wait)
+        code = 200 if job.done.is_set() else 202
+        return self._send_json(code, job.to_dict(), headers={'Location': f"/jobs/{job.id}"})
+
+    def _send_shard(self, job_id, name):
+        """Serve a data shard of a job's sharded report, from its report_data directory only."""
+        job = self.service.get(job_id)
+        if job is None:
+            return self._send_error(404, f"Unknown job '{job_id}'")
+        if job.status != 'done':
+            return self._send_error(409, f"Job is {job.status}")
+        data_dir = os.path.realpath(os.path.join(job.output_dir, config.REPORT_SETTINGS['shard_dir']))
+        path = os.path.realpath(os.path.join(data_dir, name))
+        if not name.endswith('.js') or os.path.dirname(path) != data_dir:
+            return self._send_error(404, f"Unknown report data '{name}'")
+        return self._send_file(path)
+
+    def log_message(self, format, *args):
+        logger.info(f"{self.address_string()} {format % args}")
+
+    def _send_json(self, code, data, headers=None):
+        self._send(code, json.dumps(data).encode('utf-8'), 'application/json', headers)
+
+    def _send_error(self, code, message, headers=None):
+        self._send_json(code, {'error': message}, headers)
+
+    def _send_file(self, path):
+        try:
+            with open(path, 'rb') as f:
+                content = f.read()
+        except OSError:
+            return self._send_error(404, 'Job output not found')
+        path, extension = os.path.splitext(path)
+        headers = {}
+        if extension in self.CONTENT_ENCODINGS:
+            headers['Content-Encoding'] = self.CONTENT_ENCODINGS[extension]
+            path, extension = os.path.splitext(path)
+        content_type = self.CONTENT_TYPES.get(extension, 'application/octet-stream')
+        self._send(200, content, content_type, headers)
+
+    def _send(self, code, content, content_type, headers=None):
+        self.send_response(code)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(content)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(content)
+
+def create_server(service, host=None, port=None):
+    """
+    Create the HTTP server of a service.
+
+    Args:
+        service (AnalysisService): Service to expose
+        host (str): Interface to bind (default: config.SERVICE_SETTINGS['host'])
+        port (int): Port to bind (default: config.SERVICE_SETTINGS['port']); 0 picks a free port
+
+    Returns:
+        ThreadingHTTPServer: The server, not yet serving
+    """
+    settings = config.SERVICE_SETTINGS
+    server = ThreadingHTTPServer(
+        (host or settings['host'], settings['port'] if port is None else port),
+        ServiceRequestHandler
+    )
+    server.daemon_threads = True
+    server.service = service
+    return server
+
+def parse_arguments():
+    """Parse command line arguments."""
+    settings = config.SERVICE_SETTINGS
+    parser = argparse.ArgumentParser(
+        description='Serve transcript analysis over HTTP with a warm pipeline'
+    )
+    parser.add_argument(
+        '--host',
+        default=settings['host'],
+        help=f"Interface to listen on (default: {settings['host']})"
+    )
+    parser.add_argument(
+        '--port',
+        type=int,
+        default=settings['port'],
+        help=f"Port to listen on (default: {settings['port']})"
+    )
+    parser.add_argument(
+        '--output', '-o',
+        default=settings['output_dir'],
+        help=f"Directory for job uploads and reports (default: {settings['output_dir']})"
+    )
+    parser.add_argument(
+        '--queue-size',
+        type=int,
+        default=settings['queue_size'],
+        help=f"Jobs that may wait before submissions are refused (default: {settings['queue_size']})"
+    )
+    parser.add_argument(
+        '--threads',
+        type=int,
+        default=settings['threads'],
+        help=f"Transcripts analyzed concurrently (default: {settings['threads']})"
+    )
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=1,
+        help='Number of worker processes for segment analysis (default: 1)'
+    )
+    parser.add_argument(
+        '--patterns',
+        help='YAML or JSON pattern pack to use instead of the built-in patterns'
+    )
+    parser.add_argument(
+        '--no-sentiment',
+        action='store_true',
+        help='Skip sentiment scoring, so the VADER lexicon is never loaded'
+    )
+    parser.add_argument(
+        '--allow-paths',
+        action='store_true',
+        help='Accept JSON submissions naming a transcript file on this machine'
+    )
+    return parser.parse_args()
+
+def main():
+    """Run the analysis service until interrupted."""
+    args = parse_arguments()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+    if args.allow_paths:
+        config.SERVICE_SETTINGS['allow_paths'] = True
+
+    print("Loading analysis pipeline...")
+    try:
+        service = AnalysisService(
+            output_dir=args.output,
+            queue_size=args.queue_size,
+            threads=args.threads,
+            workers=args.jobs,
+            sentiment=False if args.no_sentiment else None,
+            patterns=args.patterns
+        )
+    except (OSError, LookupError, ValueError) as e:
+        print(f"Error: Could not start the analysis service: {str(e)}")
+        sys.exit(1)
+
+    server = create_server(service, args.host, args.port)
+    print(f"Analysis service listening on http://{args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+
+if __name__ == "__main__":
+    main()
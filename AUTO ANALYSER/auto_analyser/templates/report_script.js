@@ -12,6 +12,11 @@ document.addEventListener('DOMContentLoaded', function() {
  * Initialize the report
  */
 function initializeReport() {
+    // Sharded reports load their transcript and pattern cards on demand
+    if (document.getElementById('report-index')) {
+        initializeShardedReport();
+    }
+    
     // Set up event listeners
     setupEventListeners();
     
@@ -37,7 +42,7 @@ function setupEventListeners() {
  * Show all patterns
  */
 function showAllSegments() {
-    const patterns = document.querySelectorAll('.pattern');
+    const patterns = document.querySelectorAll('.pattern, .pattern-section');
     patterns.forEach(pattern => {
         pattern.style.display = 'block';
     });
@@ -62,7 +67,7 @@ function showAllCategories() {
  */
 function filterByCategory(category) {
     // Hide all patterns
-    const allPatterns = document.querySelectorAll('.pattern');
+    const allPatterns = document.querySelectorAll('.pattern, .pattern-section');
     allPatterns.forEach(pattern => {
         pattern.style.display = 'none';
     });
@@ -139,3 +144,332 @@ function toggleDropdown(dropdownId) {
         dropdown.style.display = 'block';
     }
 }
+
+/**
+ * Sharded report state: the report index embedded in the page, the rows
+ * of every loaded data shard, shard scripts still loading, and the render
+ * of each shard placeholder
+ */
+const shardedReport = {
+    index: null,
+    data: new Map(),
+    pending: new Map(),
+    renders: new WeakMap()
+};
+
+// Estimated heights of unrendered rows, in pixels
+const ESTIMATED_ROW_HEIGHTS = {
+    segments: 90,
+    patterns: 420
+};
+
+/**
+ * Set up lazy loading of the transcript and pattern card shards
+ */
+function initializeShardedReport() {
+    shardedReport.index = JSON.parse(document.getElementById('report-index').textContent);
+    
+    const transcript = document.querySelector('.transcript-segments');
+    observeShards(transcript.querySelectorAll('.shard'), transcript);
+    observeShards(document.querySelectorAll('.pattern-section .shard'), null);
+}
+
+/**
+ * Render shard placeholders near the visible area and release those far from it
+ * @param {NodeList} shards - The shard placeholders
+ * @param {Element} root - Scrolling container of the shards, or null for the page
+ */
+function observeShards(shards, root) {
+    const observer = new IntersectionObserver(entries => {
+        entries.forEach(entry => {
+            if (entry.isIntersecting) {
+                renderShard(entry.target);
+            } else {
+                releaseShard(entry.target);
+            }
+        });
+    }, { root: root, rootMargin: '1500px 0px' });
+    
+    shards.forEach(shard => {
+        const kind = shardKind(shard.dataset.shard);
+        shard.style.height = `${shard.dataset.count * ESTIMATED_ROW_HEIGHTS[kind]}px`;
+        observer.observe(shard);
+    });
+}
+
+/**
+ * Called by each data shard script with its rows
+ * @param {string} name - The shard name
+ * @param {Array} rows - The shard rows
+ */
+function reportShard(name, rows) {
+    shardedReport.data.set(name, rows);
+    const pending = shardedReport.pending.get(name);
+    if (pending) {
+        shardedReport.pending.delete(name);
+        pending.resolve(rows);
+    }
+}
+
+/**
+ * Load a data shard
+ * @param {string} name - The shard name
+ * @returns {Promise<Array>} The shard rows
+ */
+function loadShard(name) {
+    if (shardedReport.data.has(name)) {
+        return Promise.resolve(shardedReport.data.get(name));
+    }
+    
+    let pending = shardedReport.pending.get(name);
+    if (!pending) {
+        pending = {};
+        pending.promise = new Promise((resolve, reject) => {
+            pending.resolve = resolve;
+            pending.reject = reject;
+        });
+        shardedReport.pending.set(name, pending);
+        
+        // Script tags also load shards when the report is opened from disk
+        const script = document.createElement('script');
+        script.src = `${shardedReport.index.data_dir}/${name}.js`;
+        script.onload = () => script.remove();
+        script.onerror = () => {
+            script.remove();
+            shardedReport.pending.delete(name);
+            pending.reject(new Error(`Could not load report data ${name}`));
+        };
+        document.head.appendChild(script);
+    }
+    return pending.promise;
+}
+
+/**
+ * Render the rows of a shard placeholder
+ * @param {Element} shard - The shard placeholder
+ * @returns {Promise} Resolved once the shard is rendered
+ */
+function renderShard(shard) {
+    let render = shardedReport.renders.get(shard);
+    if (render) {
+        return render;
+    }
+    
+    const name = shard.dataset.shard;
+    const build = shardKind(name) === 'segments' ? buildSegments : buildPatternCards;
+    render = build(name).then(elements => {
+        // Skip the render if the shard was released while loading
+        if (shardedReport.renders.get(shard) === render) {
+            shard.replaceChildren(...elements);
+            shard.style.height = '';
+        }
+    }).catch(error => {
+        shardedReport.renders.delete(shard);
+        shard.replaceChildren(createElement('div', 'shard-error', error.message));
+    });
+    shardedReport.renders.set(shard, render);
+    return render;
+}
+
+/**
+ * Replace a rendered shard by an empty placeholder of the same height
+ * @param {Element} shard - The shard placeholder
+ */
+function releaseShard(shard) {
+    if (!shardedReport.renders.has(shard)) {
+        return;
+    }
+    shardedReport.renders.delete(shard);
+    if (shard.childElementCount) {
+        shard.style.height = `${shard.offsetHeight}px`;
+        shard.replaceChildren();
+    }
+}
+
+/**
+ * Build the transcript segments of a segment shard
+ * @param {string} name - The shard name
+ * @returns {Promise<Element[]>} The segment elements
+ */
+function buildSegments(name) {
+    const first = shardNumber(name) * shardedReport.index.segment_shard_size;
+    return loadShard(name).then(rows => rows.map((row, offset) => {
+        const [speaker, timestamp, text] = row;
+        const segment = createElement('div', 'transcript-segment');
+        segment.id = `segment-${first + offset}`;
+        
+        const header = createElement('div', 'segment-header');
+        header.append(
+            createElement('span', 'segment-speaker', shardedReport.index.speakers[speaker]),
+            createElement('span', 'segment-timestamp', timestamp)
+        );
+        segment.append(header, createElement('div', 'segment-text', text));
+        return segment;
+    }));
+}
+
+/**
+ * Build the pattern cards of a pattern shard, loading the segments they refer to
+ * @param {string} name - The shard name
+ * @returns {Promise<Element[]>} The pattern card elements
+ */
+function buildPatternCards(name) {
+    const index = shardedReport.index;
+    const category = name.slice('patterns-'.length, name.lastIndexOf('-'));
+    
+    return loadShard(name).then(rows => {
+        const segmentShards = [...new Set(rows.map(row => segmentShardName(row[1])))];
+        return Promise.all(segmentShards.map(loadShard)).then(() => rows.map(row => {
+            const segmentIndex = row[1];
+            const segmentRows = shardedReport.data.get(segmentShardName(segmentIndex));
+            const segment = segmentRows[segmentIndex % index.segment_shard_size];
+            return createPatternCard(category, row, segment);
+        }));
+    });
+}
+
+/**
+ * Build a pattern card
+ * @param {string} category - The category ID of the pattern
+ * @param {Array} row - [pattern index, segment index, evidence level, confidence, hits]
+ * @param {Array} segment - [speaker index, timestamp, text] of the matched segment
+ * @returns {Element} The pattern card
+ */
+function createPatternCard(category, row, segment) {
+    const index = shardedReport.index;
+    const [patternIndex, segmentIndex, evidenceLevel, confidence, hits] = row;
+    const [speaker, timestamp, text] = segment;
+    const pattern = index.patterns[patternIndex];
+    
+    const card = createElement('div', `pattern ${category}`);
+    if (evidenceLevel >= 4) {
+        card.append(createElement('div', 'evidence-level', evidenceLevel));
+    }
+    
+    const header = createElement('div', 'pattern-header');
+    header.append(
+        createElement('h3', 'pattern-title', `${pattern.name} (${timestamp})`),
+        createElement('span', 'expertise-tag', index.categories[category])
+    );
+    card.append(header);
+    
+    const transcript = createElement('div', 'transcript');
+    transcript.append(createElement('div', 'speaker-label', `${index.speakers[speaker]}:`), text);
+    const link = createElement('a', 'segment-link', 'View in transcript');
+    link.href = `#segment-${segmentIndex}`;
+    link.addEventListener('click', event => {
+        event.preventDefault();
+        jumpToSegment(segmentIndex);
+    });
+    card.append(transcript, link, createElement('p', null, pattern.description));
+    
+    const evidence = createElement('div', 'analysis-list');
+    const list = document.createElement('ul');
+    hits.forEach(([start, end, contextStart, contextEnd]) => {
+        const item = createElement('li', 'analysis-item');
+        item.append(
+            createElement('span', 'match-highlight', text.slice(start, end)),
+            ` in context: "${text.slice(contextStart, contextEnd)}"`
+        );
+        list.append(item);
+    });
+    evidence.append(createElement('h4', null, 'Evidence:'), list);
+    card.append(evidence);
+    
+    const frameworks = pattern.frameworks.filter(id => id in index.frameworks);
+    if (frameworks.length) {
+        const framework = createElement('div', 'expert-framework');
+        const content = createElement('div', 'framework-content');
+        frameworks.forEach(id => {
+            const item = createElement('div', 'framework-item');
+            item.append(
+                createElement('div', 'framework-name', index.frameworks[id].name),
+                createElement('div', 'framework-description', index.frameworks[id].description)
+            );
+            content.append(item);
+        });
+        framework.append(createElement('div', 'expert-framework-header', 'EXPERT FRAMEWORK ALIGNMENT'), content);
+        card.append(framework);
+    }
+    
+    const form = createElement('div', 'evidence-form');
+    form.append(
+        createElement('div', 'evidence-form-header',
+            `EVIDENCE LEVEL: ${evidenceLevel} - ${index.evidence_levels[evidenceLevel]}`),
+        createElement('div', 'confidence', `Confidence: ${(confidence * 100).toFixed(1)}%`)
+    );
+    card.append(form);
+    return card;
+}
+
+/**
+ * Scroll the transcript to a segment, loading its shard first
+ * @param {number} segmentIndex - Index of the segment
+ */
+function jumpToSegment(segmentIndex) {
+    const name = segmentShardName(segmentIndex);
+    const shard = document.querySelector(`.transcript-segments .shard[data-shard="${name}"]`);
+    if (!shard) {
+        return;
+    }
+    
+    shard.scrollIntoView({ block: 'start' });
+    renderShard(shard).then(() => {
+        const segment = document.getElementById(`segment-${segmentIndex}`);
+        if (!segment) {
+            return;
+        }
+        segment.scrollIntoView({ behavior: 'smooth', block: 'center' });
+        
+        // Highlight the segment temporarily
+        segment.classList.add('highlight-segment');
+        setTimeout(() => {
+            segment.classList.remove('highlight-segment');
+        }, 2000);
+    });
+}
+
+/**
+ * Name of the shard holding a segment
+ * @param {number} segmentIndex - Index of the segment
+ * @returns {string} The shard name
+ */
+function segmentShardName(segmentIndex) {
+    return `segments-${Math.floor(segmentIndex / shardedReport.index.segment_shard_size)}`;
+}
+
+/**
+ * Kind of a shard, 'segments' or 'patterns'
+ * @param {string} name - The shard name
+ * @returns {string} The shard kind
+ */
+function shardKind(name) {
+    return name.startsWith('segments-') ? 'segments' : 'patterns';
+}
+
+/**
+ * Number of a shard within its kind and category
+ * @param {string} name - The shard name
+ * @returns {number} The shard number
+ */
+function shardNumber(name) {
+    return Number(name.slice(name.lastIndexOf('-') + 1));
+}
+
+/**
+ * Create an element
+ * @param {string} tag - The tag name
+ * @param {string} className - The class name, or null
+ * @param {string} text - The text content, if any
+ * @returns {Element} The element
+ */
+function createElement(tag, className, text) {
+    const element = document.createElement(tag);
+    if (className) {
+        element.className = className;
+    }
+    if (text !== undefined) {
+        element.textContent = text;
+    }
+    return element;
+}
@@ -0,0 +1,97 @@
+"""
+Corpus Tests
+------------
+Checks of corpus mode: resolving its inputs, and streaming many
+transcripts through one warm pipeline.
+
+Run from the package directory with:
+    python -m unittest discover tests
+"""
+
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+
+# Import local modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import config
+from benchmarks.generate_transcript import write_transcript
+from corpus import AnalysisPipeline, resolve_inputs, run_corpus
+
+class CorpusTestCase(unittest.TestCase):
+    """Provides a temporary directory for each test."""
+
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp(prefix='auto_analyser_corpus_')
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def path(self, *parts):
+        path = os.path.join(self.work_dir, *parts)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        return path
+
+class ResolveInputsTest(CorpusTestCase):
+    """resolve_inputs expands directories, globs and manifests."""
+
+    def test_directory_skips_other_files_and_the_output_directory(self):
+        for name in ('a.txt', os.path.join('nested', 'b.vtt'), 'notes.md',
+                     os.path.join('output', 'a', 'analysis_results.json')):
+            open(self.path('corpus', name), 'w').close()
+        found = resolve_inputs(self.path('corpus', ''), exclude_dir=self.path('corpus', 'output'))
+        self.assertEqual(found, [self.path('corpus', 'a.txt'), self.path('corpus', 'nested', 'b.vtt')])
+
+    def test_manifest_paths_are_relative_to_the_manifest(self):
+        manifest = self.path('lists', 'tonight.txt')
+        with open(manifest, 'w', encoding='utf-8') as f:
+            f.write('# hearings\nb.pdf\n\na.txt\nb.pdf\n')
+        self.assertEqual(resolve_inputs(manifest=manifest),
+                         [self.path('lists', 'a.txt'), self.path('lists', 'b.pdf')])
+
+class RunCorpusTest(CorpusTestCase):
+    """A warm pipeline gives every transcript the results of a fresh run."""
+
+    def test_results_match_single_runs(self):
+        transcripts = []
+        for seed, name in enumerate(('monday.txt', 'tuesday.txt')):
+            transcripts.append(self.path('corpus', name))
+            write_transcript(120, transcripts[-1], seed=seed)
+        broken = self.path('corpus', 'broken.json')
+        with open(broken, 'w', encoding='utf-8') as f:
+            f.write('{"segments": ')
+
+        pipeline = AnalysisPipeline(use_cache=False, sentiment=False)
+        try:
+            summary_path = run_corpus(pipeline, [transcripts[0], broken, transcripts[1]],
+                                      self.path('output', ''))
+        finally:
+            pipeline.close()
+        with open(summary_path, encoding='utf-8') as f:
+            summary = json.load(f)
+        self.assertEqual([entry['status'] for entry in summary['transcripts']], ['ok', 'error', 'ok'])
+        self.assertEqual(summary['failed_count'], 1)
+
+        results_filename = config.REPORT_SETTINGS['results_filename']
+        for transcript_file, entry in zip(transcripts, summary['transcripts'][::2]):
+            single_dir = self.path('single', os.path.basename(transcript_file))
+            pipeline = AnalysisPipeline(use_cache=False, sentiment=False)
+            try:
+                pipeline.run(transcript_file, single_dir)
+            finally:
+                pipeline.close()
+            with open(os.path.join(entry['output_dir'], results_filename), encoding='utf-8') as f:
+                corpus_results = json.load(f)
+            with open(os.path.join(single_dir, results_filename), encoding='utf-8') as f:
+                single_results = json.load(f)
+            self.assertEqual(corpus_results, single_results)
+            self.assertEqual(entry['patterns_found'], len(single_results['patterns_found']))
+
+        self.assertEqual(summary['totals']['patterns_found'],
+                         sum(entry['patterns_found'] for entry in summary['transcripts'][::2]))
+
+if __name__ == '__main__':
+    unittest.main()
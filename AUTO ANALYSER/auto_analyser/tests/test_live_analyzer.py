@@ -0,0 +1,95 @@
+"""
+Live Analyzer Tests
+-------------------
+Checks that analyzing a transcript one segment at a time gives the
+results of PatternMatcher.analyze().
+
+Run from the package directory with:
+    python -m unittest discover tests
+"""
+
+import os
+import sys
+import json
+import asyncio
+import unittest
+
+# Import local modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.generate_transcript import generate_transcript
+from pattern_analysis.live_analyzer import LiveAnalyzer
+from pattern_analysis.match_table import json_default
+from pattern_analysis.pattern_database import PATTERN_REGISTRY
+from pattern_analysis.pattern_matcher import PatternMatcher
+from pdf_processing.pdf_extractor import PDFExtractor
+
+def make_transcript(segments, seed=0):
+    """Return the transcript data of a generated transcript."""
+    metadata, segments = PDFExtractor(cache=False)._process_lines(
+        generate_transcript(segments, seed=seed).split('\n')
+    )
+    return {'metadata': metadata, 'segments': list(segments)}
+
+def as_json(results):
+    """Return results as they are written to analysis_results.json."""
+    return json.loads(json.dumps(results, default=json_default))
+
+def in_segment_order(matches):
+    """Return ranked matches in the order their segments report them."""
+    return sorted(as_json(matches), key=lambda match: (
+        match['segment_index'], PATTERN_REGISTRY.index_of(match['pattern_id'])
+    ))
+
+class LiveAnalyzerTest(unittest.TestCase):
+    """snapshot() returns what analyze() does for the segments added so far."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.matcher = PatternMatcher(sentiment=False)
+        cls.segments = make_transcript(120, seed=7)['segments']
+
+    def analyze(self, segments):
+        return as_json(self.matcher.analyze({'metadata': {}, 'segments': list(segments)}))
+
+    def test_snapshot_matches_analyze(self):
+        reported = []
+        live = LiveAnalyzer(self.matcher, on_match=reported.append)
+        returned = []
+        for segment in self.segments:
+            returned.extend(live.add_segment(segment))
+
+        expected = self.analyze(self.segments)
+        self.assertGreater(len(expected['patterns_found']), 0)
+        self.assertEqual(as_json(live.snapshot()), expected)
+        self.assertEqual(as_json(returned), in_segment_order(expected['patterns_found']))
+        self.assertEqual(as_json(reported), as_json(returned))
+        self.assertEqual(live.transcript()['segments'], self.segments)
+
+    def test_snapshot_part_way(self):
+        live = LiveAnalyzer(self.matcher)
+        for segment in self.segments[:40]:
+            live.add_segment(segment)
+        snapshot = live.snapshot()
+        for segment in self.segments[40:]:
+            live.add_segment(segment)
+
+        self.assertEqual(len(live), len(self.segments))
+        self.assertEqual(as_json(snapshot), self.analyze(self.segments[:40]))
+
+    def test_consume_async_stream(self):
+        async def arrive(segments):
+            for segment in segments:
+                await asyncio.sleep(0)
+                yield segment
+
+        async def consume(live):
+            return [match async for match in live.consume(arrive(self.segments))]
+
+        live = LiveAnalyzer(self.matcher)
+        matches = asyncio.run(consume(live))
+        expected = self.analyze(self.segments)
+        self.assertEqual(as_json(matches), in_segment_order(expected['patterns_found']))
+        self.assertEqual(as_json(live.snapshot()), expected)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+"""
+Match Table Tests
+-----------------
+Checks of the columnar match store against the match dictionaries it
+stands in for.
+
+Run from the package directory with:
+    python -m unittest discover tests
+"""
+
+import os
+import sys
+import json
+import unittest
+
+# Import local modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pattern_analysis.match_table import MatchTable, json_default
+from pattern_analysis.pattern_registry import PatternRegistry
+
+REGISTRY = PatternRegistry({
+    'planning': [
+        {'id': 'plan', 'name': 'Planning', 'description': 'Talks about plans',
+         'keywords': ['plan', 'care plan', 'review'], 'frameworks': ['Care Act']},
+        {'id': 'meeting', 'name': 'Meetings', 'description': 'Talks about meetings',
+         'keywords': ['meeting'], 'frameworks': []}
+    ]
+})
+
+SEGMENTS = [
+    {'speaker': 'Ben Mak', 'timestamp': '0:05', 'text': 'The care plan is late. We need a review.'},
+    {'speaker': 'Mbalu (ICS)', 'timestamp': '0:40', 'text': 'The meeting is on Monday.'}
+]
+
+def build_table():
+    """Return a table with three matches, not in segment order."""
+    table = MatchTable(REGISTRY, SEGMENTS)
+    table.add(1, 1, [(0, 4, 11, 0, 0, 25)], evidence_level=2)
+    table.add(0, 0, [(1, 4, 13, 0, 0, 22), (2, 33, 39, 1, 23, 40)], evidence_level=3)
+    table.add(0, 1, [], evidence_level=1)
+    return table
+
+class MatchTableTest(unittest.TestCase):
+    """MatchTable rows expand to the match dictionaries of the reports."""
+
+    def test_expand(self):
+        match = build_table()[1]
+        self.assertEqual(match['pattern_id'], 'plan')
+        self.assertEqual(match['category'], 'planning')
+        self.assertEqual(match['speaker'], 'Ben Mak')
+        self.assertEqual(match['segment_index'], 0)
+        self.assertEqual(match['evidence_level'], 3)
+        self.assertEqual(match['frameworks'], ('Care Act',))
+        self.assertAlmostEqual(match['confidence'], 2 / 3)
+        self.assertEqual(
+            [(hit['keyword'], hit['match_text'], hit['context'], hit['sentence_idx'])
+             for hit in match['keyword_matches']],
+            [('care plan', 'care plan', 'The care plan is late.', 0),
+             ('review', 'review', 'We need a review.', 1)]
+        )
+
+    def test_hits_round_trip_through_add(self):
+        table = build_table()
+        copied = MatchTable(REGISTRY, SEGMENTS)
+        for row in range(len(table)):
+            copied.add(table.segment_index[row], table.pattern_index[row], table.hits(row),
+                       table.evidence_level[row])
+        self.assertEqual(list(copied), list(table))
+        self.assertEqual([table.hit_count(row) for row in range(len(table))], [1, 2, 0])
+
+    def test_columns_extend(self):
+        table = build_table()
+        extended = MatchTable(REGISTRY, SEGMENTS)
+        extended.add(1, 0, [(0, 0, 3, 0, 0, 25)])
+        extended.extend(table.columns())
+        self.assertEqual(len(extended), 4)
+        self.assertEqual(list(extended)[1:], list(table))
+
+        empty = MatchTable(REGISTRY, SEGMENTS)
+        empty.extend(MatchTable(REGISTRY, SEGMENTS).columns())
+        self.assertEqual(list(empty), [])
+
+    def test_sort_is_stable_and_moves_hits_with_rows(self):
+        table = build_table()
+        matches = list(table)
+        table.sort(key=lambda row: table.segment_index[row])
+        self.assertEqual(list(table), sorted(matches, key=lambda match: match['segment_index']))
+
+        table.sort(key=lambda row: table.hit_count(row), reverse=True)
+        self.assertEqual([table.hit_count(row) for row in range(len(table))], [2, 1, 0])
+
+    def test_json_default(self):
+        table = build_table()
+        self.assertEqual(json.loads(json.dumps({'patterns_found': table}, default=json_default)),
+                         json.loads(json.dumps({'patterns_found': table.to_dicts()})))
+        with self.assertRaises(TypeError):
+            json.dumps(object(), default=json_default)
+
+if __name__ == '__main__':
+    unittest.main()
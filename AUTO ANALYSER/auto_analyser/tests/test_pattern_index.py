@@ -0,0 +1,120 @@
+"""
+Pattern Index Tests
+-------------------
+Checks of the cross-transcript pattern index and its search criteria.
+
+Run from the package directory with:
+    python -m unittest discover tests
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+# Import local modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from result_storage.pattern_index import PatternIndex
+
+def make_match(segment_index, pattern_id, speaker, keywords):
+    """Return a match dictionary as written to analysis_results.json."""
+    return {
+        'pattern_id': pattern_id,
+        'pattern_name': pattern_id.replace('_', ' ').title(),
+        'category': pattern_id.split('_')[0],
+        'speaker': speaker,
+        'timestamp': f"0:{segment_index:02d}",
+        'segment_index': segment_index,
+        'text': f"Segment {segment_index}",
+        'keyword_matches': [{'keyword': keyword.lower(), 'match_text': keyword} for keyword in keywords],
+        'confidence': 0.5,
+        'evidence_level': 2
+    }
+
+MARCH = (
+    {'metadata': {'title': 'March review', 'date': '12/03/2024'}},
+    {'patterns_found': [
+        make_match(0, 'cc_subtle_control', 'Ben Mak', ['Why?']),
+        make_match(3, 'pd_reshaping', 'Mbalu (ICS)', ['Shared Decision'])
+    ]}
+)
+
+MAY = (
+    {'metadata': {'title': 'May review', 'date': '2024-05-01'}},
+    {'patterns_found': [
+        make_match(1, 'cc_institutional_gaslighting', 'Mbalu (ICS)', ['whyx']),
+        make_match(2, 'ccx_other', 'Ben Mak', ['agenda'])
+    ]}
+)
+
+class PatternIndexTest(unittest.TestCase):
+    """search() combines pattern, category, speaker, keyword and date criteria."""
+
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp(prefix='auto_analyser_index_')
+        self.index = PatternIndex(os.path.join(self.work_dir, 'pattern_index.sqlite'))
+        self.march_dir = os.path.join(self.work_dir, 'march')
+        self.may_dir = os.path.join(self.work_dir, 'may')
+        self.index.add(self.march_dir, *MARCH, source='march.pdf')
+        self.index.add(self.may_dir, *MAY, source='may.pdf')
+
+    def tearDown(self):
+        self.index.close()
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def found(self, **criteria):
+        return [(match['date'], match['pattern_id']) for match in self.index.search(**criteria)]
+
+    def test_everything_in_date_order(self):
+        self.assertEqual(self.found(), [
+            ('2024-03-12', 'cc_subtle_control'), ('2024-03-12', 'pd_reshaping'),
+            ('2024-05-01', 'cc_institutional_gaslighting'), ('2024-05-01', 'ccx_other')
+        ])
+        match = self.index.search(pattern='pd_reshaping')[0]
+        self.assertEqual((match['source'], match['title'], match['segment_index'], match['speaker']),
+                         ('march.pdf', 'March review', 3, 'Mbalu (ICS)'))
+
+    def test_prefix_glob(self):
+        self.assertEqual(self.found(pattern='cc_*'), [
+            ('2024-03-12', 'cc_subtle_control'), ('2024-05-01', 'cc_institutional_gaslighting')
+        ])
+        self.assertEqual(len(self.found(pattern='cc*')), 3)
+        self.assertEqual(self.found(pattern='cc_'), [])
+
+    def test_glob_characters_in_terms_are_literal(self):
+        self.assertEqual(self.found(keyword='why?*'), [('2024-03-12', 'cc_subtle_control')])
+        self.assertEqual(self.found(keyword='why?'), [('2024-03-12', 'cc_subtle_control')])
+        self.assertEqual(self.found(keyword='[w]hy*'), [])
+
+    def test_alternatives_and_combined_criteria(self):
+        self.assertEqual(len(self.found(pattern=['pd_reshaping', 'ccx_other'])), 2)
+        self.assertEqual(self.found(category='cc', speaker='mbalu (ics)'),
+                         [('2024-05-01', 'cc_institutional_gaslighting')])
+        self.assertEqual(self.found(speaker='MBALU*', keyword='shared decision'),
+                         [('2024-03-12', 'pd_reshaping')])
+
+    def test_date_filters(self):
+        self.assertEqual([pattern for _, pattern in self.found(date_from='2024-04-01')],
+                         ['cc_institutional_gaslighting', 'ccx_other'])
+        self.assertEqual([pattern for _, pattern in self.found(date_to='12 March 2024')],
+                         ['cc_subtle_control', 'pd_reshaping'])
+        self.assertEqual(self.found(date_from='2024-03-13', date_to='30/04/2024'), [])
+        with self.assertRaises(ValueError):
+            self.found(date_from='next week')
+
+    def test_limit(self):
+        self.assertEqual(len(self.found(limit=3)), 3)
+        self.assertEqual(len(self.found(limit=None)), 4)
+
+    def test_adding_again_replaces_and_remove_deletes(self):
+        transcript, results = MARCH
+        self.index.add(self.march_dir, transcript, {'patterns_found': results['patterns_found'][:1]})
+        self.assertEqual(len(self.found(date_to='2024-03-31')), 1)
+        self.index.remove(self.march_dir)
+        self.assertEqual(len(self.found(date_to='2024-03-31')), 0)
+        self.assertEqual(dict(self.index.terms('pattern')),
+                         {'cc_institutional_gaslighting': 1, 'ccx_other': 1})
+
+if __name__ == '__main__':
+    unittest.main()
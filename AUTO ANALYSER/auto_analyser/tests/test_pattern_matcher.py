@@ -0,0 +1,137 @@
+"""
+Pattern Matcher Tests
+---------------------
+Checks that the ways of running an analysis agree with a plain serial
+analyze() of the same transcript.
+
+Run from the package directory with:
+    python -m unittest discover tests
+"""
+
+import os
+import sys
+import copy
+import json
+import unittest
+
+# Import local modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.generate_transcript import generate_transcript
+from pattern_analysis.match_table import json_default
+from pattern_analysis.pattern_database import PATTERN_REGISTRY
+from pattern_analysis.pattern_matcher import PatternMatcher
+from pattern_analysis.pattern_registry import PatternRegistry
+from pdf_processing.pdf_extractor import PDFExtractor
+from pdf_processing.time_index import select_segments
+
+def make_transcript(segments, seed=0):
+    """Return the transcript data of a generated transcript."""
+    metadata, segments = PDFExtractor(cache=False)._process_lines(
+        generate_transcript(segments, seed=seed).split('\n')
+    )
+    return {'metadata': metadata, 'segments': list(segments)}
+
+def as_json(results):
+    """Return results as they are written to analysis_results.json."""
+    return json.loads(json.dumps(results, default=json_default))
+
+class ParallelAnalysisTest(unittest.TestCase):
+    """Analyzing across a worker pool gives the results of a serial analysis."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.transcript = make_transcript(300, seed=3)
+        cls.expected = as_json(PatternMatcher(sentiment=False).analyze(dict(cls.transcript)))
+        cls.matcher = PatternMatcher(workers=2, sentiment=False)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.matcher.close()
+
+    def test_segment_list(self):
+        results = self.matcher.analyze(dict(self.transcript))
+        self.assertGreater(len(results['patterns_found']), 0)
+        self.assertEqual(as_json(results), self.expected)
+
+    def test_streamed_segments(self):
+        transcript = dict(self.transcript, segments=iter(self.transcript['segments']))
+        results = self.matcher.analyze(transcript)
+        self.assertEqual(transcript['segments'], self.transcript['segments'])
+        self.assertEqual(as_json(results), self.expected)
+
+class ReanalyzeTest(unittest.TestCase):
+    """reanalyze() gives the results of a full analysis with the new patterns."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.transcript = make_transcript(200, seed=4)
+        definitions = PATTERN_REGISTRY.definitions()
+        categories = list(definitions)
+        cls.edited_id = definitions[categories[0]][0]['id']
+        cls.added_id = definitions[categories[1]][0]['id']
+        cls.removed_id = definitions[categories[-1]][-1]['id']
+
+        # The earlier analysis lacked one pattern; since then another has
+        # been edited and a third removed
+        old_definitions = copy.deepcopy(definitions)
+        del old_definitions[categories[1]][0]
+        new_definitions = copy.deepcopy(definitions)
+        new_definitions[categories[0]][0]['keywords'].append('agenda')
+        del new_definitions[categories[-1]][-1]
+
+        old_matcher = PatternMatcher(sentiment=False, registry=PatternRegistry(old_definitions))
+        cls.previous = old_matcher.analyze(dict(cls.transcript))
+        cls.matcher = PatternMatcher(sentiment=False, registry=PatternRegistry(new_definitions))
+        cls.expected = as_json(cls.matcher.analyze(dict(cls.transcript)))
+
+    def pattern_ids(self, results):
+        return {match['pattern_id'] for match in results['patterns_found']}
+
+    def test_fixture_covers_every_kind_of_change(self):
+        self.assertIn(self.removed_id, self.pattern_ids(self.previous))
+        self.assertNotIn(self.added_id, self.pattern_ids(self.previous))
+        self.assertIn(self.added_id, self.pattern_ids(self.expected))
+        edited_before = [match for match in self.previous['patterns_found']
+                         if match['pattern_id'] == self.edited_id]
+        edited_after = [match for match in self.expected['patterns_found']
+                        if match['pattern_id'] == self.edited_id]
+        self.assertNotEqual(edited_before, edited_after)
+
+    def reanalyze(self, previous):
+        """Re-analyze the transcript, checking that only the changed patterns were evaluated."""
+        with self.assertLogs(self.matcher.logger, 'INFO') as logs:
+            results = self.matcher.reanalyze(dict(self.transcript), previous)
+        self.assertIn('Re-analyzing transcript for 2 new or changed patterns', '\n'.join(logs.output))
+        return results
+
+    def test_previous_match_table(self):
+        self.assertEqual(as_json(self.reanalyze(self.previous)), self.expected)
+
+    def test_previous_results_loaded_from_json(self):
+        self.assertEqual(as_json(self.reanalyze(as_json(self.previous))), self.expected)
+
+    def test_other_transcript_falls_back_to_full_analysis(self):
+        previous = self.matcher.analyze(make_transcript(50, seed=5))
+        results = self.matcher.reanalyze(dict(self.transcript), as_json(previous))
+        self.assertEqual(as_json(results), self.expected)
+
+class SelectionTest(unittest.TestCase):
+    """Analyzing a time window and speakers gives the results of analyzing that excerpt."""
+
+    def test_window_and_speakers(self):
+        transcript = make_transcript(200, seed=8)
+        matcher = PatternMatcher(sentiment=False)
+        start, end = transcript['segments'][40]['seconds'] + 1, transcript['segments'][150]['seconds']
+        excerpt = select_segments(transcript['segments'], start, end, speakers=['mbalu*'])
+        self.assertGreater(len(excerpt), 0)
+        self.assertLess(len(excerpt), 110)
+
+        results = as_json(matcher.analyze(dict(transcript), start=start, end=end, speakers=['mbalu*']))
+        self.assertEqual(results.pop('selection'), {
+            'start': start, 'end': end, 'speakers': ['mbalu*'],
+            'segments': len(excerpt), 'total_segments': len(transcript['segments'])
+        })
+        self.assertEqual(results, as_json(matcher.analyze({'metadata': {}, 'segments': excerpt})))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+"""
+Pattern Registry Tests
+----------------------
+Checks that the pattern registry is read-only and that pattern
+fingerprints track what determines a pattern's matches.
+
+Run from the package directory with:
+    python -m unittest discover tests
+"""
+
+import os
+import sys
+import copy
+import pickle
+import unittest
+
+# Import local modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pattern_analysis.pattern_registry import PatternRegistry
+
+DEFINITIONS = {
+    'planning': [
+        {'id': 'plan', 'name': 'Planning', 'description': 'Talks about plans',
+         'keywords': ['plan', 'care plan'], 'frameworks': ['Care Act'], 'example': 'The plan.'},
+        {'id': 'review', 'name': 'Reviews', 'description': 'Talks about reviews',
+         'keywords': ['review']}
+    ],
+    'meetings': [
+        {'id': 'meeting', 'name': 'Meetings', 'description': 'Talks about meetings',
+         'keywords': ['meeting', 'agenda']}
+    ]
+}
+
+def fingerprints_after(edit):
+    """Return the registry fingerprints of DEFINITIONS, before and after an edit."""
+    definitions = copy.deepcopy(DEFINITIONS)
+    edit(definitions)
+    return PatternRegistry(DEFINITIONS).fingerprints, PatternRegistry(definitions).fingerprints
+
+class PatternRegistryTest(unittest.TestCase):
+    """PatternRegistry indexes patterns and cannot be changed."""
+
+    def setUp(self):
+        self.registry = PatternRegistry(DEFINITIONS)
+
+    def test_lookups(self):
+        self.assertEqual([pattern.id for pattern in self.registry], ['plan', 'review', 'meeting'])
+        self.assertEqual(self.registry.get('review')['keywords'], ('review',))
+        self.assertIsNone(self.registry.get('missing'))
+        self.assertIn('meeting', self.registry)
+        self.assertEqual(self.registry.index_of('meeting'), 2)
+        self.assertEqual([pattern.id for pattern in self.registry.by_category('planning')],
+                         ['plan', 'review'])
+        self.assertEqual(self.registry.categories(), ('planning', 'meetings'))
+        self.assertEqual(self.registry.definitions()['planning'][0]['keywords'], ['plan', 'care plan'])
+
+    def test_registry_is_immutable(self):
+        with self.assertRaises(AttributeError):
+            self.registry.patterns = ()
+        with self.assertRaises(AttributeError):
+            self.registry.get('plan').keywords = ('anything',)
+        with self.assertRaises(TypeError):
+            self.registry.fingerprints['plan'] = 'edited'
+        with self.assertRaises(TypeError):
+            del self.registry.fingerprints['plan']
+        self.assertEqual(len(self.registry.fingerprints), 3)
+
+    def test_definitions_are_copied(self):
+        definitions = copy.deepcopy(DEFINITIONS)
+        registry = PatternRegistry(definitions)
+        definitions['planning'][0]['keywords'].append('meeting')
+        self.assertEqual(registry.get('plan')['keywords'], ('plan', 'care plan'))
+        self.assertEqual(registry.fingerprints, self.registry.fingerprints)
+
+    def test_duplicate_ids_are_rejected(self):
+        definitions = copy.deepcopy(DEFINITIONS)
+        definitions['meetings'].append(dict(definitions['planning'][0]))
+        with self.assertRaises(ValueError):
+            PatternRegistry(definitions)
+
+    def test_pickle_round_trip(self):
+        registry = pickle.loads(pickle.dumps(self.registry))
+        self.assertEqual(registry.definitions(), self.registry.definitions())
+        self.assertEqual(dict(registry.fingerprints), dict(self.registry.fingerprints))
+
+class FingerprintTest(unittest.TestCase):
+    """A fingerprint changes with the parts of a pattern copied into its matches."""
+
+    def test_keyword_edit_changes_only_that_pattern(self):
+        before, after = fingerprints_after(
+            lambda definitions: definitions['planning'][1]['keywords'].append('assessment')
+        )
+        self.assertNotEqual(before['review'], after['review'])
+        self.assertEqual(before['plan'], after['plan'])
+        self.assertEqual(before['meeting'], after['meeting'])
+
+    def test_name_and_category_are_covered(self):
+        before, after = fingerprints_after(
+            lambda definitions: definitions['planning'][0].update(name='Care planning')
+        )
+        self.assertNotEqual(before['plan'], after['plan'])
+        before, after = fingerprints_after(
+            lambda definitions: definitions.update(meetings=[], other=definitions['meetings'])
+        )
+        self.assertNotEqual(before['meeting'], after['meeting'])
+
+    def test_example_is_not_covered(self):
+        before, after = fingerprints_after(
+            lambda definitions: definitions['planning'][0].update(example='Another example.')
+        )
+        self.assertEqual(before, after)
+
+if __name__ == '__main__':
+    unittest.main()
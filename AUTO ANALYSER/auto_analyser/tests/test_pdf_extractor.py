@@ -0,0 +1,56 @@
+"""
+Extractor Tests
+---------------
+Checks of how transcript text is split into speaker segments.
+
+Run from the package directory with:
+    python -m unittest discover tests
+"""
+
+import os
+import sys
+import unittest
+
+# Import local modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pdf_processing.pdf_extractor import PDFExtractor
+
+def split_segments(text):
+    """Return the segments of a transcript given as text."""
+    _, segments = PDFExtractor(cache=False)._process_lines(text.split('\n'))
+    return list(segments)
+
+class InlineHeaderTest(unittest.TestCase):
+    """Speaker headers of the 'Ben Mak  1:05' layout."""
+
+    def test_speaker_names_are_headers(self):
+        segments = split_segments(
+            "Transcript\n"
+            "Ben Mak  0:05\n"
+            "Thank you all for joining the meeting today.\n"
+            "Mbalu (ICS)  1:02:05\n"
+            "I would like to raise a concern about the placement.\n"
+            "Ana de la Cruz  1:03:10\n"
+            "Sarah O'Neil agreed with the plan last week.\n"
+        )
+        self.assertEqual([segment['speaker'] for segment in segments],
+                         ['Ben Mak', 'Mbalu (ICS)', 'Ana de la Cruz'])
+        self.assertEqual([segment['seconds'] for segment in segments], [5, 3725, 3790])
+
+    def test_speech_ending_in_a_time_is_content(self):
+        speech = [
+            "Let's meet at 3:15",
+            "we said the visit would start at 10:30",
+            "The call moved to 3:15",
+            "I'll ring the school back at 9:45",
+        ]
+        segments = split_segments(
+            "Transcript\nBen Mak  0:05\n" + "\n".join(speech)
+            + "\nMbalu Kamara  0:40\nThat works for everyone here.\n"
+        )
+        self.assertEqual([segment['speaker'] for segment in segments], ['Ben Mak', 'Mbalu Kamara'])
+        for line in speech:
+            self.assertIn(line, segments[0]['text'])
+
+if __name__ == '__main__':
+    unittest.main()
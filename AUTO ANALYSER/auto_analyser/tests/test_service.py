@@ -0,0 +1,116 @@
+"""
+Service Tests
+-------------
+End-to-end checks of the analysis service over HTTP.
+
+Run from the package directory with:
+    python -m unittest discover tests
+"""
+
+import os
+import re
+import sys
+import json
+import shutil
+import http.client
+import tempfile
+import threading
+import unittest
+import urllib.error
+import urllib.request
+from unittest import mock
+
+# Import local modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import config
+from benchmarks.generate_transcript import generate_transcript
+from service import AnalysisService, create_server
+
+class ServiceTestCase(unittest.TestCase):
+    """Runs an analysis service on a free port for each test."""
+
+    SEGMENTS = 40
+
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp(prefix='auto_analyser_service_')
+        self.settings = mock.patch.dict(config.REPORT_SETTINGS, {
+            'mode': 'auto',
+            'shard_threshold': self.SEGMENTS // 2,
+            'segment_shard_size': 10,
+            'card_shard_size': 5
+        })
+        self.settings.start()
+        self.service = AnalysisService(
+            output_dir=os.path.join(self.work_dir, 'output'), use_cache=False,
+            sentiment=False, index=None
+        )
+        self.server = create_server(self.service, host='127.0.0.1', port=0)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.service.close()
+        self.settings.stop()
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def get(self, path):
+        try:
+            with urllib.request.urlopen(self.base_url + path) as response:
+                return response.status, response.read()
+        except urllib.error.HTTPError as e:
+            return e.code, e.read()
+
+class UploadTest(ServiceTestCase):
+    """Checks of the upload request before a job is created."""
+
+    def test_negative_content_length_is_rejected(self):
+        connection = http.client.HTTPConnection('127.0.0.1', self.server.server_port, timeout=10)
+        try:
+            connection.putrequest('POST', '/jobs?filename=hearing.txt')
+            connection.putheader('Content-Length', '-1')
+            connection.endheaders()
+            response = connection.getresponse()
+            self.assertEqual(response.status, 400)
+        finally:
+            connection.close()
+        self.assertEqual(self.service.jobs, {})
+
+class ShardedReportJobTest(ServiceTestCase):
+    """A job over the shard threshold serves its report and every data shard."""
+
+    def test_sharded_report_is_served(self):
+        transcript = generate_transcript(self.SEGMENTS, seed=1).encode('utf-8')
+        request = urllib.request.Request(
+            self.base_url + '/jobs?filename=hearing.txt&wait=120', data=transcript, method='POST'
+        )
+        with urllib.request.urlopen(request) as response:
+            job = json.load(response)
+        self.assertEqual(job['status'], 'done', job.get('error'))
+        self.assertGreater(job['summary']['segments'], config.REPORT_SETTINGS['shard_threshold'])
+
+        status, report = self.get(f"/jobs/{job['id']}/report")
+        self.assertEqual(status, 200)
+        shards = set(re.findall(r'data-shard="([^"]+)"', report.decode('utf-8')))
+        self.assertIn('segments-0', shards)
+
+        for name in sorted(shards):
+            status, content = self.get(f"/jobs/{job['id']}/report_data/{name}.js")
+            self.assertEqual(status, 200, name)
+            self.assertTrue(content)
+
+    def test_only_shard_files_are_served(self):
+        request = urllib.request.Request(
+            self.base_url + '/jobs?filename=hearing.txt&wait=120',
+            data=generate_transcript(self.SEGMENTS, seed=2).encode('utf-8'), method='POST'
+        )
+        with urllib.request.urlopen(request) as response:
+            job = json.load(response)
+
+        for name in ('hearing.txt', '..%2Fhearing.txt', 'missing.js'):
+            status, _ = self.get(f"/jobs/{job['id']}/report_data/{name}")
+            self.assertEqual(status, 404, name)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+"""
+SQLite Store Tests
+------------------
+Checks that the SQLite results store holds the same rows whether the
+results come straight from the matcher or from analysis_results.json.
+
+Run from the package directory with:
+    python -m unittest discover tests
+"""
+
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+
+# Import local modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.generate_transcript import generate_transcript
+from pattern_analysis.match_table import MatchTable, json_default
+from pattern_analysis.pattern_matcher import PatternMatcher
+from pdf_processing.pdf_extractor import PDFExtractor
+from result_storage.sqlite_store import SQLiteResultStore, _match_rows
+
+def make_transcript(segments, seed=0):
+    """Return the transcript data of a generated transcript."""
+    metadata, segments = PDFExtractor(cache=False)._process_lines(
+        generate_transcript(segments, seed=seed).split('\n')
+    )
+    return {'metadata': metadata, 'segments': list(segments)}
+
+class SQLiteResultStoreTest(unittest.TestCase):
+    """Match tables and match dictionaries are stored as the same rows."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.transcript = make_transcript(150, seed=6)
+        cls.results = PatternMatcher(sentiment=False).analyze(dict(cls.transcript))
+        cls.loaded_results = json.loads(json.dumps(cls.results, default=json_default))
+
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp(prefix='auto_analyser_store_')
+        self.store = SQLiteResultStore(os.path.join(self.work_dir, 'analysis_results.sqlite'))
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def test_match_rows_of_table_and_json_agree(self):
+        self.assertIsInstance(self.results['patterns_found'], MatchTable)
+        segments = self.transcript['segments']
+        from_table = _match_rows(7, self.results['patterns_found'], segments)
+        from_json = _match_rows(7, self.loaded_results['patterns_found'], segments)
+        self.assertGreater(len(from_table[0]), 0)
+        self.assertGreater(len(from_table[1]), len(from_table[0]))
+        self.assertEqual(from_table, from_json)
+
+    def test_saved_rows_agree(self):
+        table_dir = os.path.join(self.work_dir, 'table')
+        json_dir = os.path.join(self.work_dir, 'json')
+        table_id = self.store.save(table_dir, self.transcript, self.results)
+        json_id = self.store.save(json_dir, self.transcript, self.loaded_results)
+
+        for table in ('segments', 'matches', 'keyword_matches', 'speaker_stats'):
+            rows = [
+                self.store.connection.execute(
+                    f"SELECT * FROM {table} WHERE transcript_id = ? ORDER BY 2, 3", (transcript_id,)
+                ).fetchall()
+                for transcript_id in (table_id, json_id)
+            ]
+            self.assertEqual([row[1:] for row in rows[0]], [row[1:] for row in rows[1]], table)
+        self.assertEqual(self.store.speaker_pattern_counts(table_dir),
+                         self.store.speaker_pattern_counts(json_dir))
+
+    def test_corpus_totals_match_the_results(self):
+        result_dir = os.path.join(self.work_dir, 'result')
+        self.store.save(result_dir, self.transcript, self.results)
+        self.store.save(result_dir, self.transcript, self.loaded_results)
+        totals = self.store.corpus_totals()
+        overall = self.loaded_results['overall_analysis']
+        self.assertEqual(totals['transcripts'], 1)
+        self.assertEqual(totals['segments'], overall['total_segments'])
+        self.assertEqual(totals['patterns_found'], len(self.loaded_results['patterns_found']))
+        self.assertEqual(totals['category_counts'], overall['category_counts'])
+        self.assertEqual(totals['pattern_counts'], overall['pattern_counts'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+"""
+Time Index Tests
+----------------
+Checks of the time index and of selecting segments by time window and
+speaker.
+
+Run from the package directory with:
+    python -m unittest discover tests
+"""
+
+import os
+import sys
+import unittest
+
+# Import local modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pdf_processing.time_index import TimeIndex, select_segments
+
+SEGMENTS = [
+    {'speaker': 'Ben Mak', 'timestamp': '0:00', 'seconds': 0, 'text': 'Welcome.'},
+    {'speaker': 'Mbalu (ICS)', 'timestamp': '1:00', 'seconds': 60, 'text': 'Thank you.'},
+    # Extracted before 'seconds' was recorded
+    {'speaker': 'mbalu kamara', 'timestamp': '2:30', 'text': 'On the plan.'},
+    {'speaker': 'Ben Mak', 'timestamp': '', 'seconds': None, 'text': 'No time.'},
+    {'speaker': 'Sarah Whitfield', 'timestamp': '4:00', 'seconds': 240, 'text': 'Next item.'},
+]
+
+def texts(segments):
+    return [segment['text'] for segment in segments]
+
+class TimeIndexTest(unittest.TestCase):
+    """TimeIndex finds segments by start time."""
+
+    def test_between_and_at(self):
+        index = TimeIndex(SEGMENTS)
+        self.assertEqual(len(index), 4)
+        self.assertEqual(index.between(60, 240), [1, 2])
+        self.assertEqual(index.between(None, 60), [0])
+        self.assertEqual(index.between(61), [2, 4])
+        self.assertEqual(index.at(59), 0)
+        self.assertEqual(index.at(150), 2)
+        self.assertEqual(index.at(10000), 4)
+        self.assertIsNone(TimeIndex(SEGMENTS[1:]).at(30))
+
+    def test_out_of_order_segments(self):
+        index = TimeIndex(list(reversed(SEGMENTS)))
+        self.assertEqual(index.between(60, 241), [0, 2, 3])
+        self.assertEqual(index.at(200), 2)
+
+class SelectSegmentsTest(unittest.TestCase):
+    """select_segments keeps the segments of a window and speakers, in order."""
+
+    def test_window_includes_the_segment_under_way(self):
+        self.assertEqual(texts(select_segments(SEGMENTS, 90, 240)), ['Thank you.', 'On the plan.'])
+        # The window ends before its end second
+        self.assertEqual(texts(select_segments(SEGMENTS, 60, 150)), ['Thank you.'])
+        self.assertEqual(texts(select_segments(SEGMENTS, 60, 151)), ['Thank you.', 'On the plan.'])
+        self.assertEqual(texts(select_segments(SEGMENTS, end=60)), ['Welcome.'])
+        self.assertEqual(texts(select_segments(SEGMENTS, 300)), ['Next item.'])
+
+    def test_speakers(self):
+        self.assertEqual(texts(select_segments(SEGMENTS, speakers=['ben mak'])),
+                         ['Welcome.', 'No time.'])
+        self.assertEqual(texts(select_segments(SEGMENTS, speakers=['Mbalu*'])),
+                         ['Thank you.', 'On the plan.'])
+        self.assertEqual(texts(select_segments(SEGMENTS, speakers=['Sarah Whitfield', 'MBALU (ICS)'])),
+                         ['Thank you.', 'Next item.'])
+
+    def test_window_and_speakers(self):
+        self.assertEqual(texts(select_segments(iter(SEGMENTS), 0, 200, speakers=['mbalu*'])),
+                         ['Thank you.', 'On the plan.'])
+        self.assertEqual(select_segments(SEGMENTS), SEGMENTS)
+
+if __name__ == '__main__':
+    unittest.main()
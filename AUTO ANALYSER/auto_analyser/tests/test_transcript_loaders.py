@@ -0,0 +1,68 @@
+"""
+Transcript Loader Tests
+-----------------------
+Checks of the transcript export loaders and the timestamp parsing they
+share with main.py.
+
+Run from the package directory with:
+    python -m unittest discover tests
+"""
+
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+
+# Import local modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pdf_processing.transcript_loaders import load_json_transcript, parse_timestamp
+
+class ParseTimestampTest(unittest.TestCase):
+    """parse_timestamp accepts m:ss, h:mm:ss and seconds."""
+
+    def test_timestamps(self):
+        self.assertEqual(parse_timestamp('1:05'), 65)
+        self.assertEqual(parse_timestamp('1:02:05'), 3725)
+        self.assertEqual(parse_timestamp(' 90.5 '), 90)
+
+    def test_invalid_and_non_finite_values(self):
+        for value in ('', 'soon', '1:xx', 'inf', '-inf', 'nan', '1e999', '1:inf'):
+            self.assertIsNone(parse_timestamp(value), value)
+
+class JsonTranscriptTest(unittest.TestCase):
+    """load_json_transcript reads segment lists with start offsets."""
+
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp(prefix='auto_analyser_loaders_')
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def load(self, segments):
+        path = os.path.join(self.work_dir, 'transcript.json')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(segments))
+        _, loaded = load_json_transcript(path)
+        return list(loaded)
+
+    def test_start_offsets(self):
+        segments = self.load([
+            {'speaker': 'Ben Mak', 'start': 65.9, 'text': 'Thank you for joining.'},
+            {'speaker': 'Mbalu (ICS)', 'timestamp': '1:10', 'text': 'Thank you.'}
+        ])
+        self.assertEqual([(segment['timestamp'], segment['seconds']) for segment in segments],
+                         [('1:05', 65), ('1:10', 70)])
+
+    def test_invalid_start_names_the_segment(self):
+        # 1e999 is written as Infinity, which json reads back as float('inf')
+        for start in (1e999, float('nan'), -5, 'abc', [1]):
+            with self.assertRaisesRegex(ValueError, 'JSON transcript segment 1 has an invalid start'):
+                self.load([
+                    {'speaker': 'Ben Mak', 'start': 0, 'text': 'Thank you for joining.'},
+                    {'speaker': 'Ben Mak', 'start': start, 'text': 'Shall we begin?'}
+                ])
+
+if __name__ == '__main__':
+    unittest.main()